@@ -0,0 +1,181 @@
+"""End-to-end email delivery benchmark against the local asyncio SMTP sink.
+
+Drives ``SmtpEmailSender``, ``QueueingEmailSender`` and ``DiskEmailQueue``
+over real sockets to ``tests/smtp_sink.py`` and reports throughput, send
+latency percentiles, retry cost and queue-drain time.
+
+Run from the repository root:
+    python scripts/bench_email_delivery.py [--messages 200] [--latency-ms 0]
+        [--sizes 10,100,1000,10000] [--drop-every 10] [--verbose]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))
+
+from smtp_sink import SinkBehavior, SmtpSink
+
+from z7_sentineltray.config import EmailConfig
+from z7_sentineltray.email_queue_utils import build_new_item
+from z7_sentineltray.email_sender import (
+    DiskEmailQueue,
+    EmailQueued,
+    QueueingEmailSender,
+    SmtpEmailSender,
+)
+
+
+def _email(port: int) -> EmailConfig:
+    return EmailConfig(
+        smtp_host="127.0.0.1",
+        smtp_port=port,
+        smtp_username="bench",
+        smtp_password="bench",
+        from_address="bench@example.com",
+        to_addresses=["ops@example.com"],
+        use_tls=False,
+        timeout_seconds=10,
+        subject="bench",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+
+
+def _queue(path: Path) -> DiskEmailQueue:
+    return DiskEmailQueue(
+        path,
+        max_items=1_000_000,
+        max_age_seconds=86400,
+        max_attempts=10,
+        retry_base_seconds=0,
+    )
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _report_latencies(label: str, samples: list[float], elapsed: float) -> None:
+    millis = [sample * 1000 for sample in samples]
+    print(
+        f"{label:<22} {len(samples) / elapsed:8.1f} msg/s  "
+        f"p50={statistics.median(millis):7.2f}ms  p99={_percentile(millis, 0.99):7.2f}ms"
+    )
+
+
+def bench_live_sends(messages: int, latency: float) -> None:
+    with SmtpSink(SinkBehavior(latency_seconds=latency)) as sink:
+        sender = SmtpEmailSender(_email(sink.port))
+        samples: list[float] = []
+        started = time.perf_counter()
+        for index in range(messages):
+            send_started = time.perf_counter()
+            sender.send(f"ALERT {index}")
+            samples.append(time.perf_counter() - send_started)
+        elapsed = time.perf_counter() - started
+    _report_latencies("live send", samples, elapsed)
+
+
+def bench_retry(messages: int, latency: float) -> None:
+    behavior = SinkBehavior(
+        latency_seconds=latency,
+        mail_reply=(451, "Try again later"),
+        mail_failures=0,
+    )
+    with SmtpSink(behavior) as sink:
+        # Every send fails once with 451 and succeeds on the retry.
+        sender = SmtpEmailSender(replace(_email(sink.port), retry_attempts=1))
+        samples: list[float] = []
+        started = time.perf_counter()
+        for index in range(messages):
+            sink.update(mail_failures=1)
+            send_started = time.perf_counter()
+            sender.send(f"ALERT {index}")
+            samples.append(time.perf_counter() - send_started)
+        elapsed = time.perf_counter() - started
+    _report_latencies("send with 1 retry", samples, elapsed)
+
+
+def bench_dropped_connections(messages: int, drop_every: int, directory: Path) -> None:
+    with SmtpSink() as sink:
+        sender = QueueingEmailSender(
+            sender=SmtpEmailSender(_email(sink.port)),
+            queue=_queue(directory / "dropped.json"),
+        )
+        queued = 0
+        started = time.perf_counter()
+        for index in range(messages):
+            if drop_every and index % drop_every == 0:
+                sink.update(drop_connections=1)
+            try:
+                sender.send(f"ALERT {index}")
+            except EmailQueued:
+                queued += 1
+        sink.update(drop_connections=0)
+        stats = sender.drain()
+        elapsed = time.perf_counter() - started
+        delivered = sink.message_count
+    print(
+        f"{'dropped connections':<22} {messages / elapsed:8.1f} msg/s  "
+        f"queued={queued} delivered={delivered}/{messages} left={stats.queued}"
+    )
+
+
+def bench_drain(sizes: list[int], latency: float, directory: Path) -> None:
+    with SmtpSink(SinkBehavior(latency_seconds=latency)) as sink:
+        for size in sizes:
+            path = directory / f"queue-{size}.json"
+            queue = _queue(path)
+            now = queue._now()
+            items = [build_new_item(f"ALERT {index}", now) for index in range(size)]
+            path.write_text(json.dumps(items), encoding="utf-8")
+            sender = QueueingEmailSender(sender=SmtpEmailSender(_email(sink.port)), queue=queue)
+            before = sink.message_count
+            started = time.perf_counter()
+            stats = sender.drain()
+            elapsed = time.perf_counter() - started
+            print(
+                f"{'drain ' + str(size):<22} {size / elapsed:8.1f} msg/s  "
+                f"total={elapsed:8.3f}s  sent={stats.sent} "
+                f"delivered={sink.message_count - before}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--drop-every", type=int, default=10)
+    parser.add_argument("--verbose", action="store_true", help="show sender log output")
+    args = parser.parse_args()
+    if not args.verbose:
+        # Injected faults make the sender log expected tracebacks.
+        logging.getLogger("z7_sentineltray").setLevel(logging.CRITICAL)
+
+    latency = args.latency_ms / 1000
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    print(f"SMTP sink latency per reply: {args.latency_ms}ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        bench_live_sends(args.messages, latency)
+        bench_retry(args.messages, latency)
+        bench_dropped_connections(args.messages, args.drop_every, directory)
+        bench_drain(sizes, latency, directory)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+"""Benchmark records per second through the full logging chain.
+
+Compares two layouts writing the same four log files (rotating text,
+per-run text, rotating JSONL, per-run JSONL):
+
+- ``per-handler``: the former layout, handlers on the root logger, each with
+  its own category/redaction/dedup/context filters, and a JSON formatter
+  that redacts the message and context again;
+- ``pipeline``: ``setup_logging`` as shipped, context captured on the
+  logging thread, redaction and dedup once per record on the queue
+  listener thread, handlers only format.
+
+Reported rates are end to end: the time to log N records plus the time
+to drain the queue, so the asynchronous pipeline is not flattered.  The
+``caller`` column shows how long the logging thread itself was blocked.
+
+Run from the repository root:
+    python scripts/bench_logging.py [--records 20000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from z7_sentineltray import logging_setup
+from z7_sentineltray.logging_setup import (
+    CategoryFilter,
+    ContextFilter,
+    DedupFilter,
+    SanitizingFormatter,
+    flush_logging,
+    log_context,
+    sanitize_text,
+    setup_logging,
+    shutdown_logging,
+)
+
+_TEXT_FORMAT = (
+    "%(asctime)s %(levelname)s %(category)s %(name)s %(filename)s:%(lineno)d "
+    "%(funcName)s %(process)d %(processName)s %(thread)d %(threadName)s "
+    "scan_id=%(scan_id)s ctx=%(log_context_text)s %(message)s"
+)
+
+
+class _LegacyRedactionFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = sanitize_text(record.getMessage())
+        record.args = ()
+        return True
+
+
+class _LegacyContextFilter(ContextFilter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        super().filter(record)
+        if not hasattr(record, "log_context_text"):
+            record.log_context_text = ";".join(
+                f"{key}={sanitize_text(str(value))}" for key, value in record.log_context.items()
+            )
+        return True
+
+
+class _LegacyJsonFormatter(logging_setup.JsonFormatter):
+    def format(self, record: logging.LogRecord) -> str:
+        record.__dict__.pop("redacted", None)
+        return super().format(record)
+
+
+def _install_per_handler(base_path: Path) -> list[logging.Handler]:
+    context_filter = _LegacyContextFilter(
+        session_id="bench", app_version="bench", release_date="", commit_hash=""
+    )
+    text = SanitizingFormatter(_TEXT_FORMAT)
+    json_formatter = _LegacyJsonFormatter()
+    handlers: list[logging.Handler] = [
+        RotatingFileHandler(base_path, maxBytes=50_000_000, backupCount=1, encoding="utf-8"),
+        logging.FileHandler(base_path.with_name("run.log"), encoding="utf-8"),
+        RotatingFileHandler(
+            base_path.with_suffix(".jsonl"), maxBytes=50_000_000, backupCount=1, encoding="utf-8"
+        ),
+        logging.FileHandler(base_path.with_name("run.jsonl"), encoding="utf-8"),
+    ]
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(logging.INFO)
+    for index, handler in enumerate(handlers):
+        handler.setFormatter(text if index < 2 else json_formatter)
+        handler.addFilter(CategoryFilter())
+        handler.addFilter(_LegacyRedactionFilter())
+        handler.addFilter(DedupFilter())
+        handler.addFilter(context_filter)
+        root.addHandler(handler)
+    return handlers
+
+
+def _emit(records: int) -> None:
+    logger = logging.getLogger("z7_sentineltray.bench")
+    with log_context(monitor_index=1, window="C:\\Users\\bob\\app.exe"):
+        for index in range(records):
+            logger.info(
+                "Scan %s matched for user%s@example.com token=abc%s",
+                index,
+                index,
+                index,
+                extra={"category": "scan"},
+            )
+
+
+def _run(layout: str, records: int, directory: Path) -> tuple[float, float]:
+    base_path = directory / layout / "bench.log"
+    base_path.parent.mkdir(parents=True)
+    handlers: list[logging.Handler] = []
+    if layout == "pipeline":
+        setup_logging(str(base_path), log_console_enabled=False, log_queue_size=records + 10)
+    else:
+        handlers = _install_per_handler(base_path)
+    started = time.perf_counter()
+    _emit(records)
+    caller = time.perf_counter() - started
+    if layout == "pipeline":
+        flush_logging(timeout=600)
+    else:
+        for handler in handlers:
+            handler.flush()
+    total = time.perf_counter() - started
+    shutdown_logging()
+    for handler in handlers:
+        logging.getLogger().removeHandler(handler)
+        handler.close()
+    return caller, total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results: dict[str, tuple[float, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for attempt in range(args.repeat):
+            for layout in ("per-handler", "pipeline"):
+                caller, total = _run(layout, args.records, Path(tmp) / str(attempt))
+                best = results.get(layout)
+                if best is None or total < best[1]:
+                    results[layout] = (caller, total)
+
+    print(f"{args.records} records, 4 file handlers, best of {args.repeat}")
+    print(f"{'layout':<12} {'records/s':>12} {'caller':>10} {'total':>10}")
+    for layout, (caller, total) in results.items():
+        print(f"{layout:<12} {args.records / total:>12,.0f} {caller:>9.2f}s {total:>9.2f}s")
+    before = results["per-handler"][1]
+    after = results["pipeline"][1]
+    print(f"speedup (per-handler/pipeline): {before / after:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+"""Benchmark STARTTLS handshake cost with and without TLS context/session reuse.
+
+Starts a local STARTTLS stand-in server on 127.0.0.1 with a throwaway
+self-signed certificate (generated with the ``openssl`` CLI) and compares:
+
+- ``fresh``: ``smtplib`` default, a new context and full handshake per connection;
+- ``cached``: one process-wide context, full handshake per connection;
+- ``resumed``: one process-wide context offering the previous TLS session.
+
+Run from the repository root:
+    python scripts/bench_smtp_tls.py [--iterations 200] [--tls-max 1.2|1.3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import smtplib
+import socketserver
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from z7_sentineltray.config import EmailConfig
+from z7_sentineltray.smtp_tls import build_smtp_tls_context
+
+
+def _make_certificate(directory: Path) -> tuple[Path, Path]:
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        raise SystemExit("openssl CLI not found; it is needed to create a test certificate")
+    cert = directory / "cert.pem"
+    key = directory / "key.pem"
+    subprocess.run(
+        [
+            openssl,
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-keyout",
+            str(key),
+            "-out",
+            str(cert),
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+class _StartTlsHandler(socketserver.StreamRequestHandler):
+    """Just enough ESMTP for ``starttls`` + ``noop`` + ``quit``."""
+
+    server: _StartTlsServer
+
+    def _reply(self, *lines: str) -> None:
+        # One write per reply: split multi-line replies stall on Nagle + delayed ACK.
+        self.wfile.write("".join(f"{line}\r\n" for line in lines).encode("ascii"))
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        self._reply("220 localhost ESMTP bench")
+        tls = False
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            verb = raw.decode("ascii", "replace").strip().split(" ", 1)[0].upper()
+            if verb in {"EHLO", "HELO"}:
+                if tls:
+                    self._reply("250 localhost")
+                else:
+                    self._reply("250-localhost", "250 STARTTLS")
+            elif verb == "STARTTLS" and not tls:
+                self._reply("220 Ready to start TLS")
+                self.connection = self.server.tls_context.wrap_socket(
+                    self.connection, server_side=True
+                )
+                self.rfile = self.connection.makefile("rb")
+                self.wfile = self.connection.makefile("wb")
+                tls = True
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+class _StartTlsServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, tls_context: ssl.SSLContext) -> None:
+        super().__init__(("127.0.0.1", 0), _StartTlsHandler)
+        self.tls_context = tls_context
+
+
+def _one_connection(port: int, context: ssl.SSLContext | None) -> tuple[float, bool]:
+    with smtplib.SMTP("127.0.0.1", port, timeout=10) as client:
+        started = time.perf_counter()
+        if context is None:
+            client.starttls()
+        else:
+            client.starttls(context=context)
+        elapsed = time.perf_counter() - started
+        client.noop()
+        sock = client.sock
+        if context is not None and hasattr(context, "remember_session"):
+            context.remember_session(sock)
+        reused = isinstance(sock, ssl.SSLSocket) and sock.session_reused
+    return elapsed, reused
+
+
+def _report(label: str, samples: list[tuple[float, bool]]) -> float:
+    times = sorted(sample[0] * 1000 for sample in samples)
+    reused = sum(1 for sample in samples if sample[1])
+    p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+    mean = statistics.fmean(times)
+    print(
+        f"{label:<8} mean={mean:7.3f}ms  p50={statistics.median(times):7.3f}ms  "
+        f"p95={p95:7.3f}ms  resumed={reused}/{len(samples)}"
+    )
+    return mean
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--tls-max", choices=["1.2", "1.3"], default="1.3")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = _make_certificate(Path(tmp))
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(cert, key)
+        if args.tls_max == "1.2":
+            server_context.maximum_version = ssl.TLSVersion.TLSv1_2
+
+        server = _StartTlsServer(server_context)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        port = server.server_address[1]
+        config = EmailConfig(
+            smtp_host="127.0.0.1",
+            smtp_port=port,
+            smtp_username="",
+            smtp_password="",
+            from_address="bench@example.com",
+            to_addresses=["bench@example.com"],
+            use_tls=True,
+            timeout_seconds=10,
+            subject="bench",
+            retry_attempts=0,
+            retry_backoff_seconds=0,
+        )
+        try:
+            print(f"STARTTLS handshake, {args.iterations} connections, TLS <= {args.tls_max}")
+            fresh = [_one_connection(port, None) for _ in range(args.iterations)]
+
+            cached_context = build_smtp_tls_context(config)
+            cached = []
+            for _ in range(args.iterations):
+                cached.append(_one_connection(port, cached_context))
+                cached_context.forget_session()
+
+            resumed_context = build_smtp_tls_context(config)
+            resumed = [_one_connection(port, resumed_context) for _ in range(args.iterations)]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    baseline = _report("fresh", fresh)
+    _report("cached", cached)
+    best = _report("resumed", resumed)
+    if best > 0:
+        print(f"speedup (fresh/resumed): {baseline / best:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
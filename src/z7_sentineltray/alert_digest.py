@@ -0,0 +1,130 @@
+"""Coalesce bursts of alert matches into a single digest email per monitor."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+# Batches that could not be delivered are put back (see ``AlertDigest.requeue``);
+# this many times ``max_items`` distinct lines are kept while delivery keeps failing.
+_REQUEUE_LIMIT_FACTOR = 10
+
+
+@dataclass
+class DigestEntry:
+    """One distinct matched line waiting in a digest."""
+
+    text: str
+    message: str
+    count: int = 1
+
+
+class AlertDigest:
+    """Collects alert messages for one monitor and releases them as one batch.
+
+    The first :meth:`add` opens a window of *window_seconds*.  The batch is
+    ready when the window has elapsed (:meth:`is_due`) or when it holds
+    *max_items* distinct lines (:meth:`is_full`).  Repeated lines are merged
+    and counted; the latest alert message (with its delta) is kept.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_seconds: int,
+        max_items: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window_seconds = max(0, window_seconds)
+        self.max_items = max(1, max_items)
+        self._clock = clock
+        self._entries: dict[str, DigestEntry] = {}
+        self._opened_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, text: object) -> bool:
+        return text in self._entries
+
+    def add(self, text: str, message: str) -> None:
+        """Add the alert *message* for matched line *text* to the open batch."""
+        if not self._entries:
+            self._opened_at = self._clock()
+        entry = self._entries.get(text)
+        if entry is None:
+            self._entries[text] = DigestEntry(text=text, message=message)
+            return
+        entry.count += 1
+        entry.message = message
+
+    def is_full(self) -> bool:
+        """Return ``True`` once the batch holds ``max_items`` distinct lines."""
+        return len(self._entries) >= self.max_items
+
+    def is_due(self) -> bool:
+        """Return ``True`` if the batch is non-empty and its window has elapsed."""
+        if not self._entries:
+            return False
+        return self._clock() - self._opened_at >= self.window_seconds
+
+    def age_seconds(self) -> float:
+        """Return how long the current batch has been open (0 when empty)."""
+        if not self._entries:
+            return 0.0
+        return max(0.0, self._clock() - self._opened_at)
+
+    def drain(self) -> list[DigestEntry]:
+        """Return the pending entries in arrival order and start a new batch."""
+        entries = list(self._entries.values())
+        self._entries = {}
+        self._opened_at = 0.0
+        return entries
+
+    def requeue(self, entries: list[DigestEntry], age_seconds: float) -> int:
+        """Put back *entries* drained from a batch that could not be delivered.
+
+        They go ahead of lines added since, repeats of the same line are
+        merged, and the batch keeps the age of the failed one so it is due
+        again at once.  While delivery keeps failing at most
+        ``max_items * 10`` distinct lines are kept, oldest dropped first.
+
+        Returns:
+            The number of distinct lines dropped.
+        """
+        opened_at = self._clock() - age_seconds
+        if self._entries:
+            opened_at = min(opened_at, self._opened_at)
+        merged = {entry.text: entry for entry in entries}
+        for text, entry in self._entries.items():
+            previous = merged.get(text)
+            if previous is None:
+                merged[text] = entry
+            else:
+                previous.count += entry.count
+                previous.message = entry.message
+        dropped = max(0, len(merged) - self.max_items * _REQUEUE_LIMIT_FACTOR)
+        self._entries = dict(list(merged.items())[dropped:])
+        self._opened_at = opened_at if self._entries else 0.0
+        return dropped
+
+
+def format_digest(entries: list[DigestEntry], window_seconds: float) -> str:
+    """Render *entries* as one alert message body.
+
+    A single entry seen once is returned unchanged so that quiet periods
+    still produce the usual one-line alert.
+    """
+    if len(entries) == 1 and entries[0].count == 1:
+        return entries[0].message
+    total = sum(entry.count for entry in entries)
+    lines = [
+        f"Resumo: {total} ocorrência(s) de {len(entries)} linha(s) em {round(window_seconds)}s"
+    ]
+    for entry in entries:
+        first, *rest = entry.message.splitlines() or [entry.text]
+        suffix = f" ({entry.count}x)" if entry.count > 1 else ""
+        lines.append(f"- {first}{suffix}")
+        lines.extend(f"  {extra}" for extra in rest)
+    return "\n".join(lines)
@@ -9,16 +9,17 @@ import json
 import logging
 import re
 import shutil
-import socket
 import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
-from threading import Event, Thread
+from threading import Event, Lock, Thread
 from typing import Any, cast
 from uuid import uuid4
 
 from . import __release_date__, __version_label__
+from .alert_digest import AlertDigest, format_digest
 from .config import AppConfig, MonitorConfig, get_project_root
 from .detector import WindowTextDetector, WindowUnavailableError
 from .email_sender import (
@@ -28,15 +29,58 @@ from .email_sender import (
     QueueingEmailSender,
     build_sender,
 )
+from .events import EVENT_SCAN_FINISHED, EVENT_SCAN_STARTED, get_event_bus
 from .idle_utils import get_idle_seconds
 from .io_utils import read_json_safe
-from .logging_setup import log_context, sanitize_text, scan_context, setup_logging
+from .logging_setup import (
+    dedup_cache_size,
+    log_context,
+    sanitize_text,
+    scan_context,
+    setup_logging,
+)
+from .memory_watchdog import MemoryReport, MemoryWatchdog
+from .metrics import (
+    LOG_DEDUP_ENTRIES,
+    MATCHES_TOTAL,
+    QUEUE_DRAIN_MS,
+    SCAN_ERRORS_TOTAL,
+    SCAN_FILTER_MS,
+    SCAN_LOOP_MS,
+    SCAN_MONITOR_MS,
+    SCANS_TOTAL,
+    STATE_WRITE_MS,
+    TELEMETRY_WRITE_MS,
+    get_metrics_registry,
+)
+from .metrics_http import MetricsHttpServer
+from .perf_summary import (
+    PHASE_DISK_CHECK,
+    PHASE_LOOP_ITERATION,
+    PHASE_MONITOR_SCAN,
+    PHASE_QUEUE_DRAIN,
+    PHASE_SCAN_LOOP,
+    PerfAggregator,
+)
+from .profiling import get_profiler
+from .scan_timeline import (
+    RESULT_ERROR,
+    RESULT_MATCH,
+    RESULT_OK,
+    RESULT_SKIPPED,
+    RESULT_UNAVAILABLE,
+)
 from .scan_utils import dedupe_items, filter_debounce, filter_min_repeat
-from .status import StatusStore, format_status
-from .telemetry import JsonWriter, atomic_write_text
+from .smtp_circuit import get_smtp_circuit_breaker
+from .smtp_endpoints import get_smtp_endpoint_registry, unique_endpoints
+from .status import StatusSnapshot, StatusStore, format_status
+from .telemetry import TelemetryWriter, atomic_write_text
+from .tracing import get_tracer
 
 LOGGER = logging.getLogger(__name__)
 EMAIL_DISABLED_LOG_COOLDOWN_SECONDS = 300
+SMTP_HEALTHCHECK_TIMEOUT_SECONDS = 10
+SMTP_HEALTHCHECK_DEADLINE_SECONDS = 15
 
 
 @dataclass
@@ -58,6 +102,11 @@ class MonitorRuntime:
     last_send_queued: bool = False
     last_scan_text: str = ""
     last_scan_number: int | None = None
+    digest: AlertDigest | None = None
+    telemetry_static: dict[str, str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.telemetry_static = _monitor_telemetry_static(self.key, self.config)
 
 
 def _apply_execution_state(prevent_sleep: bool) -> bool:
@@ -165,6 +214,34 @@ def _build_alert_message(text: str, previous_number: int | None) -> str:
     return f"{text}\nVariação desde o último scan: {delta_label}"
 
 
+def _monitor_telemetry_static(key: str, monitor: MonitorConfig) -> dict[str, str]:
+    return {
+        "monitor_key_hash": _hash_value(key),
+        "window_title_hash": _hash_value(monitor.window_title_regex),
+        "phrase_hash": _hash_value(monitor.phrase_regex),
+    }
+
+
+def _build_digest(monitor: MonitorConfig) -> AlertDigest | None:
+    if monitor.digest_window_seconds <= 0:
+        return None
+    return AlertDigest(
+        window_seconds=monitor.digest_window_seconds,
+        max_items=monitor.digest_max_items,
+    )
+
+
+def _build_perf_aggregator(config: AppConfig) -> PerfAggregator:
+    # The scan loop and the loop iteration enclose the monitor scans, queue
+    # drain and disk check, which warn on their own: one slow scan should
+    # log one outlier, not three.  The enclosing phases are still summarised.
+    return PerfAggregator(
+        interval_seconds=config.perf_summary_interval_seconds,
+        outlier_ms=config.perf_outlier_ms,
+        outlier_overrides_ms={PHASE_SCAN_LOOP: 0, PHASE_LOOP_ITERATION: 0},
+    )
+
+
 def _get_version() -> str:
     try:
         return importlib.metadata.version("z7_sentineltray")
@@ -206,30 +283,84 @@ def _get_commit_hash() -> str:
 def _check_smtp_health(config: AppConfig) -> None:
     if not config.monitors:
         return
+    endpoints = unique_endpoints(monitor.email for monitor in config.monitors)
+    if not endpoints:
+        return
 
     def _check() -> None:
-        for monitor_cfg in config.monitors:
-            email = monitor_cfg.email
-            host = email.smtp_host
-            port = email.smtp_port
-            if not host or not port:
+        results = get_smtp_endpoint_registry().probe_all(
+            endpoints,
+            timeout=SMTP_HEALTHCHECK_TIMEOUT_SECONDS,
+            deadline_seconds=SMTP_HEALTHCHECK_DEADLINE_SECONDS,
+        )
+        for result in results:
+            # A TCP connect says nothing about 421s or AUTH/TLS stalls, so a
+            # healthy probe never closes the circuit: real sends do that.
+            if result.healthy:
                 continue
-            try:
-                with socket.create_connection((host, int(port)), timeout=10):
-                    pass
-            except OSError as exc:
-                LOGGER.warning(
-                    "SMTP healthcheck failed for %s:%s: %s",
-                    host,
-                    port,
-                    exc,
-                    extra={"category": "send"},
-                )
+            endpoint = result.endpoint
+            LOGGER.warning(
+                "SMTP healthcheck failed for %s:%s: %s",
+                endpoint.host,
+                endpoint.port,
+                result.error,
+                extra={"category": "send"},
+            )
+            if config.smtp_circuit_failure_threshold > 0:
+                # Let senders fail fast to the queue instead of discovering the outage.
+                get_smtp_circuit_breaker(
+                    endpoint.host,
+                    endpoint.port,
+                    failure_threshold=config.smtp_circuit_failure_threshold,
+                    open_seconds=config.smtp_circuit_open_seconds,
+                ).trip()
 
     t = Thread(target=_check, daemon=True, name="smtp-health-check")
     t.start()
 
 
+# AppConfig fields read when a component is built; a change rebuilds it on reload.
+_LOGGING_FIELDS = (
+    "log_file",
+    "log_level",
+    "log_console_level",
+    "log_console_enabled",
+    "log_max_bytes",
+    "log_backup_count",
+    "log_run_files_keep",
+    "log_dedup_window_seconds",
+    "log_dedup_max_entries",
+    "log_dedup_normalize_numbers",
+    "log_retention_max_total_mb",
+    "log_retention_max_age_days",
+    "log_compress_rotated",
+)
+_TRACE_FIELDS = ("trace_file", "trace_sample_rate", "log_max_bytes", "log_backup_count")
+_SENDER_FIELDS = (
+    "email_queue_file",
+    "email_queue_max_items",
+    "email_queue_max_age_seconds",
+    "email_queue_max_attempts",
+    "email_queue_retry_base_seconds",
+    "smtp_circuit_failure_threshold",
+    "smtp_circuit_open_seconds",
+)
+_TELEMETRY_FIELDS = ("telemetry_file", "telemetry_max_staleness_seconds", "telemetry_fsync")
+_METRICS_HTTP_FIELDS = ("metrics_http_enabled", "metrics_http_bind", "metrics_http_port")
+_MEMORY_WATCHDOG_FIELDS = (
+    "memory_watchdog_enabled",
+    "memory_watchdog_interval_seconds",
+    "memory_growth_threshold_mb",
+    "memory_structure_growth_threshold",
+    "memory_tracemalloc",
+)
+_PERF_FIELDS = ("perf_summary_interval_seconds", "perf_outlier_ms")
+
+
+def _config_changed(old: AppConfig, new: AppConfig, names: tuple[str, ...]) -> bool:
+    return any(getattr(old, name) != getattr(new, name) for name in names)
+
+
 @dataclass
 class Notifier:
     """Orchestrates monitors, email delivery, and loop lifecycle."""
@@ -243,15 +374,24 @@ class Notifier:
         self._history = _load_state(self._state_path)
         for monitor in self._monitors:
             monitor.last_sent = self._build_last_sent_map(self._history, monitor.key)
+        self.status.set_scan_timeline_size(self.config.scan_timeline_size)
         self._started_at = datetime.now(UTC)
         self._next_healthcheck = time.monotonic() + self.config.healthcheck_interval_seconds
         self._next_queue_drain = time.monotonic() + 30
-        self._telemetry = JsonWriter(Path(self.config.telemetry_file))
+        self._telemetry = TelemetryWriter(
+            Path(self.config.telemetry_file),
+            max_staleness_seconds=self.config.telemetry_max_staleness_seconds,
+            fsync=self.config.telemetry_fsync,
+        )
         self._app_version = _get_version()
         self._release_date = _get_release_date()
         self._commit_hash = ""
         self._telemetry_write_errors = 0
         self._state_write_errors = 0
+        self._metrics_server: MetricsHttpServer | None = None
+        self._metrics_published_version = -1
+        self._memory_watchdog: MemoryWatchdog | None = None
+        self._perf = _build_perf_aggregator(self.config)
         self._last_scan_error = False
         self._last_scan_had_match = False
         self._last_no_match_test_at: float = 0.0
@@ -264,6 +404,9 @@ class Notifier:
             "oldest_age_seconds": 0,
         }
         self._sender: EmailSender | None = None
+        self._config_lock = Lock()
+        self._pending_config: AppConfig | None = None
+        self._loop_active = False
 
         def _fetch_commit_hash() -> None:
             self._commit_hash = _get_commit_hash()
@@ -273,18 +416,9 @@ class Notifier:
 
     def _reset_components(self) -> None:
         for monitor in self._monitors:
-            monitor.detector = WindowTextDetector(
-                monitor.config.window_title_regex,
-                allow_window_restore=self.config.allow_window_restore,
-                log_throttle_seconds=60,
-            )
-            monitor.sender = build_sender(
-                monitor.config.email,
-                queue_path=self._queue_path_for_monitor(monitor.key, len(self._monitors)),
-                queue_max_items=self.config.email_queue_max_items,
-                queue_max_age_seconds=self.config.email_queue_max_age_seconds,
-                queue_max_attempts=self.config.email_queue_max_attempts,
-                queue_retry_base_seconds=self.config.email_queue_retry_base_seconds,
+            monitor.detector = self._build_detector(monitor.config)
+            monitor.sender = self._build_monitor_sender(
+                monitor.config, monitor.key, len(self._monitors)
             )
             monitor.email_disabled = False
             monitor.failure_count = 0
@@ -313,30 +447,49 @@ class Notifier:
         if not self.config.monitors:
             raise ValueError("monitors must be configured")
 
-        runtimes: list[MonitorRuntime] = []
         monitor_count = len(self.config.monitors)
-        for monitor in self.config.monitors:
-            key = f"{monitor.window_title_regex}|{monitor.phrase_regex}"
-            runtimes.append(
-                MonitorRuntime(
-                    key=key,
-                    config=monitor,
-                    detector=WindowTextDetector(
-                        monitor.window_title_regex,
-                        allow_window_restore=self.config.allow_window_restore,
-                        log_throttle_seconds=60,
-                    ),
-                    sender=build_sender(
-                        monitor.email,
-                        queue_path=self._queue_path_for_monitor(key, monitor_count),
-                        queue_max_items=self.config.email_queue_max_items,
-                        queue_max_age_seconds=self.config.email_queue_max_age_seconds,
-                        queue_max_attempts=self.config.email_queue_max_attempts,
-                        queue_retry_base_seconds=self.config.email_queue_retry_base_seconds,
-                    ),
-                )
+        return [
+            self._build_monitor_runtime(monitor, monitor_count) for monitor in self.config.monitors
+        ]
+
+    def _build_monitor_runtime(self, monitor: MonitorConfig, monitor_count: int) -> MonitorRuntime:
+        key = f"{monitor.window_title_regex}|{monitor.phrase_regex}"
+        return MonitorRuntime(
+            key=key,
+            config=monitor,
+            detector=self._build_detector(monitor),
+            sender=self._build_monitor_sender(monitor, key, monitor_count),
+            digest=_build_digest(monitor),
+        )
+
+    def _build_detector(self, monitor: MonitorConfig) -> WindowTextDetector:
+        return WindowTextDetector(
+            monitor.window_title_regex,
+            allow_window_restore=self.config.allow_window_restore,
+            log_throttle_seconds=60,
+        )
+
+    def _build_monitor_sender(
+        self, monitor: MonitorConfig, key: str, monitor_count: int
+    ) -> EmailSender:
+        email = monitor.email
+        circuit_breaker = None
+        if self.config.smtp_circuit_failure_threshold > 0 and email.smtp_host:
+            circuit_breaker = get_smtp_circuit_breaker(
+                email.smtp_host,
+                email.smtp_port,
+                failure_threshold=self.config.smtp_circuit_failure_threshold,
+                open_seconds=self.config.smtp_circuit_open_seconds,
             )
-        return runtimes
+        return build_sender(
+            email,
+            queue_path=self._queue_path_for_monitor(key, monitor_count),
+            queue_max_items=self.config.email_queue_max_items,
+            queue_max_age_seconds=self.config.email_queue_max_age_seconds,
+            queue_max_attempts=self.config.email_queue_max_attempts,
+            queue_retry_base_seconds=self.config.email_queue_retry_base_seconds,
+            circuit_breaker=circuit_breaker,
+        )
 
     def _queue_path_for_monitor(self, monitor_key: str, monitor_count: int) -> Path:
         base = Path(self.config.email_queue_file)
@@ -473,21 +626,38 @@ class Notifier:
     def scan_once(self) -> None:
         """Run a single monitoring scan cycle with a fresh scan context."""
         scan_id = uuid4().hex
-        with scan_context(scan_id):
-            self._scan_once_impl()
+        events = get_event_bus()
+        events.emit(EVENT_SCAN_STARTED)
+        try:
+            with scan_context(scan_id), get_tracer().trace(scan_id, monitors=len(self._monitors)):
+                self._scan_once_impl()
+        finally:
+            events.emit(
+                EVENT_SCAN_FINISHED,
+                error=self._last_scan_error,
+                match=self._last_scan_had_match,
+            )
 
     def _scan_once_impl(self) -> None:  # noqa: C901
         self.status.set_last_scan(_now_iso())
         any_match = False
         self._last_scan_error = False
         self._last_scan_had_match = False
+        metrics = get_metrics_registry()
+        metrics.counter(SCANS_TOTAL).inc()
+        tracer = get_tracer()
         scan_started = time.perf_counter()
         for index, monitor in enumerate(self._monitors, start=1):
-            with log_context(
-                monitor_index=index,
-                monitor_key=_summarize_text(monitor.key),
+            monitor_label = monitor.telemetry_static["monitor_key_hash"][:12]
+            with (
+                log_context(
+                    monitor_index=index,
+                    monitor_key=_summarize_text(monitor.key),
+                ),
+                tracer.span("monitor", monitor=monitor_label),
             ):
                 monitor_started = time.perf_counter()
+                monitor_started_at = time.time()
                 monitor_error: str | None = None
                 now_mono = time.monotonic()
                 if monitor.breaker_until and now_mono < monitor.breaker_until:
@@ -497,9 +667,19 @@ class Notifier:
                         "Skipping scan; circuit breaker active for monitor",
                         extra={"category": "scan"},
                     )
+                    tracer.annotate(skipped="breaker")
+                    self.status.record_scan(
+                        monitor.key,
+                        timestamp=monitor_started_at,
+                        duration_ms=0.0,
+                        result=RESULT_SKIPPED,
+                    )
                     continue
+                matched = 0
                 try:
                     matches = monitor.detector.find_matches(monitor.config.phrase_regex)
+                    matched = len(matches)
+                    metrics.counter(MATCHES_TOTAL).inc(len(matches))
                     monitor.failure_count = 0
                     monitor.breaker_until = 0.0
                     monitor.last_window_ok_at = _now_iso()
@@ -530,17 +710,31 @@ class Notifier:
                     continue
                 finally:
                     duration_ms = (time.perf_counter() - monitor_started) * 1000
-                    if LOGGER.isEnabledFor(logging.INFO):
-                        LOGGER.info(
-                            "Monitor scan duration %.2fms",
-                            duration_ms,
-                            extra={
-                                "category": "perf",
-                                "monitor": _summarize_text(monitor.key),
-                                "error": monitor_error or "",
-                            },
-                        )
+                    metrics.histogram(SCAN_MONITOR_MS).observe(duration_ms)
+                    if monitor_error:
+                        metrics.counter(SCAN_ERRORS_TOTAL).inc()
+                        tracer.annotate(error=monitor_error)
+                    self._perf.observe(
+                        PHASE_MONITOR_SCAN,
+                        duration_ms,
+                        monitor=monitor.telemetry_static["monitor_key_hash"][:12],
+                    )
+                    if monitor_error == "window_unavailable":
+                        result = RESULT_UNAVAILABLE
+                    elif monitor_error:
+                        result = RESULT_ERROR
+                    else:
+                        result = RESULT_MATCH if matched else RESULT_OK
+                    self.status.record_scan(
+                        monitor.key,
+                        timestamp=monitor_started_at,
+                        duration_ms=duration_ms,
+                        elements=monitor.detector.last_element_count,
+                        result=result,
+                        matched=matched,
+                    )
 
+            filter_started = time.perf_counter()
             normalized = [_normalize(text) for text in matches if text]
             if index == 1:
                 if normalized:
@@ -615,24 +809,32 @@ class Notifier:
                         continue
                     filtered_items.append(text)
                 send_items = filtered_items
+            metrics.histogram(SCAN_FILTER_MS).observe((time.perf_counter() - filter_started) * 1000)
+            tracer.record(
+                "filter",
+                filter_started,
+                monitor=monitor_label,
+                matches=len(normalized),
+                send=len(send_items),
+            )
 
             if normalized:
                 any_match = True
                 self._last_scan_had_match = True
-                self.status.set_last_match(_summarize_text(normalized[0]))
-                self.status.set_last_match_at(_now_iso())
+                self.status.update(
+                    last_match=_summarize_text(normalized[0]), last_match_at=_now_iso()
+                )
 
             for text in send_items:
                 alert_message = _build_alert_message(text, monitor.last_scan_number)
-                if self._send_message(monitor, alert_message, category="send", force_send=True):
-                    self.status.set_last_send(_now_iso())
-                    if monitor.last_send_queued:
-                        LOGGER.info("Queued message", extra={"category": "send"})
-                    else:
-                        LOGGER.info("Sent message", extra={"category": "send"})
-                    sent_at = _now_iso()
-                    self._history.append({"text": text, "sent_at": sent_at, "monitor": monitor.key})
-                    monitor.last_sent[text] = datetime.fromisoformat(sent_at)
+                if monitor.digest is not None:
+                    # A line still pending is not in last_sent yet, so it comes
+                    # back on every scan; the digest counts those repeats.
+                    monitor.digest.add(text, alert_message)
+                    continue
+                self._deliver_alert(monitor, alert_message, [text])
+            if monitor.digest is not None and monitor.digest.is_full():
+                self._flush_digest(monitor)
             if normalized:
                 monitor.last_scan_text = normalized[0]
                 monitor.last_scan_number = _leading_number(normalized[0])
@@ -640,24 +842,81 @@ class Notifier:
                 monitor.last_scan_text = ""
                 monitor.last_scan_number = None
 
+        digest_flushed = self._flush_alert_digests()
         if len(self._history) > self.config.max_history:
             self._history = self._history[-self.config.max_history :]
             for monitor in self._monitors:
                 monitor.last_sent = self._build_last_sent_map(self._history, monitor.key)
             self._persist_state()
-        elif any_match:
+        elif any_match or digest_flushed:
             self._persist_state()
 
         total_ms = (time.perf_counter() - scan_started) * 1000
+        metrics.histogram(SCAN_LOOP_MS).observe(total_ms)
+        self._perf.observe(PHASE_SCAN_LOOP, total_ms)
+
+    def _deliver_alert(self, monitor: MonitorRuntime, message: str, texts: list[str]) -> bool:
+        with get_tracer().span(
+            "send", monitor=monitor.telemetry_static["monitor_key_hash"][:12], items=len(texts)
+        ):
+            delivered = self._send_message(monitor, message, category="send", force_send=True)
+        if not delivered:
+            return False
+        self.status.set_last_send(_now_iso())
+        if monitor.last_send_queued:
+            LOGGER.info("Queued message", extra={"category": "send"})
+        else:
+            LOGGER.info("Sent message", extra={"category": "send"})
+        sent_at = _now_iso()
+        for text in texts:
+            self._history.append({"text": text, "sent_at": sent_at, "monitor": monitor.key})
+            monitor.last_sent[text] = datetime.fromisoformat(sent_at)
+        return True
+
+    def _flush_digest(self, monitor: MonitorRuntime) -> bool:
+        digest = monitor.digest
+        if digest is None or not len(digest):
+            return False
+        window_seconds = digest.age_seconds()
+        entries = digest.drain()
         LOGGER.info(
-            "Scan loop duration %.2fms",
-            total_ms,
-            extra={"category": "perf"},
+            "Flushing alert digest: %s lines, %s matches",
+            len(entries),
+            sum(entry.count for entry in entries),
+            extra={"category": "send"},
+        )
+        message = format_digest(entries, window_seconds)
+        if self._deliver_alert(monitor, message, [entry.text for entry in entries]):
+            return True
+        dropped = digest.requeue(entries, window_seconds)
+        LOGGER.warning(
+            "Alert digest not delivered; keeping %s lines for the next attempt",
+            len(digest),
+            extra={"category": "send"},
         )
+        if dropped:
+            LOGGER.warning(
+                "Alert digest over capacity; dropped %s oldest lines",
+                dropped,
+                extra={"category": "send"},
+            )
+        return False
+
+    def _flush_alert_digests(self, *, force: bool = False) -> bool:
+        """Send every digest whose window elapsed (or every pending one if *force*)."""
+        flushed = False
+        for monitor in self._monitors:
+            digest = monitor.digest
+            if digest is None or not (digest.is_due() or (force and len(digest))):
+                continue
+            if self._flush_digest(monitor):
+                flushed = True
+        return flushed
 
     def _persist_state(self) -> None:
         try:
-            _save_state(self._state_path, self._history)
+            with get_metrics_registry().timer(STATE_WRITE_MS), get_tracer().span("persist"):
+                _save_state(self._state_path, self._history)
         except Exception:
             self._state_write_errors += 1
             LOGGER.exception(
@@ -762,6 +1021,7 @@ class Notifier:
                     window_title_regex=monitor.config.window_title_regex,
                     phrase_regex=monitor.config.phrase_regex,
                     poll_interval_seconds=self.config.poll_interval_seconds,
+                    monitor_key=monitor.key,
                 )
                 message = f"status: Em execução\n{status_text}"
                 safe_message = _safe_status_text(message)
@@ -792,6 +1052,44 @@ class Notifier:
 
     def _update_telemetry(self) -> None:
         snapshot = self.status.snapshot()
+        now_mono = time.monotonic()
+        # Heartbeat fields (timestamps refreshed every cycle, uptime, ages,
+        # breaker countdowns) are left out: the staleness interval covers them.
+        fingerprint = (
+            tuple(
+                (
+                    monitor.failure_count,
+                    monitor.breaker_until > now_mono,
+                    monitor.last_window_error_at,
+                )
+                for monitor in self._monitors
+            ),
+            self._commit_hash,
+            snapshot.running,
+            snapshot.last_match,
+            snapshot.last_match_at,
+            snapshot.last_send,
+            snapshot.last_error,
+            snapshot.last_healthcheck,
+            snapshot.error_count,
+            tuple(sorted(self._queue_stats.items())),
+            self._telemetry_write_errors,
+            self._state_write_errors,
+        )
+        try:
+            write_started = time.perf_counter()
+            if self._telemetry.update(
+                lambda: self._build_telemetry_payload(snapshot, now_mono),
+                fingerprint=fingerprint,
+            ):
+                get_metrics_registry().histogram(TELEMETRY_WRITE_MS).observe(
+                    (time.perf_counter() - write_started) * 1000
+                )
+        except Exception:
+            self._telemetry_write_errors += 1
+            LOGGER.exception("Telemetry write failed", extra={"category": "error"})
+
+    def _build_telemetry_payload(self, snapshot: StatusSnapshot, now_mono: float) -> dict[str, Any]:
         match_age_seconds = 0
         if snapshot.last_match_at:
             try:
@@ -801,26 +1099,24 @@ class Notifier:
                 match_age_seconds = 0
         monitor_payload: list[dict[str, Any]] = []
         for monitor in self._monitors:
-            breaker_remaining = max(0.0, monitor.breaker_until - time.monotonic())
+            breaker_remaining = max(0.0, monitor.breaker_until - now_mono)
             monitor_payload.append(
                 {
-                    "monitor_key_hash": _hash_value(monitor.key),
-                    "window_title_hash": _hash_value(monitor.config.window_title_regex),
-                    "phrase_hash": _hash_value(monitor.config.phrase_regex),
+                    **monitor.telemetry_static,
                     "failure_count": monitor.failure_count,
                     "breaker_remaining_seconds": int(breaker_remaining),
                     "last_window_ok": _safe_status_text(monitor.last_window_ok_at),
                     "last_window_error": _safe_status_text(monitor.last_window_error_at),
                 }
             )
-        payload: dict[str, Any] = {
+        return {
             "updated_at": _now_iso(),
             "app_version": self._app_version,
             "release_date": self._release_date,
             "commit_hash": self._commit_hash,
-            "window_title_hash": _hash_value(self._monitors[0].config.window_title_regex),
+            "window_title_hash": self._monitors[0].telemetry_static["window_title_hash"],
             "window_title_hashes": [
-                _hash_value(monitor.config.window_title_regex) for monitor in self._monitors
+                monitor.telemetry_static["window_title_hash"] for monitor in self._monitors
             ],
             "monitor_count": len(self._monitors),
             "monitors": monitor_payload,
@@ -837,12 +1133,85 @@ class Notifier:
             "email_queue": self._queue_stats,
             "telemetry_write_errors": self._telemetry_write_errors,
             "state_write_errors": self._state_write_errors,
+            "metrics": snapshot.metrics,
         }
+
+    def _start_metrics_server(self) -> None:
+        if not self.config.metrics_http_enabled or self._metrics_server is not None:
+            return
+        server = MetricsHttpServer(self.config.metrics_http_bind, self.config.metrics_http_port)
         try:
-            self._telemetry.write(payload)
-        except Exception:
-            self._telemetry_write_errors += 1
-            LOGGER.exception("Telemetry write failed", extra={"category": "error"})
+            server.start()
+        except OSError as exc:
+            LOGGER.warning(
+                "Metrics endpoint unavailable on %s:%s: %s",
+                self.config.metrics_http_bind,
+                self.config.metrics_http_port,
+                exc,
+                extra={"category": "metrics"},
+            )
+            return
+        self._metrics_server = server
+        self._metrics_published_version = -1
+
+    def _stop_metrics_server(self) -> None:
+        server = self._metrics_server
+        if server is None:
+            return
+        self._metrics_server = None
+        server.stop()
+
+    def _publish_metrics(self) -> None:
+        registry = get_metrics_registry()
+        registry.gauge(LOG_DEDUP_ENTRIES).set(dedup_cache_size())
+        self.status.set_metrics(registry.snapshot())
+        server = self._metrics_server
+        if server is None:
+            return
+        snapshot = self.status.snapshot()
+        if snapshot.version == self._metrics_published_version:
+            return
+        # Monitor keys embed window titles and phrases; only their hashes are exposed.
+        labels = {
+            monitor.key: monitor.telemetry_static["monitor_key_hash"][:12]
+            for monitor in self._monitors
+        }
+        server.publish(snapshot, labels)
+        self._metrics_published_version = snapshot.version
+
+    def _memory_probes(self) -> dict[str, Callable[[], int]]:
+        return {
+            "log_dedup_keys": dedup_cache_size,
+            "detector_log_keys": lambda: sum(
+                monitor.detector.log_throttle_size for monitor in self._monitors
+            ),
+            "alert_history": lambda: len(self._history),
+            "status_monitor_keys": lambda: len(self.status.snapshot().monitor_failures),
+        }
+
+    def _on_memory_report(self, report: MemoryReport) -> None:
+        self.status.set_memory(report.rss_bytes, "; ".join(report.reasons))
+
+    def _start_memory_watchdog(self) -> None:
+        if not self.config.memory_watchdog_enabled or self._memory_watchdog is not None:
+            return
+        watchdog = MemoryWatchdog(
+            self._memory_probes(),
+            interval_seconds=self.config.memory_watchdog_interval_seconds,
+            rss_growth_threshold_mb=self.config.memory_growth_threshold_mb,
+            structure_growth_threshold=self.config.memory_structure_growth_threshold,
+            trace_allocations=self.config.memory_tracemalloc,
+            on_report=self._on_memory_report,
+        )
+        watchdog.start()
+        self._memory_watchdog = watchdog
+
+    def _stop_memory_watchdog(self) -> None:
+        watchdog = self._memory_watchdog
+        if watchdog is None:
+            return
+        self._memory_watchdog = None
+        watchdog.stop()
 
     def _ensure_free_disk(self) -> None:
         try:
@@ -893,6 +1262,184 @@ class Notifier:
         self._queue_stats = total
         self.status.set_email_queue_stats(total)
 
+    def _setup_logging(self) -> None:
+        setup_logging(
+            self.config.log_file,
+            log_level=self.config.log_level,
+            log_console_level=self.config.log_console_level,
+            log_console_enabled=self.config.log_console_enabled,
+            log_max_bytes=self.config.log_max_bytes,
+            log_backup_count=self.config.log_backup_count,
+            log_run_files_keep=self.config.log_run_files_keep,
+            log_dedup_window_seconds=self.config.log_dedup_window_seconds,
+            log_dedup_max_entries=self.config.log_dedup_max_entries,
+            log_dedup_normalize_numbers=self.config.log_dedup_normalize_numbers,
+            log_retention_max_total_mb=self.config.log_retention_max_total_mb,
+            log_retention_max_age_days=self.config.log_retention_max_age_days,
+            log_compress_rotated=self.config.log_compress_rotated,
+            app_version=self._app_version,
+            release_date=self._release_date,
+            commit_hash=self._commit_hash,
+        )
+
+    def _configure_tracer(self) -> None:
+        get_tracer().configure(
+            Path(self.config.trace_file) if self.config.trace_sample_rate > 0 else None,
+            sample_rate=self.config.trace_sample_rate,
+            max_bytes=self.config.log_max_bytes,
+            backup_count=self.config.log_backup_count,
+        )
+
+    def apply_config(self, new_config: AppConfig) -> None:
+        """Switch to *new_config* without restarting the monitoring loop.
+
+        Monitors are matched by key (window and phrase regex): unchanged
+        monitors keep their detector, sender (queue and SMTP connection),
+        digest and debounce history; only monitors whose settings changed
+        are rebuilt, and shared components (logging, tracing, telemetry,
+        metrics endpoint, memory watchdog) are restarted only when their
+        own settings changed.  While :meth:`run_loop` is running the change
+        is applied by the loop thread before its next cycle, which starts
+        at once; otherwise it is applied immediately.
+
+        Raises:
+            ValueError: If *new_config* has no monitors.
+        """
+        if not new_config.monitors:
+            raise ValueError("monitors must be configured")
+        with self._config_lock:
+            if self._loop_active:
+                self._pending_config = new_config
+                return
+            self._reconfigure(new_config, running=False)
+
+    def _apply_pending_config(self) -> None:
+        with self._config_lock:
+            new_config, self._pending_config = self._pending_config, None
+        if new_config is not None:
+            self._reconfigure(new_config, running=True)
+
+    def _reconfigure(self, new_config: AppConfig, *, running: bool) -> None:
+        old_config = self.config
+        if new_config == old_config:
+            return
+        self.config = new_config
+        try:
+            monitors, updates, removed = self._reconcile_monitors(old_config)
+        except Exception:
+            self.config = old_config
+            raise
+        email_changed = len(monitors) > len(updates) or any(
+            changes["config"].email != monitor.config.email for monitor, changes in updates
+        )
+        flushed = False
+        for monitor in removed:
+            flushed = self._flush_digest(monitor) or flushed
+        for monitor, changes in updates:
+            if "digest" in changes:
+                flushed = self._flush_digest(monitor) or flushed
+            for name, value in changes.items():
+                setattr(monitor, name, value)
+        self._monitors = monitors
+        if removed:
+            self.status.remove_monitors([monitor.key for monitor in removed])
+        state_path = Path(new_config.state_file)
+        if state_path != self._state_path:
+            # Keep the old file complete, then continue from the new file's
+            # history as a restart would.
+            self._persist_state()
+            self._state_path = state_path
+            self._history = _load_state(state_path)
+            for monitor in monitors:
+                monitor.last_sent = self._build_last_sent_map(self._history, monitor.key)
+        elif flushed:
+            self._persist_state()
+        self._reconfigure_components(old_config, running=running)
+        if email_changed:
+            _check_smtp_health(new_config)
+        LOGGER.info(
+            "Configuration applied: %s monitors kept, %s added, %s removed, %s senders rebuilt",
+            len(updates),
+            len(monitors) - len(updates),
+            len(removed),
+            sum(1 for _monitor, changes in updates if "sender" in changes),
+            extra={"category": "config"},
+        )
+
+    def _reconfigure_components(self, old_config: AppConfig, *, running: bool) -> None:
+        new_config = self.config
+        if new_config.healthcheck_interval_seconds != old_config.healthcheck_interval_seconds:
+            self._next_healthcheck = time.monotonic() + new_config.healthcheck_interval_seconds
+        self.status.set_scan_timeline_size(new_config.scan_timeline_size)
+        if _config_changed(old_config, new_config, _TELEMETRY_FIELDS):
+            self._telemetry = TelemetryWriter(
+                Path(new_config.telemetry_file),
+                max_staleness_seconds=new_config.telemetry_max_staleness_seconds,
+                fsync=new_config.telemetry_fsync,
+            )
+        if _config_changed(old_config, new_config, _PERF_FIELDS):
+            self._perf.flush()
+            self._perf = _build_perf_aggregator(new_config)
+        # The remaining components only exist while run_loop() is running.
+        if not running:
+            return
+        if _config_changed(old_config, new_config, _LOGGING_FIELDS):
+            self._setup_logging()
+        if _config_changed(old_config, new_config, _TRACE_FIELDS):
+            self._configure_tracer()
+        if _config_changed(old_config, new_config, _METRICS_HTTP_FIELDS):
+            self._stop_metrics_server()
+            self._start_metrics_server()
+            self._metrics_published_version = -1
+        if _config_changed(old_config, new_config, _MEMORY_WATCHDOG_FIELDS):
+            self._stop_memory_watchdog()
+            self._start_memory_watchdog()
+
+    def _reconcile_monitors(
+        self, old_config: AppConfig
+    ) -> tuple[
+        list[MonitorRuntime],
+        list[tuple[MonitorRuntime, dict[str, Any]]],
+        list[MonitorRuntime],
+    ]:
+        """Plan the monitor list for ``self.config`` without touching existing runtimes.
+
+        Returns:
+            The new monitor list (new runtimes already built), the attribute
+            changes to apply to each kept runtime, and the removed runtimes.
+        """
+        new_config = self.config
+        previous = {monitor.key: monitor for monitor in self._monitors}
+        monitor_count = len(new_config.monitors)
+        senders_stale = _config_changed(old_config, new_config, _SENDER_FIELDS) or (
+            (len(self._monitors) <= 1) != (monitor_count <= 1)
+        )
+        detectors_stale = old_config.allow_window_restore != new_config.allow_window_restore
+        monitors: list[MonitorRuntime] = []
+        updates: list[tuple[MonitorRuntime, dict[str, Any]]] = []
+        for monitor_config in new_config.monitors:
+            key = f"{monitor_config.window_title_regex}|{monitor_config.phrase_regex}"
+            runtime = previous.pop(key, None)
+            if runtime is None:
+                runtime = self._build_monitor_runtime(monitor_config, monitor_count)
+                runtime.last_sent = self._build_last_sent_map(self._history, key)
+                monitors.append(runtime)
+                continue
+            changes: dict[str, Any] = {"config": monitor_config}
+            if detectors_stale:
+                changes["detector"] = self._build_detector(monitor_config)
+            if senders_stale or monitor_config.email != runtime.config.email:
+                changes["sender"] = self._build_monitor_sender(monitor_config, key, monitor_count)
+                changes["email_disabled"] = False
+            if (monitor_config.digest_window_seconds, monitor_config.digest_max_items) != (
+                runtime.config.digest_window_seconds,
+                runtime.config.digest_max_items,
+            ):
+                changes["digest"] = _build_digest(monitor_config)
+            monitors.append(runtime)
+            updates.append((runtime, changes))
+        return monitors, updates, list(previous.values())
+
     def run_loop(  # noqa: C901
         self,
         stop_event: Event,
@@ -908,23 +1455,14 @@ class Notifier:
             scan_complete_event: Optional event set after each scan completes.
             test_message_event: Optional event to trigger a test email send.
         """
-        setup_logging(
-            self.config.log_file,
-            log_level=self.config.log_level,
-            log_console_level=self.config.log_console_level,
-            log_console_enabled=self.config.log_console_enabled,
-            log_max_bytes=self.config.log_max_bytes,
-            log_backup_count=self.config.log_backup_count,
-            log_run_files_keep=self.config.log_run_files_keep,
-            app_version=self._app_version,
-            release_date=self._release_date,
-            commit_hash=self._commit_hash,
-        )
+        self._setup_logging()
         if not _apply_execution_state(True):
             LOGGER.warning(
                 "Failed to apply execution state to prevent sleep",
                 extra={"category": "startup"},
             )
+        with self._config_lock:
+            self._loop_active = True
         try:
             LOGGER.info(
                 "Z7_SentinelTray started (beta %s, %s)",
@@ -932,9 +1470,11 @@ class Notifier:
                 self._release_date,
                 extra={"category": "startup"},
             )
-            self.status.set_running(True)
-            self.status.set_uptime_seconds(0)
-            self.status.set_started_at(self._started_at)
+            self.status.update(running=True, uptime_seconds=0, started_at=self._started_at)
+            self._configure_tracer()
+            self._start_metrics_server()
+            self._start_memory_watchdog()
+            self._publish_metrics()
             self._update_telemetry()
             error_count = 0
 
@@ -945,15 +1485,21 @@ class Notifier:
                 while not stop_event.is_set():
                     if manual_scan_event is not None and manual_scan_event.is_set():
                         return True
+                    if self._pending_config is not None:
+                        return True
                     remaining = deadline - time.monotonic()
                     if remaining <= 0:
                         return False
                     stop_event.wait(min(0.5, remaining))
                 return False
 
+            profiler = get_profiler()
+            profile_dir = Path(self.config.log_file).parent
             while not stop_event.is_set():
                 loop_started = time.perf_counter()
+                profiler.before_cycle()
                 try:
+                    self._apply_pending_config()
                     is_manual = manual_scan_event is not None and manual_scan_event.is_set()
                     if is_manual:
                         manual_scan_event.clear()
@@ -964,20 +1510,16 @@ class Notifier:
                         self._send_startup_test()
                     disk_started = time.perf_counter()
                     self._ensure_free_disk()
-                    LOGGER.debug(
-                        "Disk check duration %.2fms",
-                        (time.perf_counter() - disk_started) * 1000,
-                        extra={"category": "perf"},
+                    self._perf.observe(
+                        PHASE_DISK_CHECK, (time.perf_counter() - disk_started) * 1000
                     )
                     now = time.monotonic()
                     if now >= self._next_queue_drain:
                         queue_started = time.perf_counter()
                         self._drain_queues()
-                        LOGGER.info(
-                            "Queue drain duration %.2fms",
-                            (time.perf_counter() - queue_started) * 1000,
-                            extra={"category": "perf"},
-                        )
+                        queue_ms = (time.perf_counter() - queue_started) * 1000
+                        get_metrics_registry().histogram(QUEUE_DRAIN_MS).observe(queue_ms)
+                        self._perf.observe(PHASE_QUEUE_DRAIN, queue_ms)
                         self._next_queue_drain = now + 30
                     if (
                         not is_manual
@@ -1000,6 +1542,8 @@ class Notifier:
                             error_count = 0
                             if is_manual and not self._last_scan_had_match:
                                 self._send_manual_no_match_test()
+                    if self._flush_alert_digests():
+                        self._persist_state()
                 except WindowUnavailableError as exc:
                     self._handle_error(f"erro: janela indisponível: {exc}")
                     LOGGER.info(
@@ -1014,11 +1558,11 @@ class Notifier:
                     error_count += 1
                     self.status.increment_error_count()
                 finally:
-                    LOGGER.info(
-                        "Loop iteration duration %.2fms",
-                        (time.perf_counter() - loop_started) * 1000,
-                        extra={"category": "perf"},
+                    self._perf.observe(
+                        PHASE_LOOP_ITERATION, (time.perf_counter() - loop_started) * 1000
                     )
+                    self._perf.maybe_flush()
+                    profiler.after_cycle(profile_dir)
 
                 self.status.set_uptime_seconds(
                     int((datetime.now(UTC) - self._started_at).total_seconds())
@@ -1028,6 +1572,7 @@ class Notifier:
                     self._send_healthcheck()
                     self._next_healthcheck = now + self.config.healthcheck_interval_seconds
 
+                self._publish_metrics()
                 self._update_telemetry()
 
                 if scan_complete_event is not None:
@@ -1044,9 +1589,21 @@ class Notifier:
                 if _wait_for_next_scan(wait_seconds):
                     continue
 
+            if self._flush_alert_digests(force=True):
+                self._persist_state()
             self.status.set_running(False)
         finally:
+            self._perf.flush()
+            get_profiler().finish(Path(self.config.log_file).parent)
+            get_tracer().flush()
+            self._stop_memory_watchdog()
+            self._stop_metrics_server()
             _apply_execution_state(False)
+            with self._config_lock:
+                self._loop_active = False
+                pending, self._pending_config = self._pending_config, None
+            if pending is not None:
+                self._reconfigure(pending, running=False)
 
 
 def run(config: AppConfig) -> None:
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+import ssl
+import threading
 from collections.abc import Callable
 from dataclasses import dataclass, field, replace
 from pathlib import Path
@@ -11,18 +14,26 @@ from typing import Any, cast
 
 import yaml
 
-from .dpapi_utils import load_secret
 from .path_utils import ensure_under_root, resolve_log_path, resolve_sensitive_path
+from .secret_store import get_secret_store
 from .validation_utils import validate_email_address, validate_regex
 
 MAX_LOG_FILES = 3
 
 CURRENT_CONFIG_VERSION = 1
 
+TLS_MIN_VERSIONS = ("", "TLSv1.2", "TLSv1.3")
+
 LOGGER = logging.getLogger(__name__)
 
 _CONFIG_MIGRATIONS: dict[int, Callable[[dict[str, Any]], dict[str, Any]]] = {}
 
+# Validated configs by ``_config_cache_key``, oldest first.  The editors
+# validate temporary copies, so a few entries are kept, not just the last.
+_CONFIG_CACHE_MAX_ENTRIES = 8
+_CONFIG_CACHE: dict[str, AppConfig] = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
 _DEFAULT_CONFIG_VALUES: dict[str, Any] = {
     "send_repeated_matches": True,
     "min_repeat_seconds": 0,
@@ -39,6 +50,31 @@ _DEFAULT_CONFIG_VALUES: dict[str, Any] = {
     "config_version": CURRENT_CONFIG_VERSION,
     "pause_on_user_active": True,
     "pause_idle_threshold_seconds": 180,
+    "smtp_circuit_failure_threshold": 2,
+    "smtp_circuit_open_seconds": 60,
+    "telemetry_max_staleness_seconds": 60,
+    "telemetry_fsync": True,
+    "metrics_http_enabled": False,
+    "metrics_http_bind": "127.0.0.1",
+    "metrics_http_port": 9464,
+    "trace_file": "logs/trace.jsonl",
+    "trace_sample_rate": 0.0,
+    "memory_watchdog_enabled": True,
+    "memory_watchdog_interval_seconds": 300,
+    "memory_growth_threshold_mb": 100,
+    "memory_structure_growth_threshold": 10000,
+    "memory_tracemalloc": False,
+    "log_dedup_window_seconds": 30,
+    "log_dedup_max_entries": 4096,
+    "log_dedup_normalize_numbers": False,
+    "log_retention_max_total_mb": 200,
+    "log_retention_max_age_days": 30,
+    "log_compress_rotated": True,
+    "perf_summary_interval_seconds": 300,
+    "perf_outlier_ms": 5000,
+    "scan_timeline_size": 60,
+    "config_watch_interval_seconds": 5,
+    "config_watch_debounce_seconds": 2,
 }
 
 
@@ -134,6 +170,9 @@ class EmailConfig:
     subject: str
     retry_attempts: int
     retry_backoff_seconds: int
+    tls_verify: bool = False
+    tls_min_version: str = ""
+    tls_ciphers: str = ""
 
 
 @dataclass(frozen=True)
@@ -143,6 +182,8 @@ class MonitorConfig:
     window_title_regex: str
     phrase_regex: str
     email: EmailConfig
+    digest_window_seconds: int = 0
+    digest_max_items: int = 20
 
 
 @dataclass(frozen=True)
@@ -180,6 +221,31 @@ class AppConfig:
     email_queue_retry_base_seconds: int = 30
     pause_on_user_active: bool = True
     pause_idle_threshold_seconds: int = 180
+    smtp_circuit_failure_threshold: int = 2
+    smtp_circuit_open_seconds: int = 60
+    telemetry_max_staleness_seconds: int = 60
+    telemetry_fsync: bool = True
+    metrics_http_enabled: bool = False
+    metrics_http_bind: str = "127.0.0.1"
+    metrics_http_port: int = 9464
+    trace_file: str = "logs/trace.jsonl"
+    trace_sample_rate: float = 0.0
+    memory_watchdog_enabled: bool = True
+    memory_watchdog_interval_seconds: int = 300
+    memory_growth_threshold_mb: int = 100
+    memory_structure_growth_threshold: int = 10000
+    memory_tracemalloc: bool = False
+    log_dedup_window_seconds: int = 30
+    log_dedup_max_entries: int = 4096
+    log_dedup_normalize_numbers: bool = False
+    log_retention_max_total_mb: int = 200
+    log_retention_max_age_days: int = 30
+    log_compress_rotated: bool = True
+    perf_summary_interval_seconds: int = 300
+    perf_outlier_ms: int = 5000
+    scan_timeline_size: int = 60
+    config_watch_interval_seconds: int = 5
+    config_watch_debounce_seconds: int = 2
     monitors: list[MonitorConfig] = field(default_factory=lambda: cast(list[MonitorConfig], []))
     config_version: int = 1
 
@@ -190,13 +256,21 @@ def _get_required(data: dict[str, Any], key: str) -> Any:  # noqa: ANN401
     return data[key]
 
 
-def _load_yaml(path: Path) -> dict[str, Any]:
+def _read_config_bytes(path: Path) -> bytes:
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
     try:
-        text = path.read_text(encoding="utf-8")
+        return path.read_bytes()
     except OSError as exc:
         raise ValueError(f"Failed to read config file: {path}") from exc
+
+
+def _load_yaml(path: Path) -> dict[str, Any]:
+    return _parse_yaml(_read_config_bytes(path), path)
+
+
+def _parse_yaml(content: bytes, path: Path) -> dict[str, Any]:
+    text = content.decode("utf-8")
     try:
         raw: object = yaml.safe_load(text) or {}
     except yaml.YAMLError as exc:
@@ -262,7 +336,7 @@ def _build_email_config(
         index = monitor_index or 0
         secret_path = get_user_data_dir() / f"smtp_password_{index}.dpapi"
         try:
-            stored_password = load_secret(secret_path)
+            stored_password = get_secret_store().load(secret_path)
         except Exception:
             stored_password = None
         if stored_password:
@@ -285,6 +359,9 @@ def _build_email_config(
         subject=str(_get_required(email_data, "subject")),
         retry_attempts=int(_get_required(email_data, "retry_attempts")),
         retry_backoff_seconds=int(_get_required(email_data, "retry_backoff_seconds")),
+        tls_verify=bool(email_data.get("tls_verify", False)),
+        tls_min_version=str(email_data.get("tls_min_version") or ""),
+        tls_ciphers=str(email_data.get("tls_ciphers") or ""),
     )
 
 
@@ -308,6 +385,8 @@ def _build_config(data: dict[str, Any]) -> AppConfig:  # noqa: C901
                 window_title_regex=str(_get_required(entry_map, "window_title_regex")),
                 phrase_regex=str(_get_required(entry_map, "phrase_regex")),
                 email=monitor_email,
+                digest_window_seconds=int(entry_map.get("digest_window_seconds", 0)),
+                digest_max_items=int(entry_map.get("digest_max_items", 20)),
             )
         )
 
@@ -357,6 +436,56 @@ def _build_config(data: dict[str, Any]) -> AppConfig:  # noqa: C901
         defaults_applied.append("pause_on_user_active")
     if "pause_idle_threshold_seconds" not in data:
         defaults_applied.append("pause_idle_threshold_seconds")
+    if "smtp_circuit_failure_threshold" not in data:
+        defaults_applied.append("smtp_circuit_failure_threshold")
+    if "smtp_circuit_open_seconds" not in data:
+        defaults_applied.append("smtp_circuit_open_seconds")
+    if "telemetry_max_staleness_seconds" not in data:
+        defaults_applied.append("telemetry_max_staleness_seconds")
+    if "telemetry_fsync" not in data:
+        defaults_applied.append("telemetry_fsync")
+    if "metrics_http_enabled" not in data:
+        defaults_applied.append("metrics_http_enabled")
+    if "metrics_http_bind" not in data:
+        defaults_applied.append("metrics_http_bind")
+    if "metrics_http_port" not in data:
+        defaults_applied.append("metrics_http_port")
+    if "trace_file" not in data:
+        defaults_applied.append("trace_file")
+    if "trace_sample_rate" not in data:
+        defaults_applied.append("trace_sample_rate")
+    if "memory_watchdog_enabled" not in data:
+        defaults_applied.append("memory_watchdog_enabled")
+    if "memory_watchdog_interval_seconds" not in data:
+        defaults_applied.append("memory_watchdog_interval_seconds")
+    if "memory_growth_threshold_mb" not in data:
+        defaults_applied.append("memory_growth_threshold_mb")
+    if "memory_structure_growth_threshold" not in data:
+        defaults_applied.append("memory_structure_growth_threshold")
+    if "memory_tracemalloc" not in data:
+        defaults_applied.append("memory_tracemalloc")
+    if "log_dedup_window_seconds" not in data:
+        defaults_applied.append("log_dedup_window_seconds")
+    if "log_dedup_max_entries" not in data:
+        defaults_applied.append("log_dedup_max_entries")
+    if "log_dedup_normalize_numbers" not in data:
+        defaults_applied.append("log_dedup_normalize_numbers")
+    if "log_retention_max_total_mb" not in data:
+        defaults_applied.append("log_retention_max_total_mb")
+    if "log_retention_max_age_days" not in data:
+        defaults_applied.append("log_retention_max_age_days")
+    if "log_compress_rotated" not in data:
+        defaults_applied.append("log_compress_rotated")
+    if "perf_summary_interval_seconds" not in data:
+        defaults_applied.append("perf_summary_interval_seconds")
+    if "perf_outlier_ms" not in data:
+        defaults_applied.append("perf_outlier_ms")
+    if "scan_timeline_size" not in data:
+        defaults_applied.append("scan_timeline_size")
+    if "config_watch_interval_seconds" not in data:
+        defaults_applied.append("config_watch_interval_seconds")
+    if "config_watch_debounce_seconds" not in data:
+        defaults_applied.append("config_watch_debounce_seconds")
 
     config = AppConfig(
         poll_interval_seconds=int(_get_required(data, "poll_interval_seconds")),
@@ -392,6 +521,33 @@ def _build_config(data: dict[str, Any]) -> AppConfig:  # noqa: C901
         email_queue_retry_base_seconds=int(data.get("email_queue_retry_base_seconds", 30)),
         pause_on_user_active=bool(data.get("pause_on_user_active", True)),
         pause_idle_threshold_seconds=int(data.get("pause_idle_threshold_seconds", 180)),
+        smtp_circuit_failure_threshold=int(data.get("smtp_circuit_failure_threshold", 2)),
+        smtp_circuit_open_seconds=int(data.get("smtp_circuit_open_seconds", 60)),
+        telemetry_max_staleness_seconds=int(data.get("telemetry_max_staleness_seconds", 60)),
+        telemetry_fsync=bool(data.get("telemetry_fsync", True)),
+        metrics_http_enabled=bool(data.get("metrics_http_enabled", False)),
+        metrics_http_bind=str(data.get("metrics_http_bind", "127.0.0.1")).strip(),
+        metrics_http_port=int(data.get("metrics_http_port", 9464)),
+        trace_file=str(data.get("trace_file", "logs/trace.jsonl")),
+        trace_sample_rate=float(data.get("trace_sample_rate", 0.0)),
+        memory_watchdog_enabled=bool(data.get("memory_watchdog_enabled", True)),
+        memory_watchdog_interval_seconds=int(data.get("memory_watchdog_interval_seconds", 300)),
+        memory_growth_threshold_mb=int(data.get("memory_growth_threshold_mb", 100)),
+        memory_structure_growth_threshold=int(
+            data.get("memory_structure_growth_threshold", 10000)
+        ),
+        memory_tracemalloc=bool(data.get("memory_tracemalloc", False)),
+        log_dedup_window_seconds=int(data.get("log_dedup_window_seconds", 30)),
+        log_dedup_max_entries=int(data.get("log_dedup_max_entries", 4096)),
+        log_dedup_normalize_numbers=bool(data.get("log_dedup_normalize_numbers", False)),
+        log_retention_max_total_mb=int(data.get("log_retention_max_total_mb", 200)),
+        log_retention_max_age_days=int(data.get("log_retention_max_age_days", 30)),
+        log_compress_rotated=bool(data.get("log_compress_rotated", True)),
+        perf_summary_interval_seconds=int(data.get("perf_summary_interval_seconds", 300)),
+        perf_outlier_ms=int(data.get("perf_outlier_ms", 5000)),
+        scan_timeline_size=int(data.get("scan_timeline_size", 60)),
+        config_watch_interval_seconds=int(data.get("config_watch_interval_seconds", 5)),
+        config_watch_debounce_seconds=int(data.get("config_watch_debounce_seconds", 2)),
         monitors=monitors,
         config_version=int(data.get("config_version", 1)),
     )
@@ -415,6 +571,7 @@ def _apply_sensitive_path_policy(config: AppConfig) -> AppConfig:
         log_file=resolve_log_path(base, log_root, config.log_file),
         telemetry_file=resolve_log_path(base, log_root, config.telemetry_file),
         email_queue_file=resolve_log_path(base, log_root, config.email_queue_file),
+        trace_file=resolve_log_path(base, log_root, config.trace_file),
     )
 
 
@@ -450,6 +607,24 @@ def _validate_config(config: AppConfig) -> None:  # noqa: C901
         raise ValueError("log_backup_count must be >= 0")
     if config.log_run_files_keep < 1:
         raise ValueError("log_run_files_keep must be >= 1")
+    if config.log_dedup_window_seconds < 1:
+        raise ValueError("log_dedup_window_seconds must be >= 1")
+    if config.log_dedup_max_entries < 1:
+        raise ValueError("log_dedup_max_entries must be >= 1")
+    if config.log_retention_max_total_mb < 0:
+        raise ValueError("log_retention_max_total_mb must be >= 0")
+    if config.log_retention_max_age_days < 0:
+        raise ValueError("log_retention_max_age_days must be >= 0")
+    if config.perf_summary_interval_seconds < 10:
+        raise ValueError("perf_summary_interval_seconds must be >= 10")
+    if config.perf_outlier_ms < 0:
+        raise ValueError("perf_outlier_ms must be >= 0")
+    if not 1 <= config.scan_timeline_size <= 1000:
+        raise ValueError("scan_timeline_size must be between 1 and 1000")
+    if config.config_watch_interval_seconds < 0:
+        raise ValueError("config_watch_interval_seconds must be >= 0")
+    if config.config_watch_debounce_seconds < 0:
+        raise ValueError("config_watch_debounce_seconds must be >= 0")
     if not _is_valid_log_level(config.log_level):
         raise ValueError("log_level must be a valid logging level")
     if not _is_valid_log_level(config.log_console_level):
@@ -459,6 +634,17 @@ def _validate_config(config: AppConfig) -> None:  # noqa: C901
     ensure_under_root(log_root, config.log_file, "log_file")
     ensure_under_root(log_root, config.telemetry_file, "telemetry_file")
     ensure_under_root(log_root, config.email_queue_file, "email_queue_file")
+    if not config.trace_file:
+        raise ValueError("trace_file is required")
+    ensure_under_root(log_root, config.trace_file, "trace_file")
+    if not 0.0 <= config.trace_sample_rate <= 1.0:
+        raise ValueError("trace_sample_rate must be between 0 and 1")
+    if config.memory_watchdog_interval_seconds < 10:
+        raise ValueError("memory_watchdog_interval_seconds must be >= 10")
+    if config.memory_growth_threshold_mb < 1:
+        raise ValueError("memory_growth_threshold_mb must be >= 1")
+    if config.memory_structure_growth_threshold < 1:
+        raise ValueError("memory_structure_growth_threshold must be >= 1")
     if config.error_notification_cooldown_seconds < 0:
         raise ValueError("error_notification_cooldown_seconds must be >= 0")
     if config.window_error_backoff_base_seconds < 1:
@@ -483,6 +669,16 @@ def _validate_config(config: AppConfig) -> None:  # noqa: C901
         raise ValueError(
             "pause_idle_threshold_seconds must be >= 1 when pause_on_user_active is enabled"
         )
+    if config.smtp_circuit_failure_threshold < 0:
+        raise ValueError("smtp_circuit_failure_threshold must be >= 0")
+    if config.smtp_circuit_open_seconds < 1:
+        raise ValueError("smtp_circuit_open_seconds must be >= 1")
+    if config.telemetry_max_staleness_seconds < 0:
+        raise ValueError("telemetry_max_staleness_seconds must be >= 0")
+    if not 1 <= config.metrics_http_port <= 65535:
+        raise ValueError("metrics_http_port must be between 1 and 65535")
+    if config.metrics_http_enabled and not config.metrics_http_bind:
+        raise ValueError("metrics_http_bind is required when metrics_http_enabled is true")
     if config.config_version < 1:
         raise ValueError("config_version must be >= 1")
     if config.monitors:
@@ -504,12 +700,97 @@ def _validate_config(config: AppConfig) -> None:  # noqa: C901
             validate_email_address("monitors.email.from_address", monitor.email.from_address)
             for address in monitor.email.to_addresses:
                 validate_email_address("monitors.email.to_addresses", address)
+            if monitor.digest_window_seconds < 0:
+                raise ValueError("monitors.digest_window_seconds must be >= 0")
+            if monitor.digest_max_items < 1:
+                raise ValueError("monitors.digest_max_items must be >= 1")
+            if monitor.email.tls_min_version not in TLS_MIN_VERSIONS:
+                raise ValueError(
+                    "monitors.email.tls_min_version must be one of: "
+                    + ", ".join(repr(value) for value in TLS_MIN_VERSIONS)
+                )
+            if monitor.email.tls_ciphers:
+                try:
+                    ssl.create_default_context().set_ciphers(monitor.email.tls_ciphers)
+                except ssl.SSLError as exc:
+                    raise ValueError(
+                        f"monitors.email.tls_ciphers is invalid: {monitor.email.tls_ciphers}"
+                    ) from exc
+
+
+def _secret_file_signatures(data_dir: Path) -> list[str]:
+    try:
+        paths = sorted(data_dir.glob("smtp_password_*.dpapi"))
+    except OSError:
+        return []
+    signatures: list[str] = []
+    for secret_path in paths:
+        try:
+            stat = secret_path.stat()
+        except OSError:
+            continue
+        signatures.append(f"{secret_path.name}:{stat.st_mtime_ns}:{stat.st_size}")
+    return signatures
+
+
+def _config_cache_key(content: bytes) -> str:
+    """Hash everything ``_build_config`` reads besides the YAML itself."""
+    data_dir = get_user_data_dir()
+    digest = hashlib.sha256(content)
+    parts = [str(data_dir)]
+    parts.extend(_secret_file_signatures(data_dir))
+    parts.extend(
+        f"{name}={value}"
+        for name, value in sorted(os.environ.items())
+        if name.startswith("Z7_SENTINELTRAY_SMTP_PASSWORD")
+    )
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(part.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def clear_config_cache() -> None:
+    """Forget every config cached by :func:`load_config`."""
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE.clear()
+
+
+def _copy_config(config: AppConfig) -> AppConfig:
+    """Return *config* with fresh lists, so callers never share mutable state."""
+    monitors = [
+        replace(
+            monitor, email=replace(monitor.email, to_addresses=list(monitor.email.to_addresses))
+        )
+        for monitor in config.monitors
+    ]
+    return replace(config, monitors=monitors)
 
 
 def load_config(path: str) -> AppConfig:
-    """Load and validate an ``AppConfig`` from a YAML file at *path*."""
-    data = _load_yaml(Path(path))
-    return _build_config(data)
+    """Load and validate an ``AppConfig`` from a YAML file at *path*.
+
+    Validated configs are cached for the process lifetime, keyed by a hash
+    of the file content, the data directory, the stored SMTP secret files
+    (name, mtime and size) and the SMTP password environment overrides.  A
+    hit skips YAML parsing, validation and secret decryption; editing any
+    of those inputs misses the cache.  Each call returns its own copy of
+    the cached config's lists.
+    """
+    config_path = Path(path)
+    content = _read_config_bytes(config_path)
+    key = _config_cache_key(content)
+    with _CONFIG_CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(key)
+    if cached is not None:
+        LOGGER.debug("Config cache hit for %s", config_path.name, extra={"category": "config"})
+        return _copy_config(cached)
+    config = _build_config(_parse_yaml(content, config_path))
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[key] = config
+        while len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX_ENTRIES:
+            del _CONFIG_CACHE[next(iter(_CONFIG_CACHE))]
+    return _copy_config(config)
 
 
 def load_config_with_override(base_path: str, override_path: str) -> AppConfig:
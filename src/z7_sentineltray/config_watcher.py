@@ -0,0 +1,140 @@
+"""Background watcher that reloads the config file when it changes on disk."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from .config import AppConfig, load_config
+from .logging_setup import sanitize_text
+
+LOGGER = logging.getLogger(__name__)
+
+_StatSignature = tuple[int, int]
+
+
+def _stat_signature(path: Path) -> _StatSignature | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _content_hash(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class ConfigWatcher:
+    """Poll a YAML config file and hand valid edits to *on_change*.
+
+    Each poll costs one ``stat`` call.  When the modification time or size
+    moves, the watcher waits until they have been stable for
+    *debounce_seconds* (a file copy or an editor save may take several
+    writes), then hashes the content: an unchanged hash (a ``touch`` or an
+    identical copy) is ignored, anything else is validated with
+    :func:`~z7_sentineltray.config.load_config` on the watcher thread.  A
+    valid config is passed to *on_change*; an invalid one leaves the
+    current config in place and is reported once through *on_error*
+    (sanitised message) until the file changes again.  Both callbacks run
+    on the watcher thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        on_change: Callable[[AppConfig], None],
+        on_error: Callable[[str], None],
+        interval_seconds: float = 5.0,
+        debounce_seconds: float = 2.0,
+        loader: Callable[[str], AppConfig] = load_config,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._path = path
+        self._on_change = on_change
+        self._on_error = on_error
+        self._interval = max(0.1, interval_seconds)
+        self._debounce = max(0.0, debounce_seconds)
+        self._loader = loader
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._seen = _stat_signature(path)
+        self._known_hash = _content_hash(path)
+        self._pending: _StatSignature | None = None
+        self._pending_since = 0.0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def acknowledge(self) -> None:
+        """Treat the file as it is now as already applied (e.g. after an editor save)."""
+        with self._lock:
+            self._seen = _stat_signature(self._path)
+            self._known_hash = _content_hash(self._path)
+            self._pending = None
+
+    def poll(self) -> bool:
+        """Run one check; return ``True`` if a new config was passed to *on_change*."""
+        with self._lock:
+            signature = _stat_signature(self._path)
+            if signature is None or signature == self._seen:
+                # Missing files are treated as a copy in progress.
+                self._pending = None
+                return False
+            now = self._clock()
+            if signature != self._pending:
+                self._pending = signature
+                self._pending_since = now
+            if now - self._pending_since < self._debounce:
+                return False
+            self._seen = signature
+            self._pending = None
+            digest = _content_hash(self._path)
+            if digest is None or digest == self._known_hash:
+                return False
+            self._known_hash = digest
+        try:
+            config = self._loader(str(self._path))
+        except Exception as exc:
+            message = sanitize_text(str(exc)) or type(exc).__name__
+            LOGGER.warning(
+                "Config change rejected; keeping the current config: %s",
+                message,
+                extra={"category": "config"},
+            )
+            self._on_error(message)
+            return False
+        LOGGER.info("Config file changed; applying", extra={"category": "config"})
+        self._on_change(config)
+        return True
+
+    def start(self) -> None:
+        """Start the background polling thread (idempotent)."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="config-watcher")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread and wait for it to exit."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._thread = None
+        self._stop_event.set()
+        thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.poll()
+            except Exception:
+                LOGGER.exception("Config watcher poll failed", extra={"category": "config"})
@@ -26,9 +26,10 @@ from .config import (
     load_config,
 )
 from .detector import WindowTextDetector
-from .dpapi_utils import save_secret
 from .gui_app import prompt_smtp_password_gui
-from .status import StatusStore, format_timestamp
+from .profiling import DEFAULT_PROFILE_CYCLES, get_profiler
+from .secret_store import get_secret_store
+from .status import StatusStore, format_memory, format_timestamp
 from .tray_app import TrayIcon
 
 LOGGER = logging.getLogger(__name__)
@@ -74,8 +75,11 @@ def _start_notifier(
     manual_scan_event: Event,
     scan_complete_event: Event | None = None,
     test_message_event: Event | None = None,
+    notifier_holder: list[Notifier] | None = None,
 ) -> Thread:
     notifier = Notifier(config=config, status=status)
+    if notifier_holder is not None:
+        notifier_holder[:] = [notifier]
     thread = Thread(
         target=notifier.run_loop,
         args=(stop_event, manual_scan_event, scan_complete_event, test_message_event),
@@ -256,6 +260,9 @@ def _menu_header(status: StatusStore, config: AppConfig) -> list[str]:
             label = key if len(key) <= 20 else f"{key[:17]}..."
             summary.append(f"{label}={count}")
         failure_line = "Falhas por monitor: " + ", ".join(summary)
+    memory_lines = []
+    if snapshot.memory_warning:
+        memory_lines.append(f"ALERTA memoria: {format_memory(snapshot)}")
     return [
         "Z7_SentinelTray - Console",
         f"Status atual: {state}",
@@ -269,6 +276,7 @@ def _menu_header(status: StatusStore, config: AppConfig) -> list[str]:
         queue_line,
         breaker_line,
         failure_line,
+        *memory_lines,
         "",
     ]
 
@@ -396,7 +404,7 @@ def _update_smtp_credentials_console(config: AppConfig) -> None:
             os.environ[f"Z7_SENTINELTRAY_SMTP_PASSWORD_{index}"] = password
             try:
                 secret_path = get_user_data_dir() / f"smtp_password_{index}.dpapi"
-                save_secret(secret_path, password)
+                get_secret_store().save(secret_path, password)
                 print("  Senha salva com segurança (DPAPI).")
             except Exception as exc:
                 LOGGER.warning("Failed to store SMTP password securely: %s", exc)
@@ -413,10 +421,20 @@ def run_console(config: AppConfig) -> None:  # noqa: C901
     test_message_event = Event()
     _tray_exit_event = Event()
     config = _apply_console_logging_policy(config)
+    notifier_holder: list[Notifier] = []
     notifier_thread = _start_notifier(
-        config, status, stop_event, manual_scan_event, scan_complete_event, test_message_event
+        config,
+        status,
+        stop_event,
+        manual_scan_event,
+        scan_complete_event,
+        test_message_event,
+        notifier_holder,
+    )
+    tray = TrayIcon(
+        on_exit_requested=_tray_exit_event.set,
+        on_capture_profile=get_profiler().request,
     )
-    tray = TrayIcon(on_exit_requested=_tray_exit_event.set)
     tray.start()
     on_open, finalize_config_edit, close_editor = _create_config_editor()
     last_auth_error = ""
@@ -424,19 +442,20 @@ def run_console(config: AppConfig) -> None:  # noqa: C901
     def save_config_edit() -> AppConfig | None:
         return finalize_config_edit()
 
-    def apply_config_edit() -> None:
-        nonlocal config, notifier_thread, stop_event
-        new_config = save_config_edit()
-        if new_config is None:
+    def reload_notifier() -> None:
+        # Apply the current config to the running notifier in place; restart
+        # the loop only when it is not running.
+        nonlocal notifier_thread, stop_event
+        status.set_last_error("")
+        if notifier_holder and notifier_thread.is_alive() and not stop_event.is_set():
+            notifier_holder[0].apply_config(config)
             return
-        config = new_config
         stop_event.set()
         try:
             notifier_thread.join(timeout=5)
         except Exception as exc:
             LOGGER.warning("Failed to stop notifier for config reload: %s", exc)
         stop_event = Event()
-        status.set_last_error("")
         notifier_thread = _start_notifier(
             config,
             status,
@@ -444,8 +463,17 @@ def run_console(config: AppConfig) -> None:  # noqa: C901
             manual_scan_event,
             scan_complete_event,
             test_message_event,
+            notifier_holder,
         )
 
+    def apply_config_edit() -> None:
+        nonlocal config
+        new_config = save_config_edit()
+        if new_config is None:
+            return
+        config = new_config
+        reload_notifier()
+
     try:
         while True:
             snapshot = status.snapshot()
@@ -463,6 +491,7 @@ def run_console(config: AppConfig) -> None:  # noqa: C901
                     manual_scan_event,
                     scan_complete_event,
                     test_message_event,
+                    notifier_holder,
                 )
             if "smtp auth failed" in snapshot.last_error and snapshot.last_error != last_auth_error:
                 last_auth_error = snapshot.last_error
@@ -487,7 +516,7 @@ def run_console(config: AppConfig) -> None:  # noqa: C901
                     updated_any = True
                     try:
                         secret_path = get_user_data_dir() / f"smtp_password_{index}.dpapi"
-                        save_secret(secret_path, password)
+                        get_secret_store().save(secret_path, password)
                     except Exception as exc:
                         LOGGER.warning(
                             "Failed to store SMTP password securely: %s",
@@ -511,6 +540,7 @@ def run_console(config: AppConfig) -> None:  # noqa: C901
                     manual_scan_event,
                     scan_complete_event,
                     test_message_event,
+                    notifier_holder,
                 )
             clear_screen()
             for line in _menu_header(status, config):
@@ -519,6 +549,7 @@ def run_console(config: AppConfig) -> None:  # noqa: C901
             print("  [C] Editar config")
             print("  [P] Credenciais SMTP")
             print("  [R] Repositório")
+            print(f"  [F] Capturar perfil ({DEFAULT_PROFILE_CYCLES} varreduras)")
             print("  [Q] Sair")
             print("")
             try:
@@ -539,26 +570,16 @@ def run_console(config: AppConfig) -> None:  # noqa: C901
                 local_path = get_user_data_dir() / "config.local.yaml"
                 try:
                     config = load_config(str(local_path))
-                    stop_event.set()
-                    try:
-                        notifier_thread.join(timeout=5)
-                    except Exception as exc:
-                        LOGGER.warning("Failed to stop notifier for SMTP reload: %s", exc)
-                    stop_event = Event()
-                    status.set_last_error("")
-                    notifier_thread = _start_notifier(
-                        config,
-                        status,
-                        stop_event,
-                        manual_scan_event,
-                        scan_complete_event,
-                        test_message_event,
-                    )
+                    reload_notifier()
                 except Exception as exc:
                     print(f"Falha ao recarregar config: {exc}")
                     time.sleep(2)
             elif command in ("r", "repo", "repositório", "repositorio"):
                 webbrowser.open(_PROJECT_REPO_URL)
+            elif command in ("f", "perfil", "profile"):
+                get_profiler().request()
+                print(f"Perfil solicitado; relatórios em {Path(config.log_file).parent}")
+                time.sleep(2)
             apply_config_edit()
     except KeyboardInterrupt:
         return
@@ -624,7 +645,7 @@ def run_console_config_error(error_details: str) -> None:  # noqa: C901
                         os.environ[f"Z7_SENTINELTRAY_SMTP_PASSWORD_{index}"] = password
                         try:
                             secret_path = get_user_data_dir() / f"smtp_password_{index}.dpapi"
-                            save_secret(secret_path, password)
+                            get_secret_store().save(secret_path, password)
                         except Exception as exc:
                             LOGGER.warning(
                                 "Failed to store SMTP password securely: %s",
@@ -21,6 +21,19 @@ except Exception as exc:  # pragma: no cover - optional dependency
 
     _PYWINAUTO_IMPORT_ERROR = exc
 
+from .metrics import (
+    COUNT_BUCKETS,
+    SCAN_DESCENDANTS_MS,
+    SCAN_ELEMENTS,
+    SCAN_FOREGROUND_MS,
+    SCAN_MATCH_MS,
+    SCAN_RESTORE_MS,
+    SCAN_WINDOW_LOOKUP_MS,
+    get_metrics_registry,
+)
+from .tracing import get_tracer
+from .validation_utils import compile_regex
+
 LOGGER = logging.getLogger(__name__)
 
 # Win32 window class names for Windows Shell overlays that grab the foreground
@@ -48,13 +61,24 @@ class WindowTextDetector:
         allow_window_restore: bool = True,
         log_throttle_seconds: int = 60,
     ) -> None:
-        self._window_title_regex = re.compile(window_title_regex)
+        self._window_title_regex = compile_regex(window_title_regex)
         self._allow_window_restore = allow_window_restore
         self._last_window = None
         self._log_throttle_seconds = max(0, log_throttle_seconds)
         self._last_log: dict[str, float] = {}
         self._phrase_regex_cache: str | None = None
         self._phrase_pattern_cache: re.Pattern[str] | None = None
+        self._last_element_count = 0
+
+    @property
+    def log_throttle_size(self) -> int:
+        """Return the number of throttled log keys remembered by this detector."""
+        return len(self._last_log)
+
+    @property
+    def last_element_count(self) -> int:
+        """Return the number of UI elements walked by the most recent scan."""
+        return self._last_element_count
 
     @staticmethod
     def _normalize_text(value: str) -> str:
@@ -381,14 +405,19 @@ class WindowTextDetector:
         self._ensure_foreground_and_maximized(window)
 
     def _iter_texts(self) -> list[str]:
-        window = self._get_window()
-        if not self._window_exists(window, timeout=1.0):
-            raise WindowUnavailableError("Target window not found")
+        metrics = get_metrics_registry()
+        tracer = get_tracer()
+        self._last_element_count = 0
+        with metrics.timer(SCAN_WINDOW_LOOKUP_MS), tracer.span("lookup"):
+            window = self._get_window()
+            if not self._window_exists(window, timeout=1.0):
+                raise WindowUnavailableError("Target window not found")
         was_minimized = self._window_is_minimized(window)
         prior_foreground = self._get_foreground_handle()
         texts: list[str] = []
         try:
-            self._ensure_foreground_and_maximized(window)
+            with metrics.timer(SCAN_FOREGROUND_MS), tracer.span("foreground"):
+                self._ensure_foreground_and_maximized(window)
             try:
                 try:
                     if hasattr(window, "window_text"):
@@ -397,21 +426,28 @@ class WindowTextDetector:
                             texts.append(title_text)
                 except Exception:
                     LOGGER.debug("Failed to read window title text", exc_info=True)
-                for element in window.descendants():
-                    try:
-                        text = element.window_text()
-                    except Exception:
-                        continue
-                    if text:
-                        texts.append(text)
+                element_count = 0
+                with metrics.timer(SCAN_DESCENDANTS_MS), tracer.span("walk"):
+                    for element in window.descendants():
+                        element_count += 1
+                        try:
+                            text = element.window_text()
+                        except Exception:
+                            continue
+                        if text:
+                            texts.append(text)
+                    tracer.annotate(elements=element_count, texts=len(texts))
+                self._last_element_count = element_count
+                metrics.histogram(SCAN_ELEMENTS, COUNT_BUCKETS).observe(element_count)
             except Exception as exc:
                 raise RuntimeError("Failed to read window texts") from exc
         finally:
             # Non-intrusive: restore the original window state and active focus
             # so the user's workflow is not disrupted by the scan.
-            if was_minimized:
-                self._minimize_window(window)
-            self._restore_prior_foreground(prior_foreground)
+            with metrics.timer(SCAN_RESTORE_MS), tracer.span("restore"):
+                if was_minimized:
+                    self._minimize_window(window)
+                self._restore_prior_foreground(prior_foreground)
         return texts
 
     def find_matches(self, phrase_regex: str) -> list[str]:
@@ -427,7 +463,7 @@ class WindowTextDetector:
         normalized_regex = self._normalize_text(phrase_value)
         if normalized_regex != self._phrase_regex_cache or self._phrase_pattern_cache is None:
             try:
-                pattern = re.compile(normalized_regex, re.IGNORECASE)
+                pattern = compile_regex(normalized_regex, re.IGNORECASE)
             except re.error as exc:
                 raise ValueError("Invalid phrase regex") from exc
             self._phrase_regex_cache = normalized_regex
@@ -435,7 +471,10 @@ class WindowTextDetector:
         pattern = self._phrase_pattern_cache
         matches: list[str] = []
         normalize = self._normalize_text
-        for text in texts:
-            if pattern.search(normalize(text)):
-                matches.append(text)
+        tracer = get_tracer()
+        with get_metrics_registry().timer(SCAN_MATCH_MS), tracer.span("match"):
+            for text in texts:
+                if pattern.search(normalize(text)):
+                    matches.append(text)
+            tracer.annotate(texts=len(texts), matches=len(matches))
         return matches
@@ -5,8 +5,10 @@ from __future__ import annotations
 import json
 import logging
 import smtplib
+import socket
 import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from email.message import EmailMessage
@@ -22,6 +24,16 @@ from .email_queue_utils import (
     prune_items,
 )
 from .io_utils import read_json_safe
+from .metrics import (
+    SMTP_CONNECT_MS,
+    SMTP_FAILURES_TOTAL,
+    SMTP_SEND_MS,
+    SMTP_SENT_TOTAL,
+    get_metrics_registry,
+)
+from .smtp_circuit import SmtpCircuitBreaker, SmtpCircuitOpenError
+from .smtp_endpoints import get_smtp_endpoint_registry
+from .smtp_tls import ResumingSSLContext, get_smtp_tls_context
 from .telemetry import atomic_write_text
 
 LOGGER = logging.getLogger(__name__)
@@ -100,6 +112,25 @@ def _build_body(message: str) -> tuple[str, str]:
     return category, body
 
 
+class _RegistrySMTP(smtplib.SMTP):
+    """``smtplib.SMTP`` that connects through the SMTP endpoint registry.
+
+    Name resolution is served from the registry cache while the TLS
+    hostname stays the configured host.
+    """
+
+    def _get_socket(self, host: str, port: int, timeout: float) -> socket.socket:
+        return get_smtp_endpoint_registry().create_connection(
+            host, port, timeout, getattr(self, "source_address", None)
+        )
+
+
+def _starttls(client: smtplib.SMTP, config: EmailConfig) -> ResumingSSLContext:
+    context = get_smtp_tls_context(config)
+    client.starttls(context=context)
+    return context
+
+
 class EmailSender:
     """Abstract base class for email delivery backends."""
 
@@ -147,20 +178,28 @@ class SmtpEmailSender(EmailSender):
 
         attempts = max(0, self.config.retry_attempts)
         backoff = max(0, self.config.retry_backoff_seconds)
+        metrics = get_metrics_registry()
 
         for attempt in range(attempts + 1):
             try:
-                with smtplib.SMTP(
+                connect_started = time.perf_counter()
+                with _RegistrySMTP(
                     self.config.smtp_host,
                     self.config.smtp_port,
                     timeout=self.config.timeout_seconds,
                 ) as client:
-                    if self.config.use_tls:
-                        client.starttls()
+                    tls_context = _starttls(client, self.config) if self.config.use_tls else None
                     if self.config.smtp_username or self.config.smtp_password:
                         client.login(self.config.smtp_username, self.config.smtp_password)
-                    client.send_message(email)
+                    metrics.histogram(SMTP_CONNECT_MS).observe(
+                        (time.perf_counter() - connect_started) * 1000
+                    )
+                    with metrics.timer(SMTP_SEND_MS):
+                        client.send_message(email)
+                    if tls_context is not None:
+                        tls_context.remember_session(getattr(client, "sock", None))
             except smtplib.SMTPException as exc:
+                metrics.counter(SMTP_FAILURES_TOTAL).inc()
                 if SmtpEmailSender._is_auth_error(exc):
                     LOGGER.exception(
                         "SMTP authentication failed (check app password)",
@@ -181,7 +220,11 @@ class SmtpEmailSender(EmailSender):
                 )
                 if backoff:
                     time.sleep(backoff * (2**attempt))
+            except OSError:
+                metrics.counter(SMTP_FAILURES_TOTAL).inc()
+                raise
             else:
+                metrics.counter(SMTP_SENT_TOTAL).inc()
                 return
 
 
@@ -193,14 +236,15 @@ def validate_smtp_credentials(config: EmailConfig) -> None:
         raise ValueError("smtp_username or smtp_password is required")
 
     try:
-        with smtplib.SMTP(
+        with _RegistrySMTP(
             config.smtp_host,
             config.smtp_port,
             timeout=config.timeout_seconds,
         ) as client:
-            if config.use_tls:
-                client.starttls()
+            tls_context = _starttls(client, config) if config.use_tls else None
             client.login(config.smtp_username, config.smtp_password)
+            if tls_context is not None:
+                tls_context.remember_session(getattr(client, "sock", None))
     except smtplib.SMTPException as exc:
         if SmtpEmailSender._is_auth_error(exc):
             LOGGER.exception(
@@ -211,6 +255,64 @@ def validate_smtp_credentials(config: EmailConfig) -> None:
         raise RuntimeError(f"SMTP validation failed: {exc}") from exc
 
 
+def validate_smtp_credentials_many(
+    configs: list[EmailConfig],
+    *,
+    deadline_seconds: float | None = None,
+) -> list[Exception | None]:
+    """Validate several SMTP configs concurrently, logging in once per distinct account.
+
+    Configs that share host, port, TLS mode and credentials are validated
+    with a single connection and share the outcome.
+
+    Args:
+        configs: Email configs to validate, typically one per monitor.
+        deadline_seconds: Upper bound for the whole batch; defaults to the
+            largest ``timeout_seconds`` among *configs* plus a small margin.
+
+    Returns:
+        One entry per config: ``None`` on success, otherwise the exception
+        :func:`validate_smtp_credentials` raised (or a ``TimeoutError``).
+    """
+    if not configs:
+        return []
+    groups: dict[tuple[str, int, bool, str, str], list[int]] = {}
+    for index, config in enumerate(configs):
+        key = (
+            config.smtp_host.strip().lower(),
+            int(config.smtp_port),
+            bool(config.use_tls),
+            config.smtp_username,
+            config.smtp_password,
+        )
+        groups.setdefault(key, []).append(index)
+    if deadline_seconds is None:
+        deadline_seconds = max(config.timeout_seconds for config in configs) * 2 + 5
+    results: list[Exception | None] = [None] * len(configs)
+    executor = ThreadPoolExecutor(
+        max_workers=min(8, len(groups)),
+        thread_name_prefix="smtp-validate",
+    )
+    try:
+        futures = {
+            executor.submit(validate_smtp_credentials, configs[indexes[0]]): indexes
+            for indexes in groups.values()
+        }
+        wait(futures, timeout=max(0.0, deadline_seconds))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    for future, indexes in futures.items():
+        outcome: Exception | None
+        if not future.done() or future.cancelled():
+            outcome = TimeoutError("SMTP validation deadline exceeded")
+        else:
+            error = future.exception()
+            outcome = error if isinstance(error, Exception) else None
+        for index in indexes:
+            results[index] = outcome
+    return results
+
+
 @dataclass
 class QueueStats:
     """Email queue statistics snapshot."""
@@ -311,6 +413,11 @@ class DiskEmailQueue:
                 continue
             except EmailAuthError:
                 raise
+            except SmtpCircuitOpenError:
+                # Endpoint known to be down: keep the item without burning an attempt.
+                deferred += 1
+                remaining.append(item)
+                continue
             except Exception:
                 failed += 1
                 attempts = int(item.get("attempts", 0)) + 1
@@ -359,10 +466,43 @@ class DiskEmailQueue:
 
 @dataclass
 class QueueingEmailSender(EmailSender):
-    """Email sender that drains a ``DiskEmailQueue`` before attempting live sends."""
+    """Email sender that drains a ``DiskEmailQueue`` before attempting live sends.
+
+    When a *circuit_breaker* is attached, live sends are skipped while the
+    SMTP endpoint is known to be down and messages go straight to the queue.
+    """
 
     sender: SmtpEmailSender
     queue: DiskEmailQueue
+    circuit_breaker: SmtpCircuitBreaker | None = None
+
+    def _send_live(self, message: str) -> None:
+        breaker = self.circuit_breaker
+        if breaker is None:
+            self.sender.send(message)
+            return
+        if not breaker.allow_request():
+            raise SmtpCircuitOpenError(f"SMTP circuit open for {breaker.endpoint}")
+        try:
+            self.sender.send(message)
+        except EmailAuthError:
+            # The server answered; only the credentials are wrong.
+            breaker.record_success()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+
+    def _enqueue(self, message: str) -> None:
+        try:
+            self.queue.enqueue(message)
+        except Exception:
+            LOGGER.exception(
+                "Failed to enqueue message after send failure",
+                extra={"category": "send"},
+            )
+            raise
 
     def send(self, message: str) -> None:
         """Drain the queue, then send *message*; queue on transient failure."""
@@ -374,28 +514,28 @@ class QueueingEmailSender(EmailSender):
             LOGGER.warning("Failed to drain email queue: %s", exc, extra={"category": "send"})
 
         try:
-            self.sender.send(message)
+            self._send_live(message)
         except EmailAuthError:
             raise
+        except SmtpCircuitOpenError as exc:
+            LOGGER.info(
+                "SMTP circuit open; queued without live send",
+                extra={"category": "send"},
+            )
+            self._enqueue(message)
+            raise EmailQueued("Message queued for retry") from exc
         except Exception as exc:
             LOGGER.warning(
                 "Transient send failure; queued for retry: %s",
                 exc,
                 extra={"category": "send"},
             )
-            try:
-                self.queue.enqueue(message)
-            except Exception:
-                LOGGER.exception(
-                    "Failed to enqueue message after send failure",
-                    extra={"category": "send"},
-                )
-                raise
+            self._enqueue(message)
             raise EmailQueued("Message queued for retry") from exc
 
     def drain(self) -> QueueStats:
         """Drain the underlying queue and return stats."""
-        return self.queue.drain(self.sender.send)
+        return self.queue.drain(self._send_live)
 
     def get_queue_stats(self) -> QueueStats:
         """Return queue stats without sending."""
@@ -410,6 +550,7 @@ def build_sender(
     queue_max_age_seconds: int = 86400,
     queue_max_attempts: int = 10,
     queue_retry_base_seconds: int = 30,
+    circuit_breaker: SmtpCircuitBreaker | None = None,
 ) -> EmailSender:
     """Build a ``QueueingEmailSender`` wrapping a ``SmtpEmailSender`` and ``DiskEmailQueue``."""
     base_sender = SmtpEmailSender(config=config)
@@ -420,4 +561,4 @@ def build_sender(
         max_attempts=max(0, queue_max_attempts),
         retry_base_seconds=max(0, queue_retry_base_seconds),
     )
-    return QueueingEmailSender(sender=base_sender, queue=queue)
+    return QueueingEmailSender(sender=base_sender, queue=queue, circuit_breaker=circuit_breaker)
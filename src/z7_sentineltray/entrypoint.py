@@ -16,6 +16,7 @@ from pathlib import Path
 from . import __release_date__, __version_label__
 from .config import AppConfig, get_project_root, get_user_data_dir, get_user_log_dir, load_config
 from .logging_setup import setup_logging
+from .profiling import get_profiler
 
 LOGGER = logging.getLogger(__name__)
 _mutex_handle = None
@@ -399,22 +400,23 @@ def _clear_stored_smtp_password(index: int) -> None:
 
 
 def _validate_smtp_config(config: AppConfig) -> tuple[list[tuple[int, str]], list[str]]:
-    from .email_sender import EmailAuthError, validate_smtp_credentials
+    from .email_sender import EmailAuthError, validate_smtp_credentials_many
 
     auth_failures: list[tuple[int, str]] = []
     auth_messages: list[str] = []
     failures: list[str] = []
     if config.log_only_mode:
         return auth_failures, auth_messages
-    for index, monitor in enumerate(config.monitors, start=1):
-        email = monitor.email
-        try:
-            validate_smtp_credentials(email)
-        except EmailAuthError as exc:
+    emails = [monitor.email for monitor in config.monitors]
+    outcomes = validate_smtp_credentials_many(emails)
+    for index, (email, outcome) in enumerate(zip(emails, outcomes, strict=True), start=1):
+        if outcome is None:
+            continue
+        if isinstance(outcome, EmailAuthError):
             auth_failures.append((index, email.smtp_username))
-            auth_messages.append(f"monitor {index}: {exc}")
-        except Exception as exc:
-            failures.append(f"monitor {index}: {exc}")
+            auth_messages.append(f"monitor {index}: {outcome}")
+        else:
+            failures.append(f"monitor {index}: {outcome}")
     if failures:
         raise ValueError("SMTP validation failed: " + "; ".join(failures))
     return auth_failures, auth_messages
@@ -448,8 +450,8 @@ def _missing_smtp_passwords(config: AppConfig) -> list[tuple[int, str]]:
 
 
 def _prompt_smtp_passwords(missing: list[tuple[int, str]]) -> None:
-    from .dpapi_utils import save_secret
     from .gui_app import prompt_smtp_password_gui
+    from .secret_store import get_secret_store
 
     if not missing:
         return
@@ -463,7 +465,7 @@ def _prompt_smtp_passwords(missing: list[tuple[int, str]]) -> None:
                 os.environ[f"Z7_SENTINELTRAY_SMTP_PASSWORD_{index}"] = password
                 try:
                     secret_path = get_user_data_dir() / f"smtp_password_{index}.dpapi"
-                    save_secret(secret_path, password)
+                    get_secret_store().save(secret_path, password)
                 except Exception as exc:
                     LOGGER.warning(
                         "Failed to store SMTP password securely: %s",
@@ -554,6 +556,7 @@ def main() -> int:  # noqa: C901
         else:
             if config is None:
                 raise SystemExit("Configuration not loaded.")
+            get_profiler().request_from_env()
 
             _captured_local_path = local_path
 
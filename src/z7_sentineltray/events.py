@@ -0,0 +1,152 @@
+"""In-process event bus for pushing notifier and status changes to the UI."""
+
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+# Event kinds.
+EVENT_SCAN_STARTED = "scan_started"
+EVENT_SCAN_FINISHED = "scan_finished"
+EVENT_MATCH = "match"
+EVENT_SEND = "send"
+EVENT_ERROR = "error"
+EVENT_QUEUE_CHANGED = "queue_changed"
+EVENT_STATUS_CHANGED = "status_changed"
+EVENT_EXIT_REQUESTED = "exit_requested"
+
+EVENT_QUEUE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class AppEvent:
+    """One notification published on an :class:`EventBus`.
+
+    Attributes:
+        kind: One of the ``EVENT_*`` constants.
+        fields: Status fields that changed (status events only); empty when
+            unknown, meaning "anything may have changed".
+        version: Status version that produced the event, or ``0``.
+        data: Small read-only payload (never raw monitor keys or text).
+    """
+
+    kind: str
+    fields: frozenset[str] = frozenset()
+    version: int = 0
+    data: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+
+EventSubscriber = Callable[[AppEvent], None]
+
+
+class EventBus:
+    """Synchronous publish/subscribe hub, safe to use from any thread.
+
+    Subscribers run on the publisher's thread and must return quickly;
+    UI code subscribes an :class:`EventQueue` and drains it on its own
+    thread.  Publishing with no subscribers costs one attribute read.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: tuple[EventSubscriber, ...] = ()
+
+    def subscribe(self, callback: EventSubscriber) -> Callable[[], None]:
+        """Register *callback*; return a function that unregisters it."""
+        with self._lock:
+            self._subscribers = (*self._subscribers, callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscribers = tuple(item for item in self._subscribers if item != callback)
+
+        return unsubscribe
+
+    def publish(self, event: AppEvent) -> None:
+        """Deliver *event* to every subscriber."""
+        for callback in self._subscribers:
+            try:
+                callback(event)
+            except Exception:
+                LOGGER.exception("Event subscriber failed", extra={"category": "events"})
+
+    def emit(self, kind: str, **data: object) -> None:
+        """Publish an event of *kind* with an optional payload."""
+        if self._subscribers:
+            self.publish(AppEvent(kind, data=MappingProxyType(dict(data))))
+
+
+class EventQueue:
+    """Bounded thread-safe hand-off of events to a single consumer thread.
+
+    Use :meth:`put` as an :class:`EventBus` subscriber and call
+    :meth:`drain` from the consumer (e.g. a Tk ``after`` callback).  When
+    the queue overflows the oldest events are dropped and the next drain
+    starts with a :data:`EVENT_STATUS_CHANGED` event without fields, which
+    consumers treat as "refresh everything".  A consumer that should not
+    poll installs a waker with :meth:`set_waker`.
+    """
+
+    def __init__(self, max_items: int = EVENT_QUEUE_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._items: collections.deque[AppEvent] = collections.deque(maxlen=max(1, max_items))
+        self._overflowed = False
+        self._waker: Callable[[], None] | None = None
+        self._woken = False
+
+    def set_waker(self, waker: Callable[[], None] | None) -> None:
+        """Call *waker* when events arrive, once per batch until the next drain.
+
+        The waker runs on the publisher's thread and must only schedule the
+        drain (e.g. with Tk ``after``).  It is called at once if events are
+        already waiting.
+        """
+        with self._lock:
+            self._waker = waker
+            self._woken = waker is not None and bool(self._items or self._overflowed)
+            wake = self._woken
+        if waker is not None and wake:
+            waker()
+
+    def put(self, event: AppEvent) -> None:
+        """Append *event*, dropping the oldest one if the queue is full."""
+        with self._lock:
+            if len(self._items) == self._items.maxlen:
+                self._overflowed = True
+            self._items.append(event)
+            waker = None if self._woken else self._waker
+            if waker is not None:
+                self._woken = True
+        if waker is not None:
+            waker()
+
+    def drain(self) -> list[AppEvent]:
+        """Remove and return all queued events, oldest first."""
+        with self._lock:
+            self._woken = False
+            if not self._items and not self._overflowed:
+                return []
+            events = list(self._items)
+            self._items.clear()
+            if self._overflowed:
+                self._overflowed = False
+                events.insert(0, AppEvent(EVENT_STATUS_CHANGED))
+        return events
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+_EVENT_BUS = EventBus()
+
+
+def get_event_bus() -> EventBus:
+    """Return the process-wide event bus."""
+    return _EVENT_BUS
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import json
 import logging
 import os
@@ -17,8 +18,21 @@ from tkinter import messagebox
 
 from .app import Notifier
 from .config import AppConfig, get_project_root, get_user_data_dir, load_config
-from .dpapi_utils import save_secret
-from .status import StatusStore, format_timestamp
+from .config_watcher import ConfigWatcher
+from .events import (
+    EVENT_EXIT_REQUESTED,
+    EVENT_SCAN_FINISHED,
+    EVENT_SCAN_STARTED,
+    EVENT_STATUS_CHANGED,
+    AppEvent,
+    EventBus,
+    EventQueue,
+    get_event_bus,
+)
+from .profiling import get_profiler
+from .scan_timeline import ScanTimeline
+from .secret_store import get_secret_store
+from .status import StatusSnapshot, StatusStore, format_memory, format_timestamp
 from .tray_app import TrayIcon, set_console_visible
 from .validation_utils import validate_email_address
 
@@ -1030,7 +1044,7 @@ class SmtpCredentialsDialog:
                 os.environ[f"Z7_SENTINELTRAY_SMTP_PASSWORD_{idx}"] = password
                 try:
                     secret_path = get_user_data_dir() / f"smtp_password_{idx}.dpapi"
-                    save_secret(secret_path, password)
+                    get_secret_store().save(secret_path, password)
                 except Exception as exc:
                     LOGGER.warning(
                         "Failed to store SMTP password for monitor %s: %s",
@@ -1089,10 +1103,131 @@ class SmtpCredentialsDialog:
         win.geometry(f"+{sx}+{sy}")
 
 
+# Most recent scans drawn in each monitor row's sparkline.
+_SPARKLINE_WIDTH = 30
+
+
+class _MonitorRow:
+    """Persistent widgets of one monitor row; only changed options are reconfigured."""
+
+    def __init__(self, parent: tk.Frame, index: int, title: str, palette: dict[str, str]) -> None:
+        self.frame = tk.Frame(parent, bg=palette["card"])
+        self.frame.pack(fill=tk.X, pady=2)
+        self._dot = tk.Label(
+            self.frame, text="●", font=("Segoe UI", 11), fg=palette["green"], bg=palette["card"]
+        )
+        self._dot.pack(side=tk.LEFT, padx=(0, 8))
+        if len(title) > 48:
+            title = title[:45] + "..."
+        tk.Label(
+            self.frame,
+            text=f"Monitor {index}:  {title}",
+            font=("Segoe UI", 9),
+            fg=palette["text"],
+            bg=palette["card"],
+        ).pack(side=tk.LEFT)
+        self._note = tk.Label(
+            self.frame, text="", font=("Segoe UI", 9), fg=palette["amber"], bg=palette["card"]
+        )
+        self._note.pack(side=tk.LEFT)
+        self._stats = tk.Label(
+            self.frame, text="", font=("Segoe UI", 8), fg=palette["muted"], bg=palette["card"]
+        )
+        self._stats.pack(side=tk.RIGHT)
+        self._spark = tk.Label(
+            self.frame, text="", font=("Consolas", 9), fg=palette["text"], bg=palette["card"]
+        )
+        self._spark.pack(side=tk.RIGHT, padx=(8, 6))
+        self._shown: tuple[str, str, str] | None = None
+        self._shown_timeline: tuple[str, str] | None = None
+
+    def show(self, dot_fg: str, note: str, note_fg: str) -> None:
+        state = (dot_fg, note, note_fg)
+        if state == self._shown:
+            return
+        self._dot.configure(fg=dot_fg)
+        self._note.configure(text=note, fg=note_fg)
+        self._shown = state
+
+    def show_timeline(self, timeline: ScanTimeline | None) -> None:
+        state = ("", "")
+        if timeline is not None and len(timeline):
+            stats = timeline.stats()
+            state = (
+                timeline.sparkline(_SPARKLINE_WIDTH),
+                f"méd {stats.avg_ms:.0f} ms · p95 {stats.p95_ms:.0f} ms"
+                f" · falhas {stats.failure_rate:.0%}",
+            )
+        if state == self._shown_timeline:
+            return
+        self._spark.configure(text=state[0])
+        self._stats.configure(text=state[1])
+        self._shown_timeline = state
+
+    def invalidate(self) -> None:
+        self._shown = None
+        self._shown_timeline = None
+
+
+# Sections of the status window and the status fields each one shows.
+_SECTION_STATUS = "status"
+_SECTION_SCAN = "scan"
+_SECTION_ALERTS = "alerts"
+_SECTION_ERRORS = "errors"
+_SECTION_QUEUE = "queue"
+_SECTION_MONITORS = "monitors"
+_ALL_SECTIONS = frozenset(
+    {
+        _SECTION_STATUS,
+        _SECTION_SCAN,
+        _SECTION_ALERTS,
+        _SECTION_ERRORS,
+        _SECTION_QUEUE,
+        _SECTION_MONITORS,
+    }
+)
+_SECTION_BY_FIELD = {
+    "running": _SECTION_STATUS,
+    "started_at": _SECTION_STATUS,
+    "last_scan": _SECTION_SCAN,
+    "last_scan_result": _SECTION_SCAN,
+    "last_match": _SECTION_ALERTS,
+    "last_match_at": _SECTION_ALERTS,
+    "last_send": _SECTION_ALERTS,
+    "error_count": _SECTION_ERRORS,
+    "last_error": _SECTION_ERRORS,
+    "config_error": _SECTION_ERRORS,
+    "breaker_active_count": _SECTION_ERRORS,
+    "memory_rss_bytes": _SECTION_ERRORS,
+    "memory_warning": _SECTION_ERRORS,
+    "email_queue": _SECTION_QUEUE,
+    "monitor_failures": _SECTION_MONITORS,
+    "monitor_breakers_active": _SECTION_MONITORS,
+    "scan_timelines": _SECTION_MONITORS,
+}
+
+# Delay between the first queued event and the drain, so bursts are handled together.
+_EVENT_PUMP_MS = 100
+
+
+def _sections_for(event: AppEvent) -> frozenset[str]:
+    if event.kind in (EVENT_SCAN_STARTED, EVENT_SCAN_FINISHED):
+        return frozenset({_SECTION_SCAN})
+    if not event.fields:
+        return _ALL_SECTIONS
+    return frozenset(_SECTION_BY_FIELD[name] for name in event.fields if name in _SECTION_BY_FIELD)
+
+
 class StatusWindow:
-    """Beautiful tkinter status window for Z7_SentinelTray."""
+    """Beautiful tkinter status window for Z7_SentinelTray.
+
+    Rendering is pushed by :meth:`handle_events`: each event repaints only
+    the sections whose fields changed, and only widgets whose text or
+    colour differs from what is on screen.  While visible, a one-second
+    heartbeat updates the uptime and next-scan clocks.
+    """
 
-    _REFRESH_MS = 1000
+    _HEARTBEAT_MS = 1000
 
     def __init__(
         self,
@@ -1122,6 +1257,14 @@ class StatusWindow:
         self._status_text: tk.Label | None = None
         self._theme_btn: tk.Button | None = None
         self._uptime_var = tk.StringVar(value="00:00:00")
+        self._vars["uptime"] = self._uptime_var
+        self._shown_text: dict[str, str] = {}
+        self._shown_fg: dict[str, str] = {}
+        self._shown_running: bool | None = None
+        self._monitor_rows: list[_MonitorRow] = []
+        self._monitor_layout: tuple[str, ...] | None = None
+        self._pending_sections: set[str] = set(_ALL_SECTIONS)
+        self._scanning = False
         self._build_ui()
         if not self._theme.is_dark:
             _apply_theme_walk(self._root, _DARK_PALETTE, _LIGHT_PALETTE)
@@ -1253,7 +1396,9 @@ class StatusWindow:
             [
                 ("error_count", "Total de Erros"),
                 ("last_error", "Último Erro"),
+                ("config_error", "Configuração"),
                 ("breaker_active", "Disjuntores"),
+                ("memory", "Memória"),
             ],
         )
 
@@ -1401,16 +1546,17 @@ class StatusWindow:
     # ── Visibility ────────────────────────────────────────────────────────────
 
     def show(self) -> None:
-        """Make the main window visible and schedule the refresh loop."""
+        """Make the main window visible, repaint what changed and start the heartbeat."""
         self._visible = True
         self._root.deiconify()
         self._root.state("zoomed")
         self._root.lift()
         self._root.focus_force()
-        self._schedule_refresh()
+        self._render()
+        self._schedule_heartbeat()
 
     def hide(self) -> None:
-        """Hide the main window and cancel any pending refresh."""
+        """Hide the main window and cancel the heartbeat."""
         self._visible = False
         self._root.withdraw()
         if self._after_id:
@@ -1418,103 +1564,142 @@ class StatusWindow:
                 self._root.after_cancel(self._after_id)
             self._after_id = None
 
-    # ── Refresh loop ──────────────────────────────────────────────────────────
+    # ── Event-driven refresh ──────────────────────────────────────────────────
+
+    def handle_events(self, events: list[AppEvent]) -> None:
+        """Repaint the sections affected by *events* (deferred while hidden)."""
+        for event in events:
+            if event.kind == EVENT_SCAN_STARTED:
+                self._scanning = True
+            elif event.kind == EVENT_SCAN_FINISHED:
+                self._scanning = False
+            self._pending_sections.update(_sections_for(event))
+        if self._visible:
+            self._render()
 
-    def _schedule_refresh(self) -> None:
+    def _schedule_heartbeat(self) -> None:
         if self._after_id:
             with contextlib.suppress(Exception):
                 self._root.after_cancel(self._after_id)
-        self._after_id = self._root.after(self._REFRESH_MS, self._refresh)
+        self._after_id = self._root.after(self._HEARTBEAT_MS, self._heartbeat)
 
-    def _refresh(self) -> None:
+    def _heartbeat(self) -> None:
         self._after_id = None
         try:
-            self._update_ui()
+            self._render_clocks(self._status.snapshot(), self._get_config())
         except Exception as exc:
             LOGGER.debug("GUI refresh error: %s", exc)
         if self._visible:
-            self._schedule_refresh()
+            self._schedule_heartbeat()
 
-    def _update_ui(self) -> None:
-        snap = self._status.snapshot()
-        cfg = self._get_config()
-
-        # ── Status indicator ──────────────────────────────────────────────────
-        if self._status_dot is None or self._status_text is None:
-            return
-        if snap.running:
-            self._status_dot.configure(fg=self._theme.palette["green"])
-            self._status_text.configure(text="EXECUTANDO", fg=self._theme.palette["green"])
-        else:
-            self._status_dot.configure(fg=self._theme.palette["red"])
-            self._status_text.configure(text="PARADO", fg=self._theme.palette["red"])
+    def _render(self) -> None:
+        sections, self._pending_sections = self._pending_sections, set()
+        try:
+            self._update_ui(sections)
+        except Exception as exc:
+            LOGGER.debug("GUI refresh error: %s", exc)
 
-        # ── Uptime ────────────────────────────────────────────────────────────
+    def _render_clocks(self, snap: StatusSnapshot, cfg: AppConfig) -> None:
         if snap.started_at is not None:
             elapsed = int((datetime.now(UTC) - snap.started_at).total_seconds())
         else:
             elapsed = snap.uptime_seconds
         h, rem = divmod(max(0, elapsed), 3600)
         m, s = divmod(rem, 60)
-        self._uptime_var.set(f"{h:02d}:{m:02d}:{s:02d}")
+        self._set("uptime", f"{h:02d}:{m:02d}:{s:02d}")
+        self._set("next_scan", _fmt_next_scan(snap.last_scan, cfg.poll_interval_seconds))
+
+    def _update_ui(self, sections: set[str]) -> None:
+        snap = self._status.snapshot()
+        cfg = self._get_config()
+        if self._status_dot is None or self._status_text is None:
+            return
+        p = self._theme.palette
+        self._render_clocks(snap, cfg)
+
+        # ── Status indicator ──────────────────────────────────────────────────
+        if _SECTION_STATUS in sections and snap.running != self._shown_running:
+            if snap.running:
+                self._status_dot.configure(fg=p["green"])
+                self._status_text.configure(text="EXECUTANDO", fg=p["green"])
+            else:
+                self._status_dot.configure(fg=p["red"])
+                self._status_text.configure(text="PARADO", fg=p["red"])
+            self._shown_running = snap.running
 
         # ── Scan ──────────────────────────────────────────────────────────────
-        self._set("last_scan", format_timestamp(snap.last_scan) or "—")
-        self._set("next_scan", _fmt_next_scan(snap.last_scan, cfg.poll_interval_seconds))
-        self._set("last_result", snap.last_scan_result or "—")
+        if _SECTION_SCAN in sections:
+            self._set("last_scan", format_timestamp(snap.last_scan) or "—")
+            result = "VERIFICANDO..." if self._scanning else snap.last_scan_result
+            self._set("last_result", result or "—")
 
         # ── Alerts ────────────────────────────────────────────────────────────
-        self._set("last_match", snap.last_match or "—")
-        self._set("last_match_at", format_timestamp(snap.last_match_at) or "—")
-        last_send_fmt = format_timestamp(snap.last_send)
-        self._set("last_send", last_send_fmt or "—")
+        if _SECTION_ALERTS in sections:
+            self._set("last_match", snap.last_match or "—")
+            self._set("last_match_at", format_timestamp(snap.last_match_at) or "—")
+            self._set("last_send", format_timestamp(snap.last_send) or "—")
 
         # ── Errors ────────────────────────────────────────────────────────────
-        self._set("error_count", str(snap.error_count))
-        lbl = self._value_labels.get("error_count")
-        if lbl:
-            lbl.configure(
-                fg=self._theme.palette["red"] if snap.error_count else self._theme.palette["green"]
-            )
-
-        self._set("last_error", snap.last_error or "—")
-        lbl = self._value_labels.get("last_error")
-        if lbl:
-            lbl.configure(
-                fg=self._theme.palette["red"] if snap.last_error else self._theme.palette["muted"]
-            )
-
-        self._set("breaker_active", str(snap.breaker_active_count))
-        lbl = self._value_labels.get("breaker_active")
-        if lbl:
-            lbl.configure(
-                fg=self._theme.palette["red"]
-                if snap.breaker_active_count
-                else self._theme.palette["text"]
-            )
+        if _SECTION_ERRORS in sections:
+            self._set("error_count", str(snap.error_count))
+            self._set_fg("error_count", p["red"] if snap.error_count else p["green"])
+            self._set("last_error", snap.last_error or "—")
+            self._set_fg("last_error", p["red"] if snap.last_error else p["muted"])
+            config_error = snap.config_error
+            if len(config_error) > 60:
+                config_error = config_error[:57] + "..."
+            self._set("config_error", f"rejeitada: {config_error}" if config_error else "OK")
+            self._set_fg("config_error", p["red"] if config_error else p["muted"])
+            self._set("breaker_active", str(snap.breaker_active_count))
+            self._set_fg("breaker_active", p["red"] if snap.breaker_active_count else p["text"])
+            self._set("memory", format_memory(snap))
+            self._set_fg("memory", p["amber"] if snap.memory_warning else p["text"])
 
         # ── Email queue ───────────────────────────────────────────────────────
-        q = snap.email_queue
-        self._set("q_pending", str(q.get("queued", 0)))
-        self._set("q_sent", str(q.get("sent", 0)))
-        self._set("q_failed", str(q.get("failed", 0)))
-        self._set("q_deferred", str(q.get("deferred", 0)))
+        if _SECTION_QUEUE in sections:
+            q = snap.email_queue
+            self._set("q_pending", str(q.get("queued", 0)))
+            self._set("q_sent", str(q.get("sent", 0)))
+            self._set("q_failed", str(q.get("failed", 0)))
+            self._set("q_deferred", str(q.get("deferred", 0)))
 
         # ── Monitors ──────────────────────────────────────────────────────────
-        self._update_monitors(snap, cfg)
+        if _SECTION_MONITORS in sections:
+            self._update_monitors(snap, cfg)
 
     def _set(self, key: str, value: str) -> None:
+        if self._shown_text.get(key) == value:
+            return
         var = self._vars.get(key)
         if var is not None:
             var.set(value)
+            self._shown_text[key] = value
 
-    def _update_monitors(self, snap: object, cfg: AppConfig) -> None:
+    def _set_fg(self, key: str, color: str) -> None:
+        if self._shown_fg.get(key) == color:
+            return
+        lbl = self._value_labels.get(key)
+        if lbl is not None:
+            lbl.configure(fg=color)
+            self._shown_fg[key] = color
+
+    def _invalidate(self) -> None:
+        """Forget what is on screen so the next refresh repaints every widget."""
+        self._shown_text.clear()
+        self._shown_fg.clear()
+        self._shown_running = None
+        for row in self._monitor_rows:
+            row.invalidate()
+        self._pending_sections.update(_ALL_SECTIONS)
+
+    def _rebuild_monitor_rows(self, cfg: AppConfig) -> None:
         if self._monitors_content is None:
             return
         for w in self._monitors_content.winfo_children():
             w.destroy()
+        self._monitor_rows = []
+        p = self._theme.palette
         if not cfg.monitors:
-            p = self._theme.palette
             tk.Label(
                 self._monitors_content,
                 text="Nenhum monitor configurado.",
@@ -1523,48 +1708,37 @@ class StatusWindow:
                 bg=p["card"],
             ).pack(anchor="w")
             return
-        failures = getattr(snap, "monitor_failures", {})
-        breakers = getattr(snap, "monitor_breakers_active", {})
-        p = self._theme.palette
         for idx, monitor in enumerate(cfg.monitors, start=1):
-            key = monitor.window_title_regex or f"monitor_{idx}"
+            title = monitor.window_title_regex or f"Monitor {idx}"
+            self._monitor_rows.append(_MonitorRow(self._monitors_content, idx, title, p))
+
+    def _update_monitors(self, snap: StatusSnapshot, cfg: AppConfig) -> None:
+        layout = tuple(monitor.window_title_regex for monitor in cfg.monitors)
+        if layout != self._monitor_layout:
+            self._rebuild_monitor_rows(cfg)
+            self._monitor_layout = layout
+        failures = snap.monitor_failures
+        breakers = snap.monitor_breakers_active
+        p = self._theme.palette
+        for monitor, row in zip(cfg.monitors, self._monitor_rows, strict=False):
+            # Same key as MonitorRuntime.key in the notifier.
+            key = f"{monitor.window_title_regex}|{monitor.phrase_regex}"
+            row.show_timeline(snap.scan_timelines.get(key))
             fail_count = failures.get(key, 0)
-            breaker = breakers.get(key, False)
-            if breaker:
-                dot_fg, note = p["red"], "  [CIRCUITO ABERTO]"
+            if breakers.get(key, False):
+                row.show(p["red"], "  [CIRCUITO ABERTO]", p["red"])
             elif fail_count > 0:
-                dot_fg, note = p["amber"], f"  {fail_count} falha(s)"
+                row.show(p["amber"], f"  {fail_count} falha(s)", p["amber"])
             else:
-                dot_fg, note = p["green"], ""
-            row = tk.Frame(self._monitors_content, bg=p["card"])
-            row.pack(fill=tk.X, pady=2)
-            tk.Label(row, text="●", font=("Segoe UI", 11), fg=dot_fg, bg=p["card"]).pack(
-                side=tk.LEFT, padx=(0, 8)
-            )
-            title = monitor.window_title_regex or f"Monitor {idx}"
-            if len(title) > 48:
-                title = title[:45] + "..."
-            tk.Label(
-                row,
-                text=f"Monitor {idx}:  {title}",
-                font=("Segoe UI", 9),
-                fg=p["text"],
-                bg=p["card"],
-            ).pack(side=tk.LEFT)
-            if note:
-                tk.Label(
-                    row,
-                    text=note,
-                    font=("Segoe UI", 9),
-                    fg=p["red"] if breaker else p["amber"],
-                    bg=p["card"],
-                ).pack(side=tk.LEFT)
+                row.show(p["green"], "", p["amber"])
 
     def _trigger_scan(self) -> None:
         self._on_manual_scan()
 
     def _toggle_theme(self) -> None:
         self._theme.toggle(self._root)
+        self._invalidate()
+        self._render()
         if self._theme_btn is not None:
             p = self._theme.palette
             label = "☀  Tema Claro" if self._theme.is_dark else "🌙  Tema Escuro"
@@ -1673,8 +1847,11 @@ def _start_notifier(
     manual_scan_event: Event,
     scan_complete_event: Event | None = None,
     test_message_event: Event | None = None,
+    notifier_holder: list[Notifier] | None = None,
 ) -> Thread:
     notifier = Notifier(config=config, status=status)
+    if notifier_holder is not None:
+        notifier_holder[:] = [notifier]
     t = Thread(
         target=notifier.run_loop,
         args=(stop_event, manual_scan_event, scan_complete_event, test_message_event),
@@ -1684,6 +1861,168 @@ def _start_notifier(
     return t
 
 
+class _NotifierController:
+    """Own the notifier thread and apply config changes to it.
+
+    :meth:`reload` and :meth:`restart` run on the Tk thread; the config
+    watcher hands its results over with ``root.after``.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        status: StatusStore,
+        event_bus: EventBus,
+        manual_scan_event: Event,
+        scan_complete_event: Event,
+        test_message_event: Event,
+    ) -> None:
+        self._status = status
+        self._event_bus = event_bus
+        self._manual_scan_event = manual_scan_event
+        self._scan_complete_event = scan_complete_event
+        self._test_message_event = test_message_event
+        self._notifier_holder: list[Notifier] = []
+        self._stop_event = Event()
+        self._thread = self._start(config, self._stop_event)
+        self._watcher: ConfigWatcher | None = None
+        self.config = config
+
+    def _start(self, config: AppConfig, stop_event: Event) -> Thread:
+        return _start_notifier(
+            config,
+            self._status,
+            stop_event,
+            self._manual_scan_event,
+            self._scan_complete_event,
+            self._test_message_event,
+            self._notifier_holder,
+        )
+
+    def is_dead(self) -> bool:
+        """Return True if the notifier loop exited without being stopped."""
+        return not self._thread.is_alive() and not self._stop_event.is_set()
+
+    def restart(self, new_cfg: AppConfig) -> None:
+        """Stop the notifier loop and start a fresh one for *new_cfg*."""
+        self._stop_event.set()
+        with contextlib.suppress(Exception):
+            self._thread.join(timeout=5)
+        self._stop_event = Event()
+        self._status.set_last_error("")
+        self._thread = self._start(new_cfg, self._stop_event)
+        self.config = new_cfg
+        # Monitor rows depend on the config, not only on status fields.
+        self._event_bus.emit(EVENT_STATUS_CHANGED)
+
+    def reload(self, new_cfg: AppConfig) -> None:
+        """Apply *new_cfg* to the running notifier."""
+        # Edits are applied to the running notifier, keeping its caches and
+        # unchanged monitors; a dead loop is restarted instead.
+        if not self._thread.is_alive() or self._stop_event.is_set():
+            self.restart(new_cfg)
+            return
+        self._status.set_last_error("")
+        self._notifier_holder[0].apply_config(new_cfg)
+        self.config = new_cfg
+        self._event_bus.emit(EVENT_STATUS_CHANGED)
+
+    def restart_if_dead(self) -> None:
+        """Restart the notifier with the current config if its loop died."""
+        # Re-check under the main thread to avoid racing with GUI-triggered reloads.
+        if self.is_dead():
+            self.restart(self.config)
+
+    def watch(self, root: tk.Tk, cfg_path: Path) -> None:
+        """Reload the notifier when *cfg_path* is edited outside the app."""
+        # Picks up edits made outside the app (e.g. a config deployed by copying
+        # the file); validation runs on the watcher thread, the reload on Tk's.
+        if self.config.config_watch_interval_seconds <= 0:
+            return
+
+        def _on_change(new_cfg: AppConfig) -> None:
+            self._status.set_config_error("")
+            root.after(0, lambda: self.reload(new_cfg))
+
+        self._watcher = ConfigWatcher(
+            cfg_path,
+            on_change=_on_change,
+            on_error=self._status.set_config_error,
+            interval_seconds=self.config.config_watch_interval_seconds,
+            debounce_seconds=self.config.config_watch_debounce_seconds,
+        )
+        self._watcher.start()
+
+    def on_config_saved(self, new_cfg: AppConfig) -> None:
+        """Reload after an editor dialog validated and wrote the config."""
+        # The editors validated and wrote the file: the watcher need not reload it.
+        if self._watcher is not None:
+            self._watcher.acknowledge()
+        self._status.set_config_error("")
+        self.reload(new_cfg)
+
+    def stop(self) -> None:
+        """Stop the notifier loop and the config watcher."""
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.stop()
+
+
+def _run_gui_watchdog(
+    root: tk.Tk, notifier: _NotifierController, tray: TrayIcon, exit_event: Event
+) -> None:
+    """Restart the notifier and the tray icon if either dies; runs on its own thread."""
+    while not exit_event.wait(5):
+        # Restart notifier if it died unexpectedly.
+        if notifier.is_dead():
+            LOGGER.warning("Notifier died; restarting", extra={"category": "startup"})
+            root.after(0, notifier.restart_if_dead)
+        # Restart tray icon if its run loop exited unexpectedly (e.g. after
+        # system suspend/resume or a Win32 message-queue error).
+        if not tray.is_running() and not exit_event.is_set():
+            LOGGER.warning("Tray icon died; restarting", extra={"category": "startup"})
+            try:
+                tray.stop()
+                tray.start()
+            except Exception as exc:
+                LOGGER.exception(
+                    "Failed to restart tray icon: %s",
+                    exc,
+                    extra={"category": "startup"},
+                )
+
+
+def _pump_events(
+    root: tk.Tk,
+    event_queue: EventQueue,
+    window: StatusWindow,
+    notifier: _NotifierController,
+    exit_event: Event,
+) -> None:
+    """Hand queued events to *window*; quit Tk on exit."""
+    events = event_queue.drain()
+    if exit_event.is_set() or any(event.kind == EVENT_EXIT_REQUESTED for event in events):
+        notifier.stop()
+        with contextlib.suppress(Exception):
+            root.quit()
+        return
+    if events:
+        window.handle_events(events)
+
+
+def _schedule_event_pump(
+    root: tk.Tk,
+    event_queue: EventQueue,
+    window: StatusWindow,
+    notifier: _NotifierController,
+    exit_event: Event,
+) -> None:
+    """Queue waker: run :func:`_pump_events` on the Tk thread shortly."""
+    # Called from the publishing thread.  Tk may already be torn down at exit.
+    with contextlib.suppress(Exception):
+        root.after(_EVENT_PUMP_MS, _pump_events, root, event_queue, window, notifier, exit_event)
+
+
 # ── Main entry point ──────────────────────────────────────────────────────────
 
 
@@ -1691,24 +2030,22 @@ def run_gui(config: AppConfig, *, smtp_validator: object = None) -> None:
     """GUI entry point — opens the status window on startup."""
     set_console_visible(False)
 
-    status = StatusStore()
+    event_bus = get_event_bus()
+    event_queue = EventQueue()
+    unsubscribe_events = event_bus.subscribe(event_queue.put)
+    status = StatusStore(event_bus=event_bus)
     manual_scan_event = Event()
     scan_complete_event = Event()
     test_message_event = Event()
     exit_event = Event()
 
-    stop_holder: list[Event] = [Event()]
-    thread_holder: list[Thread] = [
-        _start_notifier(
-            config,
-            status,
-            stop_holder[0],
-            manual_scan_event,
-            scan_complete_event,
-            test_message_event,
-        )
-    ]
-    config_holder: list[AppConfig] = [config]
+    def request_exit() -> None:
+        exit_event.set()
+        event_bus.emit(EVENT_EXIT_REQUESTED)
+
+    notifier = _NotifierController(
+        config, status, event_bus, manual_scan_event, scan_complete_event, test_message_event
+    )
 
     # ── Tk root ───────────────────────────────────────────────────────────────
     root = tk.Tk()
@@ -1718,30 +2055,14 @@ def run_gui(config: AppConfig, *, smtp_validator: object = None) -> None:
     theme = _ThemeState()
 
     # ── Config editor ─────────────────────────────────────────────────────────
-    def _reload_notifier(new_cfg: AppConfig) -> None:
-        old_stop = stop_holder[0]
-        old_stop.set()
-        with contextlib.suppress(Exception):
-            thread_holder[0].join(timeout=5)
-        new_stop = Event()
-        stop_holder[0] = new_stop
-        status.set_last_error("")
-        thread_holder[0] = _start_notifier(
-            new_cfg,
-            status,
-            new_stop,
-            manual_scan_event,
-            scan_complete_event,
-            test_message_event,
-        )
-        config_holder[0] = new_cfg
-
     cfg_path = get_user_data_dir() / "config.local.yaml"
+    notifier.watch(root, cfg_path)
+
     recipients_editor = EditToAddressesDialog(
         root,
         cfg_path=cfg_path,
-        get_config=lambda: config_holder[0],
-        on_saved=_reload_notifier,
+        get_config=lambda: notifier.config,
+        on_saved=notifier.on_config_saved,
         theme_state=theme,
     )
 
@@ -1751,8 +2072,8 @@ def run_gui(config: AppConfig, *, smtp_validator: object = None) -> None:
     smtp_credentials_dialog = SmtpCredentialsDialog(
         root,
         cfg_path=cfg_path,
-        get_config=lambda: config_holder[0],
-        on_saved=_reload_notifier,
+        get_config=lambda: notifier.config,
+        on_saved=notifier.on_config_saved,
         theme_state=theme,
     )
 
@@ -1761,7 +2082,7 @@ def run_gui(config: AppConfig, *, smtp_validator: object = None) -> None:
 
     editor = ConfigEditorWindow(
         root,
-        on_saved=_reload_notifier,
+        on_saved=notifier.on_config_saved,
         on_edit_recipients=open_recipients,
         on_edit_smtp_credentials=open_smtp_credentials,
         theme_state=theme,
@@ -1775,10 +2096,10 @@ def run_gui(config: AppConfig, *, smtp_validator: object = None) -> None:
         root,
         status,
         config,
-        get_config=lambda: config_holder[0],
+        get_config=lambda: notifier.config,
         on_manual_scan=manual_scan_event.set,
         on_open_config=open_config,
-        on_exit=exit_event.set,
+        on_exit=request_exit,
         theme_state=theme,
     )
 
@@ -1787,8 +2108,9 @@ def run_gui(config: AppConfig, *, smtp_validator: object = None) -> None:
         root.after(0, window.show)
 
     tray = TrayIcon(
-        on_exit_requested=exit_event.set,
+        on_exit_requested=request_exit,
         on_open_status=_show_from_tray,
+        on_capture_profile=get_profiler().request,
     )
     tray.start()
 
@@ -1796,43 +2118,19 @@ def run_gui(config: AppConfig, *, smtp_validator: object = None) -> None:
     root.after(0, window.show)
 
     # ── Watchdog thread ───────────────────────────────────────────────────────
-    def _watchdog() -> None:
-        def _maybe_reload() -> None:
-            # Re-check under the main thread to avoid racing with GUI-triggered reloads.
-            if not thread_holder[0].is_alive() and not stop_holder[0].is_set():
-                _reload_notifier(config_holder[0])
-
-        while not exit_event.wait(5):
-            # Restart notifier if it died unexpectedly.
-            if not thread_holder[0].is_alive() and not stop_holder[0].is_set():
-                LOGGER.warning("Notifier died; restarting", extra={"category": "startup"})
-                root.after(0, _maybe_reload)
-            # Restart tray icon if its run loop exited unexpectedly (e.g. after
-            # system suspend/resume or a Win32 message-queue error).
-            if not tray.is_running() and not exit_event.is_set():
-                LOGGER.warning("Tray icon died; restarting", extra={"category": "startup"})
-                try:
-                    tray.stop()
-                    tray.start()
-                except Exception as exc:
-                    LOGGER.exception(
-                        "Failed to restart tray icon: %s",
-                        exc,
-                        extra={"category": "startup"},
-                    )
-
-    Thread(target=_watchdog, daemon=True, name="gui-watchdog").start()
-
-    # ── Exit poller ───────────────────────────────────────────────────────────
-    def _check_exit() -> None:
-        if exit_event.is_set():
-            stop_holder[0].set()
-            with contextlib.suppress(Exception):
-                root.quit()
-            return
-        root.after(300, _check_exit)
-
-    root.after(300, _check_exit)
+    Thread(
+        target=_run_gui_watchdog,
+        args=(root, notifier, tray, exit_event),
+        daemon=True,
+        name="gui-watchdog",
+    ).start()
+
+    # ── Event pump ────────────────────────────────────────────────────────────
+    # Notifier and status events are queued by their threads and handled on
+    # the Tk thread; the queue wakes the loop, so nothing runs while idle.
+    event_queue.set_waker(
+        functools.partial(_schedule_event_pump, root, event_queue, window, notifier, exit_event)
+    )
 
     # ── Run mainloop ──────────────────────────────────────────────────────────
     try:
@@ -1840,7 +2138,9 @@ def run_gui(config: AppConfig, *, smtp_validator: object = None) -> None:
     except Exception:
         LOGGER.exception("GUI mainloop error", extra={"category": "startup"})
     finally:
-        stop_holder[0].set()
+        notifier.stop()
+        unsubscribe_events()
+        event_queue.set_waker(None)
         # Destroy Tk explicitly here — before Python's interpreter-level shutdown
         # — so Tcl's finalizer runs while the main thread is in a clean state.
         # Leaving root alive causes a hang when Python's GC calls root.__del__
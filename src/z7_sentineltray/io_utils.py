@@ -13,16 +13,21 @@ from typing import Any
 LOGGER = logging.getLogger(__name__)
 
 
-def atomic_write_text(path: Path, content: str, *, encoding: str = "utf-8") -> None:
+def atomic_write_text(
+    path: Path, content: str, *, encoding: str = "utf-8", fsync: bool = True
+) -> None:
     """Write *content* to *path* atomically using a temporary file + rename.
 
-    The directory is created if it does not exist.  The write is fsynced
-    before the rename so data survives a crash or power failure.
+    The directory is created if it does not exist.  By default the write is
+    fsynced before the rename so data survives a crash or power failure.
 
     Args:
         path: Destination file path.
         content: Text content to write.
         encoding: Character encoding (default ``utf-8``).
+        fsync: Flush to stable storage before the rename.  Without it the
+            file is still never torn, but the latest write may be lost on
+            power failure.
     """
     path.parent.mkdir(parents=True, exist_ok=True)
     temp_name = f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
@@ -31,7 +36,8 @@ def atomic_write_text(path: Path, content: str, *, encoding: str = "utf-8") -> N
         with temp_path.open("w", encoding=encoding, newline="") as handle:
             handle.write(content)
             handle.flush()
-            os.fsync(handle.fileno())
+            if fsync:
+                os.fsync(handle.fileno())
         os.replace(temp_path, path)
     finally:
         if temp_path.exists():
@@ -0,0 +1,318 @@
+"""Indexed queries over the JSONL logs.
+
+Each ``.jsonl`` log gets a sidecar ``<name>.idx`` holding the byte offset
+of every record and, per ``scan_id``, ``session_id``, ``category`` and UTC
+minute, the numbers of the records that carry it.  A query intersects
+those posting lists and only decodes the matching lines from a memory map
+of the log, so looking up one scan in a large file reads a handful of
+lines.  The index is extended with the lines appended since the previous
+query and rebuilt when the log was rotated or truncated.
+
+Run ``python -m z7_sentineltray.log_query --scan-id <id>`` to search the
+logs in the user log directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gzip
+import json
+import mmap
+import os
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .config import get_user_log_dir
+from .log_retention import INDEX_SUFFIX, PARTIAL_SUFFIX, SOURCE_SUFFIX
+
+# Index sidecars, temp files and retention's in-flight files are not logs.
+_SKIPPED_SUFFIXES = (INDEX_SUFFIX, ".tmp", PARTIAL_SUFFIX, SOURCE_SUFFIX)
+_INDEX_VERSION = 1
+_HEAD_BYTES = 256
+_INDEXED_FIELDS = ("scan_id", "session_id", "category")
+
+
+def _as_utc(moment: datetime) -> datetime:
+    return moment.astimezone(UTC) if moment.tzinfo else moment.replace(tzinfo=UTC)
+
+
+def _minute_bucket(moment: datetime) -> str:
+    return _as_utc(moment).strftime("%Y-%m-%dT%H:%M")
+
+
+def _parse_timestamp(value: object) -> datetime | None:
+    try:
+        return _as_utc(datetime.fromisoformat(str(value)))
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class LogQuery:
+    """Filters for :func:`query_logs`; empty fields match everything.
+
+    ``since``/``until`` are inclusive; naive datetimes are taken as UTC.
+    ``level`` is a minimum level name and ``contains`` a case-insensitive
+    substring of the message.
+    """
+
+    scan_id: str = ""
+    session_id: str = ""
+    category: str = ""
+    level: str = ""
+    since: datetime | None = None
+    until: datetime | None = None
+    contains: str = ""
+
+
+_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+
+def _matches(record: dict[str, Any], query: LogQuery) -> bool:
+    for name in _INDEXED_FIELDS:
+        expected = getattr(query, name)
+        if expected and record.get(name) != expected:
+            return False
+    if query.level and _LEVELS.get(str(record.get("level", "")), 0) < _LEVELS.get(
+        query.level.upper(), 0
+    ):
+        return False
+    if query.since or query.until:
+        moment = _parse_timestamp(record.get("timestamp"))
+        if moment is None:
+            return False
+        if query.since and moment < _as_utc(query.since):
+            return False
+        if query.until and moment > _as_utc(query.until):
+            return False
+    return not query.contains or query.contains.lower() in str(record.get("message", "")).lower()
+
+
+@dataclass
+class LogIndex:
+    """Offset index of one JSONL log file.
+
+    Attributes:
+        size: Number of bytes of the log covered (always ends on a newline).
+        head: CRC32 of the first bytes, to detect a rotated or replaced file.
+        offsets: Byte offset of each indexed record, in file order.
+        postings: ``field -> value -> record numbers`` for the indexed
+            fields and the ``minute`` bucket.
+    """
+
+    size: int = 0
+    head: int = 0
+    offsets: list[int] = field(default_factory=list)
+    postings: dict[str, dict[str, list[int]]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> LogIndex:
+        """Read the sidecar index of *path*; an empty index if missing or stale."""
+        try:
+            payload = json.loads(_index_path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(payload, dict) or payload.get("version") != _INDEX_VERSION:
+            return cls()
+        return cls(
+            size=int(payload.get("size", 0)),
+            head=int(payload.get("head", 0)),
+            offsets=list(payload.get("offsets", [])),
+            postings=dict(payload.get("postings", {})),
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the sidecar index of *path* atomically (best effort)."""
+        target = _index_path(path)
+        temp = target.with_name(target.name + ".tmp")
+        payload = {
+            "version": _INDEX_VERSION,
+            "size": self.size,
+            "head": self.head,
+            "offsets": self.offsets,
+            "postings": self.postings,
+        }
+        try:
+            temp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            temp.replace(target)
+        except OSError:
+            with contextlib.suppress(OSError):
+                temp.unlink()
+
+    def add_lines(self, data: bytes | mmap.mmap, start: int, end: int) -> None:
+        """Index the complete lines of ``data[start:end]``."""
+        position = start
+        while position < end:
+            newline = data.find(b"\n", position, end)
+            if newline < 0:
+                break
+            self._add_line(data[position:newline], position)
+            position = newline + 1
+        self.size = position
+
+    def _add_line(self, line: bytes, offset: int) -> None:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(record, dict) or "timestamp" not in record:
+            return
+        number = len(self.offsets)
+        self.offsets.append(offset)
+        keys = {name: str(record.get(name) or "") for name in _INDEXED_FIELDS}
+        moment = _parse_timestamp(record["timestamp"])
+        keys["minute"] = _minute_bucket(moment) if moment else ""
+        for name, value in keys.items():
+            if value:
+                self.postings.setdefault(name, {}).setdefault(value, []).append(number)
+
+    def candidates(self, query: LogQuery) -> Iterable[int]:
+        """Return the record numbers that may match *query*, in file order."""
+        selected: set[int] | None = None
+        for name in _INDEXED_FIELDS:
+            value = getattr(query, name)
+            if value:
+                numbers = set(self.postings.get(name, {}).get(value, ()))
+                selected = numbers if selected is None else selected & numbers
+        if query.since or query.until:
+            low = _minute_bucket(query.since) if query.since else ""
+            high = _minute_bucket(query.until) if query.until else "~"
+            numbers = set()
+            for bucket, members in self.postings.get("minute", {}).items():
+                if low <= bucket <= high:
+                    numbers.update(members)
+            selected = numbers if selected is None else selected & numbers
+        if selected is None:
+            return range(len(self.offsets))
+        return sorted(selected)
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _head_crc(data: bytes | mmap.mmap, size: int) -> int:
+    return zlib.crc32(data[: min(size, _HEAD_BYTES)])
+
+
+def update_index(path: Path, data: bytes | mmap.mmap) -> LogIndex:
+    """Return the index of *path* (whose contents are *data*), extending it as needed."""
+    size = len(data)
+    index = LogIndex.load(path)
+    if index.size > size or (index.size and index.head != _head_crc(data, index.size)):
+        index = LogIndex()
+    if index.size < size:
+        previous = index.size
+        index.add_lines(data, previous, size)
+        index.head = _head_crc(data, index.size)
+        if index.size != previous:
+            index.save(path)
+    return index
+
+
+def _query_gzip(path: Path, query: LogQuery) -> Iterator[dict[str, Any]]:
+    # Compressed archives cannot be memory-mapped; they are scanned in full.
+    with gzip.open(path, "rb") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "timestamp" in record and _matches(record, query):
+                yield record
+
+
+def query_file(path: Path, query: LogQuery) -> Iterator[dict[str, Any]]:
+    """Yield the records of one JSONL log matching *query*, in file order."""
+    if path.suffix == ".gz":
+        yield from _query_gzip(path, query)
+        return
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            index = update_index(path, data)
+            for number in index.candidates(query):
+                start = index.offsets[number]
+                record = json.loads(data[start : data.find(b"\n", start)])
+                if _matches(record, query):
+                    yield record
+
+
+def find_log_files(directory: Path) -> list[Path]:
+    """Return the JSONL logs (plain, rotated and compressed) in *directory*, oldest first."""
+    files: list[tuple[float, Path]] = []
+    for path in directory.iterdir():
+        name = path.name
+        if ".jsonl" not in name or name.endswith(_SKIPPED_SUFFIXES):
+            continue
+        with contextlib.suppress(OSError):
+            if path.is_file():
+                files.append((path.stat().st_mtime, path))
+    return [path for _, path in sorted(files)]
+
+
+def query_logs(paths: Iterable[Path], query: LogQuery) -> Iterator[dict[str, Any]]:
+    """Yield matching records from *paths* (files or directories), streaming."""
+    for path in paths:
+        files = find_log_files(path) if path.is_dir() else [path]
+        for file_path in files:
+            yield from query_file(file_path, query)
+
+
+def _format_record(record: dict[str, Any]) -> str:
+    scan_id = record.get("scan_id") or "-"
+    return (
+        f"{record.get('timestamp', '')} {record.get('level', ''):<8} "
+        f"{record.get('category', '')} [{scan_id}] {record.get('message', '')}"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Print the log records matching the command-line filters."""
+    parser = argparse.ArgumentParser(
+        prog="python -m z7_sentineltray.log_query",
+        description="Search Z7_SentinelTray JSONL logs using sidecar indexes.",
+    )
+    parser.add_argument(
+        "paths", nargs="*", type=Path, help="log files or directories (default: user log dir)"
+    )
+    parser.add_argument("--scan-id", default="")
+    parser.add_argument("--session-id", default="")
+    parser.add_argument("--category", default="")
+    parser.add_argument("--level", default="", help="minimum level, e.g. WARNING")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="ISO time, UTC if naive")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="ISO time, UTC if naive")
+    parser.add_argument("--contains", default="", help="substring of the message")
+    parser.add_argument("--limit", type=int, default=0, help="stop after N records")
+    parser.add_argument("--json", action="store_true", help="print raw JSON records")
+    args = parser.parse_args(argv)
+    query = LogQuery(
+        scan_id=args.scan_id,
+        session_id=args.session_id,
+        category=args.category,
+        level=args.level,
+        since=args.since,
+        until=args.until,
+        contains=args.contains,
+    )
+    paths = args.paths or [get_user_log_dir()]
+    shown = 0
+    try:
+        for record in query_logs(paths, query):
+            print(json.dumps(record, ensure_ascii=False) if args.json else _format_record(record))
+            shown += 1
+            if args.limit and shown >= args.limit:
+                break
+    except OSError as exc:
+        parser.error(f"cannot read logs: {exc}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
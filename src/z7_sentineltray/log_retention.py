@@ -0,0 +1,325 @@
+"""Background compression and retention of rotated logs and diagnostic files."""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from .metrics import LOG_RETENTION_RECLAIMED_BYTES_TOTAL, get_metrics_registry
+
+LOGGER = logging.getLogger(__name__)
+
+# ``z7_sentineltray.log.1`` / ``trace.jsonl.2`` (RotatingFileHandler and tracer backups).
+_ROTATED_RE = re.compile(r"^(?P<base>.+\.(?:log|jsonl))\.\d+$")
+# ``z7_sentineltray.log.20260101_120000.gz`` (compressed rotated backups).
+_ARCHIVE_RE = re.compile(r"^(?P<base>.+\.(?:log|jsonl))\.(?P<stamp>\d{8}_\d{6})(?:-\d+)?\.gz$")
+# ``z7_sentineltray_20260101_120000_1234.log`` (per-run logs, optionally gzipped).
+_RUN_LOG_RE = re.compile(r"^(?P<stem>.+)_(?P<stamp>\d{8}_\d{6})_\d+\.(?P<ext>log|jsonl)(?:\.gz)?$")
+# Diagnostic files that may be deleted once they exceed the age or size budget.
+_DISPOSABLE_RE = re.compile(
+    r"^(?:.+\.gz|config_error\.\d{8}-\d{6}\.txt|profile-\d{8}-\d{6}.*\.(?:pstats|txt))$"
+)
+# Sidecar indexes written by ``log_query``; removed once their log is gone.
+INDEX_SUFFIX = ".idx"
+# In-flight files: an archive still being compressed, and a rotated backup
+# moved aside for compression.  Readers must skip both.
+PARTIAL_SUFFIX = ".part"
+SOURCE_SUFFIX = ".src"
+_MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class RetentionReport:
+    """Outcome of one retention pass.
+
+    Attributes:
+        compressed: Number of files gzipped.
+        deleted: Number of files removed by the count, age or size budgets.
+        bytes_before: Total size of the log directory before the pass.
+        bytes_after: Total size of the log directory after the pass.
+    """
+
+    compressed: int = 0
+    deleted: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        """Return the disk space freed by the pass."""
+        return max(0, self.bytes_before - self.bytes_after)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    path: Path
+    size: int
+    mtime: float
+
+
+def _scan(directory: Path) -> list[_Entry]:
+    entries: list[_Entry] = []
+    try:
+        with os.scandir(directory) as iterator:
+            for item in iterator:
+                try:
+                    if not item.is_file(follow_symlinks=False):
+                        continue
+                    stat = item.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries.append(_Entry(Path(item.path), stat.st_size, stat.st_mtime))
+    except OSError:
+        return []
+    return entries
+
+
+def _unique_path(path: Path) -> Path:
+    candidate = path
+    counter = 1
+    while candidate.exists():
+        candidate = path.with_name(f"{path.stem}-{counter}{path.suffix}")
+        counter += 1
+    return candidate
+
+
+def _gzip_file(source: Path, target: Path) -> None:
+    partial = target.with_name(target.name + PARTIAL_SUFFIX)
+    try:
+        with source.open("rb") as reader, gzip.open(partial, "wb", compresslevel=6) as writer:
+            shutil.copyfileobj(reader, writer, 1024 * 1024)
+        stat = source.stat()
+        partial.replace(target)
+        os.utime(target, (stat.st_atime, stat.st_mtime))
+    finally:
+        if partial.exists():
+            partial.unlink()
+    source.unlink()
+
+
+class LogRetentionManager:
+    """Compress rotated logs and enforce retention budgets on a background thread.
+
+    Each pass lists *log_dir* once and then:
+
+    1. gzips rotated backups (``*.log.N``, ``*.jsonl.N``) under a timestamped
+       name, so later rollovers never collide with an archive, and finished
+       per-run logs;
+    2. keeps the newest *backup_count* compressed backups of each rotating
+       log and the newest *run_files_keep* per-run logs of each family;
+    3. deletes archives, config-error dumps and profile reports older than
+       *max_age_days*;
+    4. deletes the oldest of those until the directory fits in
+       *max_total_mb*.
+
+    A budget of ``0`` disables the corresponding check.  Files in
+    *active_paths* (the logs being written) and files that match no known
+    pattern (telemetry, e-mail queue, the live trace file) are never touched.
+    ``log_query`` index sidecars are removed once their log is gone.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        *,
+        active_paths: Iterable[Path] = (),
+        backup_count: int = 3,
+        run_files_keep: int = 3,
+        max_total_mb: float = 200.0,
+        max_age_days: float = 30.0,
+        compress: bool = True,
+        interval_seconds: float = 600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._log_dir = log_dir
+        self._active = {path.resolve() for path in active_paths}
+        self._backup_count = max(0, backup_count)
+        self._run_files_keep = max(1, run_files_keep)
+        self._max_total_bytes = int(max(0.0, max_total_mb) * _MB)
+        self._max_age_seconds = max(0.0, max_age_days) * 86400
+        self._compress = compress
+        self._interval_seconds = max(1.0, interval_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.last_report: RetentionReport | None = None
+
+    def _is_active(self, path: Path) -> bool:
+        return path.resolve() in self._active
+
+    def _compress_pass(self, entries: list[_Entry]) -> int:
+        compressed = 0
+        for entry in entries:
+            name = entry.path.name
+            if self._is_active(entry.path) or name.endswith(".gz"):
+                continue
+            rotated = _ROTATED_RE.match(name)
+            if name.endswith(SOURCE_SUFFIX) and _ARCHIVE_RE.match(name.removesuffix(SOURCE_SUFFIX)):
+                # Left behind by a pass whose compression failed.
+                source = entry.path
+                target = _unique_path(entry.path.with_name(name.removesuffix(SOURCE_SUFFIX)))
+            elif rotated is not None:
+                stamp = datetime.fromtimestamp(entry.mtime).strftime("%Y%m%d_%H%M%S")
+                target = _unique_path(entry.path.with_name(f"{rotated['base']}.{stamp}.gz"))
+                # Move the backup aside first: a rollover renaming it meanwhile must not fail.
+                source = entry.path.with_name(target.name + SOURCE_SUFFIX)
+                try:
+                    entry.path.replace(source)
+                except OSError:
+                    continue
+            elif _RUN_LOG_RE.match(name) is not None:
+                source = entry.path
+                target = _unique_path(entry.path.with_name(name + ".gz"))
+            else:
+                continue
+            try:
+                _gzip_file(source, target)
+            except OSError as exc:
+                LOGGER.warning(
+                    "Failed to compress %s: %s", name, exc, extra={"category": "retention"}
+                )
+                # Put the backup back under its rotated name unless a rollover
+                # reused it; the next pass retries either way.
+                if source != entry.path and not entry.path.exists():
+                    with contextlib.suppress(OSError):
+                        source.replace(entry.path)
+                continue
+            compressed += 1
+        return compressed
+
+    def _deletion_candidates(self, entries: list[_Entry]) -> tuple[list[_Entry], list[_Entry]]:
+        """Return ``(over_count, disposable)`` entries, oldest first."""
+        families: dict[tuple[str, str], list[tuple[str, _Entry]]] = {}
+        archives: dict[str, list[tuple[str, _Entry]]] = {}
+        disposable: list[_Entry] = []
+        names = {entry.path.name for entry in entries}
+        orphans: list[_Entry] = []
+        for entry in entries:
+            if self._is_active(entry.path):
+                continue
+            if entry.path.name.endswith(INDEX_SUFFIX):
+                if entry.path.name.removesuffix(INDEX_SUFFIX) not in names:
+                    orphans.append(entry)
+                continue
+            archive = _ARCHIVE_RE.match(entry.path.name)
+            if archive is not None:
+                archives.setdefault(archive["base"], []).append((archive["stamp"], entry))
+                continue
+            run_log = _RUN_LOG_RE.match(entry.path.name)
+            if run_log is not None:
+                key = (run_log["stem"], run_log["ext"])
+                families.setdefault(key, []).append((run_log["stamp"], entry))
+                continue
+            if _DISPOSABLE_RE.match(entry.path.name):
+                disposable.append(entry)
+        over_count = orphans
+        for members in archives.values():
+            members.sort(key=lambda item: item[0], reverse=True)
+            over_count.extend(entry for _, entry in members[self._backup_count :])
+            disposable.extend(entry for _, entry in members[: self._backup_count])
+        for members in families.values():
+            members.sort(key=lambda item: item[0], reverse=True)
+            # The active run log is excluded above, so it does not use up a slot.
+            keep = self._run_files_keep - 1
+            over_count.extend(entry for _, entry in members[keep:])
+            disposable.extend(entry for _, entry in members[:keep])
+        disposable.sort(key=lambda entry: entry.mtime)
+        return over_count, disposable
+
+    def _delete(self, entry: _Entry) -> bool:
+        try:
+            entry.path.unlink()
+        except FileNotFoundError:
+            return True
+        except OSError as exc:
+            LOGGER.warning(
+                "Failed to delete %s: %s", entry.path.name, exc, extra={"category": "retention"}
+            )
+            return False
+        return True
+
+    def run_once(self) -> RetentionReport:
+        """Run one compression and retention pass now."""
+        with self._lock:
+            entries = _scan(self._log_dir)
+            bytes_before = sum(entry.size for entry in entries)
+            compressed = self._compress_pass(entries) if self._compress else 0
+            if compressed:
+                entries = _scan(self._log_dir)
+            over_count, disposable = self._deletion_candidates(entries)
+            deleted = {entry.path for entry in over_count if self._delete(entry)}
+            now = self._clock()
+            remaining: list[_Entry] = []
+            for entry in disposable:
+                expired = self._max_age_seconds and now - entry.mtime > self._max_age_seconds
+                if expired and self._delete(entry):
+                    deleted.add(entry.path)
+                else:
+                    remaining.append(entry)
+            total = sum(entry.size for entry in entries if entry.path not in deleted)
+            for entry in remaining:
+                if not self._max_total_bytes or total <= self._max_total_bytes:
+                    break
+                if self._delete(entry):
+                    deleted.add(entry.path)
+                    total -= entry.size
+            report = RetentionReport(
+                compressed=compressed,
+                deleted=len(deleted),
+                bytes_before=bytes_before,
+                bytes_after=total,
+            )
+            self.last_report = report
+        if report.compressed or report.deleted:
+            get_metrics_registry().counter(LOG_RETENTION_RECLAIMED_BYTES_TOTAL).inc(
+                report.reclaimed_bytes
+            )
+            LOGGER.info(
+                "Log retention: %s compressed, %s deleted, %.1f MB reclaimed (%.1f MB in use)",
+                report.compressed,
+                report.deleted,
+                report.reclaimed_bytes / _MB,
+                report.bytes_after / _MB,
+                extra={"category": "retention"},
+            )
+        return report
+
+    def start(self) -> None:
+        """Start the background thread; the first pass runs immediately.
+
+        :meth:`stop` waits for that first pass, so a short-lived process still
+        prunes its directory once.
+        """
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="log-retention")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, waiting for a running pass to finish."""
+        thread = self._thread
+        self._thread = None
+        self._stop_event.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=30)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception:
+                LOGGER.exception("Log retention pass failed", extra={"category": "retention"})
+            if self._stop_event.wait(self._interval_seconds):
+                return
@@ -0,0 +1,257 @@
+"""Background watchdog for process memory growth during long uptimes."""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .profiling import sanitize_code_path
+
+LOGGER = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+_TRACEMALLOC_FRAMES = 1
+
+
+def read_rss_bytes() -> int:
+    """Return the resident set size of this process in bytes, or ``0`` if unknown.
+
+    Uses ``K32GetProcessMemoryInfo`` (working set) on Windows and
+    ``/proc/self/statm`` on Linux.
+    """
+    if sys.platform == "win32":
+        import ctypes
+        import ctypes.wintypes
+
+        class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):  # noqa: N801
+            _fields_ = [
+                ("cb", ctypes.wintypes.DWORD),
+                ("PageFaultCount", ctypes.wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = _PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(_PROCESS_MEMORY_COUNTERS)
+        kernel32 = ctypes.windll.kernel32
+        if not kernel32.K32GetProcessMemoryInfo(
+            kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+        ):
+            return 0
+        return int(counters.WorkingSetSize)
+    else:
+        try:
+            fields = Path("/proc/self/statm").read_text(encoding="ascii").split()
+            return int(fields[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return 0
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """One watchdog sample compared with the baseline taken at start.
+
+    Attributes:
+        rss_bytes: Current resident set size (``0`` when unavailable).
+        rss_growth_bytes: RSS growth since the baseline sample.
+        structures: Current size of each probed structure.
+        structure_growth: Growth of each probed structure since the baseline.
+        top_sites: ``"file:line: +N KiB"`` lines for the allocation sites that
+            grew most since the baseline (empty unless ``tracemalloc`` is on).
+        reasons: Threshold breaches; empty when memory looks healthy.
+    """
+
+    rss_bytes: int
+    rss_growth_bytes: int
+    structures: dict[str, int] = field(default_factory=dict)
+    structure_growth: dict[str, int] = field(default_factory=dict)
+    top_sites: list[str] = field(default_factory=list)
+    reasons: list[str] = field(default_factory=list)
+
+    @property
+    def alert(self) -> bool:
+        """Return ``True`` if any growth threshold was exceeded."""
+        return bool(self.reasons)
+
+    def format(self) -> str:
+        """Render the report as multi-line text for the log."""
+        lines = [
+            f"RSS {self.rss_bytes / _MB:.1f} MB ({self.rss_growth_bytes / _MB:+.1f} MB)",
+            *(
+                f"{name}: {size} ({self.structure_growth.get(name, 0):+d})"
+                for name, size in sorted(self.structures.items())
+            ),
+        ]
+        if self.reasons:
+            lines.append("Growth: " + "; ".join(self.reasons))
+        if self.top_sites:
+            lines.append("Top growing allocation sites:")
+            lines.extend(f"  {site}" for site in self.top_sites)
+        return "\n".join(lines)
+
+
+class MemoryWatchdog:
+    """Sample RSS and structure sizes periodically and warn on sustained growth.
+
+    *probes* maps a structure name to a callable returning its current size;
+    probes run on the watchdog thread, so they must only read (``len`` of a
+    dict or list is safe).  The first sample becomes the baseline; later
+    samples warn once per newly breached threshold so a slow leak does not
+    flood the log.  With *trace_allocations* the watchdog keeps
+    ``tracemalloc`` running and each report names the top-growing
+    allocation sites since the baseline.
+    """
+
+    def __init__(
+        self,
+        probes: Mapping[str, Callable[[], int]],
+        *,
+        interval_seconds: float = 300.0,
+        rss_growth_threshold_mb: float = 100.0,
+        structure_growth_threshold: int = 10_000,
+        trace_allocations: bool = False,
+        top_n: int = 10,
+        rss_reader: Callable[[], int] = read_rss_bytes,
+        on_report: Callable[[MemoryReport], None] | None = None,
+    ) -> None:
+        self._probes = dict(probes)
+        self._interval_seconds = max(1.0, interval_seconds)
+        self._rss_growth_threshold = int(max(0.0, rss_growth_threshold_mb) * _MB)
+        self._structure_growth_threshold = max(1, structure_growth_threshold)
+        self._trace_allocations = trace_allocations
+        self._top_n = max(1, top_n)
+        self._rss_reader = rss_reader
+        self._on_report = on_report
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._owns_tracemalloc = False
+        self._baseline_rss: int | None = None
+        self._baseline_sizes: dict[str, int] = {}
+        self._baseline_snapshot: tracemalloc.Snapshot | None = None
+        self._warned: set[str] = set()
+        self.last_report: MemoryReport | None = None
+
+    def _read_probes(self) -> dict[str, int]:
+        sizes: dict[str, int] = {}
+        for name, probe in self._probes.items():
+            try:
+                sizes[name] = int(probe())
+            except Exception:
+                LOGGER.debug(
+                    "Memory probe %s failed", name, exc_info=True, extra={"category": "perf"}
+                )
+        return sizes
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot | None:
+        if not self._trace_allocations or not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ]
+        )
+
+    def _top_sites(self, snapshot: tracemalloc.Snapshot | None) -> list[str]:
+        baseline = self._baseline_snapshot
+        if snapshot is None or baseline is None:
+            return []
+        # compare_to() orders by absolute change; keep only the sites that grew.
+        grown = [diff for diff in snapshot.compare_to(baseline, "lineno") if diff.size_diff > 0]
+        sites = []
+        for diff in grown[: self._top_n]:
+            frame = diff.traceback[0]
+            sites.append(
+                f"{sanitize_code_path(frame.filename)}:{frame.lineno}: "
+                f"{diff.size_diff / 1024:+.1f} KiB ({diff.count_diff:+d} blocks)"
+            )
+        return sites
+
+    def sample(self) -> MemoryReport:
+        """Take one sample, log a warning on new threshold breaches and return the report."""
+        with self._lock:
+            rss = self._rss_reader()
+            sizes = self._read_probes()
+            snapshot = self._take_snapshot()
+            if self._baseline_rss is None:
+                self._baseline_rss = rss
+                self._baseline_sizes = dict(sizes)
+                self._baseline_snapshot = snapshot
+            rss_growth = rss - self._baseline_rss if rss and self._baseline_rss else 0
+            growth = {
+                name: size - self._baseline_sizes.get(name, 0) for name, size in sizes.items()
+            }
+            reasons: list[str] = []
+            breached: set[str] = set()
+            if self._rss_growth_threshold and rss_growth >= self._rss_growth_threshold:
+                reasons.append(f"RSS +{rss_growth / _MB:.0f} MB")
+                breached.add("rss")
+            for name, delta in sorted(growth.items()):
+                if delta >= self._structure_growth_threshold:
+                    reasons.append(f"{name} +{delta}")
+                    breached.add(name)
+            report = MemoryReport(
+                rss_bytes=rss,
+                rss_growth_bytes=rss_growth,
+                structures=sizes,
+                structure_growth=growth,
+                top_sites=self._top_sites(snapshot) if reasons else [],
+                reasons=reasons,
+            )
+            new_breaches = breached - self._warned
+            self._warned = breached
+            self.last_report = report
+        if new_breaches:
+            LOGGER.warning(
+                "Memory growth detected:\n%s", report.format(), extra={"category": "perf"}
+            )
+        else:
+            LOGGER.debug("Memory sample:\n%s", report.format(), extra={"category": "perf"})
+        if self._on_report is not None:
+            self._on_report(report)
+        return report
+
+    def start(self) -> None:
+        """Take the baseline sample and start the background sampling thread."""
+        if self._thread is not None:
+            return
+        if self._trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+            self._owns_tracemalloc = True
+        self._stop_event.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="memory-watchdog")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampling thread and release ``tracemalloc`` if this watchdog started it."""
+        thread = self._thread
+        self._thread = None
+        self._stop_event.set()
+        if thread is not None:
+            thread.join(timeout=5)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval_seconds):
+            try:
+                self.sample()
+            except Exception:
+                LOGGER.exception("Memory watchdog sample failed", extra={"category": "perf"})
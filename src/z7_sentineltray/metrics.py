@@ -0,0 +1,253 @@
+"""In-process metrics registry: counters, gauges and fixed-bucket histograms."""
+
+from __future__ import annotations
+
+import bisect
+import math
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any
+
+DURATION_BUCKETS_MS: tuple[float, ...] = (
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+    30000,
+)
+COUNT_BUCKETS: tuple[float, ...] = (0, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Metric names shared by the instrumented modules.
+SCAN_WINDOW_LOOKUP_MS = "scan_window_lookup_ms"
+SCAN_FOREGROUND_MS = "scan_foreground_ms"
+SCAN_RESTORE_MS = "scan_restore_ms"
+SCAN_DESCENDANTS_MS = "scan_descendants_ms"
+SCAN_ELEMENTS = "scan_elements"
+SCAN_MATCH_MS = "scan_match_ms"
+SCAN_FILTER_MS = "scan_filter_ms"
+SCAN_MONITOR_MS = "scan_monitor_ms"
+SCAN_LOOP_MS = "scan_loop_ms"
+SMTP_CONNECT_MS = "smtp_connect_ms"
+SMTP_SEND_MS = "smtp_send_ms"
+QUEUE_DRAIN_MS = "queue_drain_ms"
+STATE_WRITE_MS = "state_write_ms"
+TELEMETRY_WRITE_MS = "telemetry_write_ms"
+SCANS_TOTAL = "scans_total"
+SCAN_ERRORS_TOTAL = "scan_errors_total"
+MATCHES_TOTAL = "matches_total"
+SMTP_SENT_TOTAL = "smtp_sent_total"
+SMTP_FAILURES_TOTAL = "smtp_failures_total"
+LOG_RECORDS_SUPPRESSED_TOTAL = "log_records_suppressed_total"
+LOG_DEDUP_EVICTIONS_TOTAL = "log_dedup_evictions_total"
+LOG_DEDUP_ENTRIES = "log_dedup_entries"
+LOG_RETENTION_RECLAIMED_BYTES_TOTAL = "log_retention_reclaimed_bytes_total"
+
+
+class Counter:
+    """Monotonically increasing value."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add *amount* (must be non-negative)."""
+        if amount < 0:
+            raise ValueError("counter increments must be >= 0")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        """Return the current total."""
+        with self._lock:
+            return self._value
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the gauge to *value*."""
+        with self._lock:
+            self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add *amount* (may be negative)."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        """Return the current value."""
+        with self._lock:
+            return self._value
+
+
+class Histogram:
+    """Fixed-bucket histogram with interpolated percentiles.
+
+    *buckets* are inclusive upper bounds in ascending order; an implicit
+    overflow bucket catches larger values.  Percentiles are estimated by
+    linear interpolation inside the bucket that holds the requested rank and
+    clamped to the observed min/max, so memory stays constant however many
+    observations are recorded.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DURATION_BUCKETS_MS) -> None:
+        bounds = tuple(float(bound) for bound in buckets)
+        if list(bounds) != sorted(set(bounds)):
+            raise ValueError("histogram buckets must be strictly increasing")
+        self._bounds = bounds
+        self._lock = Lock()
+        self._counts = [0] * (len(bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+
+    @property
+    def bounds(self) -> tuple[float, ...]:
+        """Return the bucket upper bounds (without the overflow bucket)."""
+        return self._bounds
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+
+    def _quantile_locked(self, fraction: float) -> float:
+        if self._count == 0:
+            return 0.0
+        rank = fraction * self._count
+        cumulative = 0
+        for index, bucket_count in enumerate(self._counts):
+            if bucket_count == 0:
+                continue
+            if cumulative + bucket_count >= rank:
+                lower = self._bounds[index - 1] if index > 0 else self._min
+                upper = self._bounds[index] if index < len(self._bounds) else self._max
+                lower = max(lower, self._min)
+                upper = min(upper, self._max)
+                position = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * max(0.0, min(1.0, position))
+            cumulative += bucket_count
+        return self._max
+
+    def quantile(self, fraction: float) -> float:
+        """Return the estimated value at *fraction* (0..1)."""
+        with self._lock:
+            return self._quantile_locked(fraction)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return count, sum, min, max, p50/p95/p99 and cumulative bucket counts."""
+        with self._lock:
+            cumulative = 0
+            buckets: list[list[float]] = []
+            for bound, bucket_count in zip(self._bounds, self._counts, strict=False):
+                cumulative += bucket_count
+                buckets.append([bound, cumulative])
+            return {
+                "count": self._count,
+                "sum": round(self._sum, 3),
+                "min": round(self._min, 3) if self._count else 0.0,
+                "max": round(self._max, 3) if self._count else 0.0,
+                "p50": round(self._quantile_locked(0.50), 3),
+                "p95": round(self._quantile_locked(0.95), 3),
+                "p99": round(self._quantile_locked(0.99), 3),
+                "buckets": buckets,
+            }
+
+
+class MetricsRegistry:
+    """Named collection of counters, gauges and histograms.
+
+    Metrics are created on first use, so instrumented code only needs the
+    name.  All operations are thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counters: dict[str, Counter] = {}
+        self._gauges: dict[str, Gauge] = {}
+        self._histograms: dict[str, Histogram] = {}
+
+    def counter(self, name: str) -> Counter:
+        """Return the counter called *name*, creating it if needed."""
+        with self._lock:
+            metric = self._counters.get(name)
+            if metric is None:
+                metric = self._counters[name] = Counter()
+            return metric
+
+    def gauge(self, name: str) -> Gauge:
+        """Return the gauge called *name*, creating it if needed."""
+        with self._lock:
+            metric = self._gauges.get(name)
+            if metric is None:
+                metric = self._gauges[name] = Gauge()
+            return metric
+
+    def histogram(self, name: str, buckets: Sequence[float] = DURATION_BUCKETS_MS) -> Histogram:
+        """Return the histogram called *name*, creating it with *buckets* if needed."""
+        with self._lock:
+            metric = self._histograms.get(name)
+            if metric is None:
+                metric = self._histograms[name] = Histogram(buckets)
+            return metric
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Record the duration of the ``with`` block in milliseconds into *name*."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).observe((time.perf_counter() - started) * 1000)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serialisable view of every metric."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = dict(self._histograms)
+        return {
+            "counters": {name: metric.value for name, metric in sorted(counters.items())},
+            "gauges": {name: metric.value for name, metric in sorted(gauges.items())},
+            "histograms": {name: metric.snapshot() for name, metric in sorted(histograms.items())},
+        }
+
+    def reset(self) -> None:
+        """Drop every metric."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+_REGISTRY = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide :class:`MetricsRegistry`."""
+    return _REGISTRY
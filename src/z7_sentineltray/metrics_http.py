@@ -0,0 +1,195 @@
+"""Optional local HTTP endpoint serving metrics in OpenMetrics text format."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any
+
+from .status import StatusSnapshot
+
+LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+METRIC_PREFIX = "z7_sentineltray_"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    number = float(value)
+    if number.is_integer():
+        return str(int(number))
+    return repr(number)
+
+
+def _family(lines: list[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+    lines.append(f"# HELP {METRIC_PREFIX}{name} {help_text}")
+
+
+def _sample(
+    lines: list[str], name: str, value: float, labels: Mapping[str, str] | None = None
+) -> None:
+    label_text = ""
+    if labels:
+        pairs = ",".join(f'{key}="{_escape_label(str(val))}"' for key, val in labels.items())
+        label_text = f"{{{pairs}}}"
+    lines.append(f"{METRIC_PREFIX}{name}{label_text} {_format_value(value)}")
+
+
+def _render_registry(lines: list[str], metrics: Mapping[str, Any]) -> None:
+    for name, value in metrics.get("counters", {}).items():
+        family = name.removesuffix("_total")
+        _family(lines, family, "counter", f"Total of {family.replace('_', ' ')}.")
+        _sample(lines, f"{family}_total", value)
+    for name, value in metrics.get("gauges", {}).items():
+        _family(lines, name, "gauge", f"Current {name.replace('_', ' ')}.")
+        _sample(lines, name, value)
+    for name, histogram in metrics.get("histograms", {}).items():
+        _family(lines, name, "histogram", f"Distribution of {name.replace('_', ' ')}.")
+        for bound, cumulative in histogram.get("buckets", []):
+            _sample(lines, f"{name}_bucket", cumulative, {"le": _format_value(bound)})
+        _sample(lines, f"{name}_bucket", histogram.get("count", 0), {"le": "+Inf"})
+        _sample(lines, f"{name}_count", histogram.get("count", 0))
+        _sample(lines, f"{name}_sum", histogram.get("sum", 0.0))
+
+
+def render_openmetrics(
+    snapshot: StatusSnapshot, monitor_labels: Mapping[str, str] | None = None
+) -> str:
+    """Render *snapshot* (status fields plus registry metrics) as OpenMetrics text.
+
+    Args:
+        snapshot: Status snapshot; ``snapshot.metrics`` holds the registry view.
+        monitor_labels: Maps monitor keys to the ``monitor`` label value, so
+            window titles and phrases never leave the process.  Monitors
+            without an entry are left out.
+
+    Returns:
+        Exposition text terminated by ``# EOF``.
+    """
+    labels = monitor_labels or {}
+    lines: list[str] = []
+    _family(lines, "running", "gauge", "1 while the monitoring loop is running.")
+    _sample(lines, "running", 1 if snapshot.running else 0)
+    _family(lines, "uptime_seconds", "gauge", "Seconds since the monitoring loop started.")
+    _sample(lines, "uptime_seconds", snapshot.uptime_seconds)
+    _family(lines, "loop_errors", "counter", "Scan loop iterations that ended in error.")
+    _sample(lines, "loop_errors_total", snapshot.error_count)
+    _family(lines, "email_queue_items", "gauge", "E-mail queue items by state.")
+    for state in ("queued", "sent", "failed", "deferred"):
+        _sample(lines, "email_queue_items", snapshot.email_queue.get(state, 0), {"state": state})
+    _family(lines, "email_queue_oldest_age_seconds", "gauge", "Age of the oldest queued e-mail.")
+    _sample(
+        lines, "email_queue_oldest_age_seconds", snapshot.email_queue.get("oldest_age_seconds", 0)
+    )
+    _family(lines, "monitor_failures", "gauge", "Consecutive scan failures per monitor.")
+    for key, failures in sorted(snapshot.monitor_failures.items()):
+        if key in labels:
+            _sample(lines, "monitor_failures", failures, {"monitor": labels[key]})
+    _family(
+        lines, "monitor_breaker_active", "gauge", "1 while the monitor circuit breaker is open."
+    )
+    for key, active in sorted(snapshot.monitor_breakers_active.items()):
+        if key in labels:
+            _sample(lines, "monitor_breaker_active", 1 if active else 0, {"monitor": labels[key]})
+    _render_registry(lines, snapshot.metrics)
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    server: _MetricsHttpd
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.owner.payload()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: ANN401
+        LOGGER.debug("Metrics request: " + format, *args, extra={"category": "metrics"})
+
+
+class _MetricsHttpd(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], owner: MetricsHttpServer) -> None:
+        self.owner = owner
+        super().__init__(address, _MetricsHandler)
+
+
+class MetricsHttpServer:
+    """Background ``/metrics`` endpoint.
+
+    The monitoring loop calls :meth:`publish` with each new status snapshot;
+    the rendered text is cached, so scrapes only copy bytes and never wait on
+    or call into the scan thread.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464) -> None:
+        self._address = (host, port)
+        self._lock = Lock()
+        self._payload = b"# EOF\n"
+        self._httpd: _MetricsHttpd | None = None
+        self._thread: Thread | None = None
+
+    @property
+    def port(self) -> int:
+        """Return the bound port (useful when constructed with port 0)."""
+        if self._httpd is None:
+            return self._address[1]
+        return int(self._httpd.server_address[1])
+
+    def start(self) -> None:
+        """Bind the socket and serve requests on a daemon thread.
+
+        Raises:
+            OSError: If the address cannot be bound.
+        """
+        if self._httpd is not None:
+            return
+        self._httpd = _MetricsHttpd(self._address, self)
+        self._thread = Thread(target=self._httpd.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        LOGGER.info(
+            "Metrics endpoint listening on http://%s:%s/metrics",
+            self._address[0],
+            self.port,
+            extra={"category": "metrics"},
+        )
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        httpd = self._httpd
+        if httpd is None:
+            return
+        httpd.shutdown()
+        httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(5)
+        self._httpd = None
+        self._thread = None
+
+    def publish(
+        self, snapshot: StatusSnapshot, monitor_labels: Mapping[str, str] | None = None
+    ) -> None:
+        """Render *snapshot* and make it the response for subsequent scrapes."""
+        payload = render_openmetrics(snapshot, monitor_labels).encode("utf-8")
+        with self._lock:
+            self._payload = payload
+
+    def payload(self) -> bytes:
+        """Return the cached exposition bytes."""
+        with self._lock:
+            return self._payload
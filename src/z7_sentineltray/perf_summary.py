@@ -0,0 +1,147 @@
+"""Periodic aggregated performance summaries for the scan loop phases."""
+
+from __future__ import annotations
+
+import logging
+import math
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+# Phase names used by the notifier.
+PHASE_MONITOR_SCAN = "monitor_scan"
+PHASE_SCAN_LOOP = "scan_loop"
+PHASE_QUEUE_DRAIN = "queue_drain"
+PHASE_DISK_CHECK = "disk_check"
+PHASE_LOOP_ITERATION = "loop_iteration"
+
+_MAX_SAMPLES = 2048
+
+
+@dataclass
+class _PhaseStats:
+    count: int = 0
+    total_ms: float = 0.0
+    min_ms: float = math.inf
+    max_ms: float = 0.0
+    samples: list[float] = field(default_factory=list)
+
+    def add(self, duration_ms: float, rng: Callable[[], float]) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.min_ms = min(self.min_ms, duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+        if len(self.samples) < _MAX_SAMPLES:
+            self.samples.append(duration_ms)
+        else:
+            # Reservoir sampling keeps p95 representative on very long intervals.
+            slot = int(rng() * self.count)
+            if slot < _MAX_SAMPLES:
+                self.samples[slot] = duration_ms
+
+    def summary(self) -> dict[str, float]:
+        ordered = sorted(self.samples)
+        rank = max(0, math.ceil(0.95 * len(ordered)) - 1)
+        return {
+            "count": self.count,
+            "min_ms": round(self.min_ms, 2),
+            "avg_ms": round(self.total_ms / self.count, 2),
+            "p95_ms": round(ordered[rank], 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+def _label(phase: str, monitor: str) -> str:
+    return f"{phase}[{monitor}]" if monitor else phase
+
+
+class PerfAggregator:
+    """Accumulate phase timings and log one summary record per interval.
+
+    :meth:`observe` only updates in-memory counters, except when a duration
+    reaches the phase's outlier threshold: that is logged at once as a
+    WARNING (event ``perf_outlier``).  :meth:`maybe_flush` logs a single
+    INFO record (event ``perf_summary``) with count, min, avg, p95 and max
+    per phase and per monitor once *interval_seconds* have passed; the
+    numbers are also attached to the record as ``data`` for the JSON log.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float = 300.0,
+        outlier_ms: float = 5000.0,
+        outlier_overrides_ms: Mapping[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._interval_seconds = max(1.0, interval_seconds)
+        self._outlier_ms = outlier_ms
+        self._outlier_overrides_ms = dict(outlier_overrides_ms or {})
+        self._clock = clock
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, str], _PhaseStats] = {}
+        self._window_start = clock()
+
+    def observe(self, phase: str, duration_ms: float, *, monitor: str = "") -> None:
+        """Add one *phase* timing, optionally for a *monitor* label (never a raw key)."""
+        with self._lock:
+            stats = self._stats.get((phase, monitor))
+            if stats is None:
+                stats = self._stats[(phase, monitor)] = _PhaseStats()
+            stats.add(duration_ms, self._rng)
+        threshold = self._outlier_overrides_ms.get(phase, self._outlier_ms)
+        if threshold > 0 and duration_ms >= threshold:
+            LOGGER.warning(
+                "Slow %s: %.2fms (threshold %.0fms)",
+                _label(phase, monitor),
+                duration_ms,
+                threshold,
+                extra={
+                    "category": "perf",
+                    "event": "perf_outlier",
+                    "data": {"phase": phase, "monitor": monitor, "duration_ms": duration_ms},
+                },
+            )
+
+    def maybe_flush(self) -> bool:
+        """Log the summary if the interval has elapsed; return ``True`` if logged."""
+        if self._clock() - self._window_start < self._interval_seconds:
+            return False
+        return self.flush()
+
+    def flush(self) -> bool:
+        """Log the summary of the current interval now and start a new one."""
+        now = self._clock()
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            elapsed = now - self._window_start
+            self._window_start = now
+        if not stats:
+            return False
+        phases: list[dict[str, Any]] = []
+        for (phase, monitor), phase_stats in sorted(stats.items()):
+            phases.append({"phase": phase, "monitor": monitor, **phase_stats.summary()})
+        text = "; ".join(
+            f"{_label(item['phase'], item['monitor'])} n={item['count']} "
+            f"min={item['min_ms']:.2f} avg={item['avg_ms']:.2f} "
+            f"p95={item['p95_ms']:.2f} max={item['max_ms']:.2f}ms"
+            for item in phases
+        )
+        LOGGER.info(
+            "Perf summary (%.0fs): %s",
+            elapsed,
+            text,
+            extra={
+                "category": "perf",
+                "event": "perf_summary",
+                "data": {"interval_seconds": round(elapsed, 1), "phases": phases},
+            },
+        )
+        return True
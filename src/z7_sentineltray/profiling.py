@@ -0,0 +1,262 @@
+"""On-demand cProfile/tracemalloc capture of notifier scan cycles."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path, PurePath
+from threading import Lock
+
+LOGGER = logging.getLogger(__name__)
+
+PROFILE_ENV_VAR = "Z7_SENTINELTRAY_PROFILE"
+DEFAULT_PROFILE_CYCLES = 5
+_MAX_PROFILE_CYCLES = 1000
+_TOP_FUNCTIONS = 40
+_TOP_ALLOCATIONS = 25
+_PATH_ANCHORS = ("site-packages", "z7_sentineltray")
+_STDLIB_RE = re.compile(r"[\\/](?:lib|Lib)[\\/](?:python3\.\d+[\\/])?")
+
+# pstats keys and values: (file, line, function) -> (cc, nc, tt, ct, callers)
+_FuncKey = tuple[str, int, str]
+
+
+@dataclass(frozen=True)
+class ProfileRequest:
+    """Capture *cycles* scan cycles; also trace allocations if *memory*."""
+
+    cycles: int = DEFAULT_PROFILE_CYCLES
+    memory: bool = False
+
+
+def parse_profile_env(value: str | None) -> ProfileRequest | None:
+    """Parse ``Z7_SENTINELTRAY_PROFILE``.
+
+    Accepted forms: ``"5"`` (five cycles), ``"5,memory"``, ``"memory"``
+    (default cycles with allocation tracing) and ``"1"``/``"true"``.  Empty,
+    ``"0"`` or unparsable values disable profiling.
+    """
+    if not value:
+        return None
+    cycles = DEFAULT_PROFILE_CYCLES
+    memory = False
+    for part in value.replace(";", ",").split(","):
+        token = part.strip().lower()
+        if token in ("memory", "mem", "tracemalloc"):
+            memory = True
+        elif token in ("true", "yes", "on"):
+            continue
+        elif token.isdigit():
+            cycles = int(token)
+        elif token:
+            LOGGER.warning(
+                "Ignoring invalid %s value: %s", PROFILE_ENV_VAR, value, extra={"category": "perf"}
+            )
+            return None
+    if cycles <= 0:
+        return None
+    return ProfileRequest(cycles=min(cycles, _MAX_PROFILE_CYCLES), memory=memory)
+
+
+def sanitize_code_path(filename: str) -> str:
+    """Strip user-specific directories from a source path.
+
+    Package and third-party files keep their path from the package (or
+    ``site-packages``) onward, standard-library files from ``lib``; anything
+    else is reduced to its file name.  Pseudo-files such as ``~`` or
+    ``<frozen ...>`` are returned unchanged.
+    """
+    if not filename or filename.startswith(("<", "~")):
+        return filename
+    parts = PurePath(filename.replace("\\", "/")).parts
+    for anchor in _PATH_ANCHORS:
+        if anchor in parts:
+            index = len(parts) - 1 - parts[::-1].index(anchor)
+            return "/".join(parts[index:])
+    match = _STDLIB_RE.search(filename)
+    if match:
+        return "stdlib/" + filename[match.end() :].replace("\\", "/")
+    return parts[-1] if parts else filename
+
+
+def _sanitize_stats(stats: pstats.Stats) -> None:
+    def _key(key: _FuncKey) -> _FuncKey:
+        return (sanitize_code_path(key[0]), key[1], key[2])
+
+    raw = stats.stats  # type: ignore[attr-defined]
+    sanitized = {}
+    for key, (cc, nc, tt, ct, callers) in raw.items():
+        sanitized[_key(key)] = (cc, nc, tt, ct, {_key(c): v for c, v in callers.items()})
+    stats.stats = sanitized  # type: ignore[attr-defined]
+    stats.files = []  # type: ignore[attr-defined]
+
+
+class _Session:
+    def __init__(self, request: ProfileRequest) -> None:
+        self.request = request
+        self.remaining = request.cycles
+        self.started_at = datetime.now()
+        self.owns_tracemalloc = False
+        self.baseline: tracemalloc.Snapshot | None = None
+        if request.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                self.owns_tracemalloc = True
+            self.baseline = tracemalloc.take_snapshot()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def finish(self, output_dir: Path) -> list[Path]:
+        self.profile.disable()
+        completed = self.request.cycles - self.remaining
+        stamp = self.started_at.strftime("%Y%m%d-%H%M%S")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written: list[Path] = []
+
+        stats = pstats.Stats(self.profile)
+        _sanitize_stats(stats)
+        pstats_path = output_dir / f"profile-{stamp}.pstats"
+        stats.dump_stats(pstats_path)
+        written.append(pstats_path)
+
+        buffer = io.StringIO()
+        buffer.write(f"Z7_SentinelTray profile: {completed} scan cycle(s) from {stamp}\n")
+        stats.stream = buffer  # type: ignore[attr-defined]
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_TOP_FUNCTIONS)
+        buffer.write("\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(_TOP_FUNCTIONS)
+        report_path = output_dir / f"profile-{stamp}.txt"
+        report_path.write_text(buffer.getvalue(), encoding="utf-8")
+        written.append(report_path)
+
+        if self.baseline is not None:
+            written.append(self._write_allocations(output_dir / f"profile-{stamp}-alloc.txt"))
+        return written
+
+    def _write_allocations(self, path: Path) -> Path:
+        current = tracemalloc.take_snapshot()
+        if self.owns_tracemalloc:
+            tracemalloc.stop()
+        # Leave out the capture machinery itself so the report shows the app.
+        snapshot_filters = [
+            tracemalloc.Filter(False, module_file)
+            for module_file in (__file__, tracemalloc.__file__, pstats.__file__, cProfile.__file__)
+        ]
+        snapshot_filters.append(tracemalloc.Filter(False, "<frozen importlib._bootstrap>"))
+        current = current.filter_traces(snapshot_filters)
+        baseline = self.baseline.filter_traces(snapshot_filters) if self.baseline else current
+
+        def _site(stat: tracemalloc.Statistic | tracemalloc.StatisticDiff) -> str:
+            frame = stat.traceback[0]
+            return f"{sanitize_code_path(frame.filename)}:{frame.lineno}"
+
+        lines = ["Top allocation growth during capture:"]
+        for diff in current.compare_to(baseline, "lineno")[:_TOP_ALLOCATIONS]:
+            lines.append(
+                f"  {_site(diff)}: {diff.size_diff / 1024:+.1f} KiB "
+                f"({diff.count_diff:+d} blocks, now {diff.size / 1024:.1f} KiB)"
+            )
+        lines.append("")
+        lines.append("Top live allocations at end of capture:")
+        for stat in current.statistics("lineno")[:_TOP_ALLOCATIONS]:
+            lines.append(f"  {_site(stat)}: {stat.size / 1024:.1f} KiB ({stat.count} blocks)")
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+
+class ScanProfiler:
+    """Profile the next N notifier scan cycles on request.
+
+    UI threads call :meth:`request`; the notifier thread calls
+    :meth:`before_cycle` and :meth:`after_cycle` around each loop iteration,
+    so ``cProfile`` observes exactly that thread.  While idle the hooks only
+    read two attributes, so normal operation pays no profiling cost.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._pending: ProfileRequest | None = None
+        self._session: _Session | None = None
+        self.last_reports: list[Path] = []
+
+    @property
+    def busy(self) -> bool:
+        """Return ``True`` while a capture is pending or running."""
+        return self._pending is not None or self._session is not None
+
+    def request(self, cycles: int = DEFAULT_PROFILE_CYCLES, *, memory: bool = False) -> None:
+        """Ask the notifier thread to profile the next *cycles* scan cycles."""
+        request = ProfileRequest(cycles=max(1, min(cycles, _MAX_PROFILE_CYCLES)), memory=memory)
+        with self._lock:
+            self._pending = request
+        LOGGER.info(
+            "Profile capture requested: %s cycle(s), memory=%s",
+            request.cycles,
+            request.memory,
+            extra={"category": "perf"},
+        )
+
+    def request_from_env(self) -> bool:
+        """Queue a capture from ``Z7_SENTINELTRAY_PROFILE``; return ``True`` if queued."""
+        request = parse_profile_env(os.environ.get(PROFILE_ENV_VAR))
+        if request is None:
+            return False
+        self.request(request.cycles, memory=request.memory)
+        return True
+
+    def before_cycle(self) -> None:
+        """Start a pending capture (notifier thread only)."""
+        if self._pending is None or self._session is not None:
+            return
+        # Only this thread clears ``_pending``, so it is still set here.
+        with self._lock:
+            request, self._pending = self._pending, None
+        try:
+            self._session = _Session(request)
+        except Exception:
+            # Another profiler (e.g. a debugger) may already be active.
+            LOGGER.exception("Failed to start profile capture", extra={"category": "perf"})
+
+    def after_cycle(self, output_dir: Path) -> list[Path]:
+        """Count a finished cycle; write reports to *output_dir* when the capture ends."""
+        session = self._session
+        if session is None:
+            return []
+        session.remaining -= 1
+        if session.remaining > 0:
+            return []
+        return self.finish(output_dir)
+
+    def finish(self, output_dir: Path) -> list[Path]:
+        """Stop a running capture early and write its reports."""
+        session = self._session
+        if session is None:
+            return []
+        self._session = None
+        try:
+            written = session.finish(output_dir)
+        except Exception:
+            LOGGER.exception("Failed to write profile reports", extra={"category": "perf"})
+            return []
+        self.last_reports = written
+        LOGGER.info(
+            "Profile reports written: %s",
+            ", ".join(path.name for path in written),
+            extra={"category": "perf"},
+        )
+        return written
+
+
+_PROFILER = ScanProfiler()
+
+
+def get_profiler() -> ScanProfiler:
+    """Return the process-wide :class:`ScanProfiler`."""
+    return _PROFILER
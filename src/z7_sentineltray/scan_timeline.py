@@ -0,0 +1,217 @@
+"""Fixed-size history of the most recent scans of one monitor.
+
+:class:`ScanTimeline` keeps the last *capacity* scans in parallel
+:mod:`array` columns (a timestamp, a duration, an element count, a result
+code and a match count per slot), so the history of a monitor costs a few
+bytes per scan however long the process runs, and recording a scan
+overwrites the oldest slot without allocating.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+
+# Result codes stored per scan.
+RESULT_OK = 0  # window read, nothing matched
+RESULT_MATCH = 1
+RESULT_ERROR = 2
+RESULT_UNAVAILABLE = 3  # target window not found or not ready
+RESULT_SKIPPED = 4  # circuit breaker open
+
+DEFAULT_CAPACITY = 60
+
+_FAILED_RESULTS = (RESULT_ERROR, RESULT_UNAVAILABLE)
+_DRAWN_RESULTS = (RESULT_OK, RESULT_MATCH)
+_MAX_MATCHED = 0xFFFF
+_MAX_ELEMENTS = 0xFFFFFFFF
+_SPARK_LEVELS = "▁▂▃▄▅▆▇█"
+_SPARK_LEVELS_ASCII = "_.-~=+*#"
+
+
+@dataclass(frozen=True, slots=True)
+class ScanRecord:
+    """One scan as stored in a :class:`ScanTimeline`.
+
+    Attributes:
+        timestamp: Wall-clock start of the scan (seconds since the epoch).
+        duration_ms: Time spent reading and matching the window.
+        elements: UI elements walked in the target window.
+        result: One of the ``RESULT_*`` codes.
+        matched: Texts that matched the phrase regex.
+    """
+
+    timestamp: float
+    duration_ms: float
+    elements: int
+    result: int
+    matched: int
+
+
+@dataclass(frozen=True)
+class TimelineStats:
+    """Summary of the scans held by a :class:`ScanTimeline`.
+
+    Durations only cover scans that ran (skipped scans are excluded).
+    """
+
+    count: int
+    avg_ms: float
+    p95_ms: float
+    max_ms: float
+    failures: int
+    matches: int
+    skipped: int
+    last_result: int | None
+
+    @property
+    def failure_rate(self) -> float:
+        """Return the fraction of scans that failed (0.0 when empty)."""
+        return self.failures / self.count if self.count else 0.0
+
+
+class ScanTimeline:
+    """Ring buffer of the last *capacity* scans of a monitor.
+
+    Not thread-safe: :class:`~z7_sentineltray.status.StatusStore` records
+    under its lock and publishes :meth:`copy` results, which readers must
+    treat as read-only.
+    """
+
+    __slots__ = (
+        "_capacity",
+        "_count",
+        "_durations",
+        "_elements",
+        "_matched",
+        "_next",
+        "_results",
+        "_timestamps",
+    )
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self._capacity = max(1, int(capacity))
+        self._next = 0
+        self._count = 0
+        self._timestamps = array("d", [0.0]) * self._capacity
+        self._durations = array("f", [0.0]) * self._capacity
+        self._elements = array("L", [0]) * self._capacity
+        self._results = array("B", [0]) * self._capacity
+        self._matched = array("H", [0]) * self._capacity
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of scans kept."""
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(
+        self,
+        timestamp: float,
+        duration_ms: float,
+        *,
+        elements: int = 0,
+        result: int = RESULT_OK,
+        matched: int = 0,
+    ) -> None:
+        """Store one scan, overwriting the oldest once the buffer is full."""
+        slot = self._next
+        self._timestamps[slot] = timestamp
+        self._durations[slot] = max(0.0, duration_ms)
+        self._elements[slot] = min(max(0, elements), _MAX_ELEMENTS)
+        self._results[slot] = result
+        self._matched[slot] = min(max(0, matched), _MAX_MATCHED)
+        self._next = (slot + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+
+    def copy(self) -> ScanTimeline:
+        """Return an independent copy (one buffer copy per column)."""
+        clone = ScanTimeline.__new__(ScanTimeline)
+        clone._capacity = self._capacity
+        clone._next = self._next
+        clone._count = self._count
+        clone._timestamps = self._timestamps[:]
+        clone._durations = self._durations[:]
+        clone._elements = self._elements[:]
+        clone._results = self._results[:]
+        clone._matched = self._matched[:]
+        return clone
+
+    def resized(self, capacity: int) -> ScanTimeline:
+        """Return a copy holding at most *capacity* of the newest scans."""
+        timeline = ScanTimeline(capacity)
+        for item in self.records()[-timeline.capacity :]:
+            timeline.record(
+                item.timestamp,
+                item.duration_ms,
+                elements=item.elements,
+                result=item.result,
+                matched=item.matched,
+            )
+        return timeline
+
+    def _slots(self) -> range:
+        start = (self._next - self._count) % self._capacity
+        return range(start, start + self._count)
+
+    def records(self) -> list[ScanRecord]:
+        """Return the stored scans, oldest first."""
+        capacity = self._capacity
+        return [
+            ScanRecord(
+                timestamp=self._timestamps[slot % capacity],
+                duration_ms=self._durations[slot % capacity],
+                elements=self._elements[slot % capacity],
+                result=self._results[slot % capacity],
+                matched=self._matched[slot % capacity],
+            )
+            for slot in self._slots()
+        ]
+
+    def stats(self) -> TimelineStats:
+        """Summarise the stored scans."""
+        capacity = self._capacity
+        results = [self._results[slot % capacity] for slot in self._slots()]
+        durations = sorted(
+            self._durations[slot % capacity]
+            for slot, result in zip(self._slots(), results, strict=True)
+            if result != RESULT_SKIPPED
+        )
+        p95 = durations[max(0, math.ceil(0.95 * len(durations)) - 1)] if durations else 0.0
+        return TimelineStats(
+            count=len(results),
+            avg_ms=sum(durations) / len(durations) if durations else 0.0,
+            p95_ms=p95,
+            max_ms=durations[-1] if durations else 0.0,
+            failures=sum(1 for result in results if result in _FAILED_RESULTS),
+            matches=sum(1 for result in results if result == RESULT_MATCH),
+            skipped=results.count(RESULT_SKIPPED),
+            last_result=results[-1] if results else None,
+        )
+
+    def sparkline(self, width: int = 0, *, ascii_only: bool = False) -> str:
+        """Render the newest *width* scans (all if 0) as one character each.
+
+        Bar height is the duration relative to the slowest successful scan
+        shown; failed scans are drawn as ``x`` and skipped ones as a space.
+        """
+        levels = _SPARK_LEVELS_ASCII if ascii_only else _SPARK_LEVELS
+        records = self.records()
+        if width > 0:
+            records = records[-width:]
+        slowest = max(
+            (item.duration_ms for item in records if item.result in _DRAWN_RESULTS), default=0.0
+        )
+        chars: list[str] = []
+        for item in records:
+            if item.result in _FAILED_RESULTS:
+                chars.append("x")
+            elif item.result == RESULT_SKIPPED:
+                chars.append(" ")
+            else:
+                level = round(item.duration_ms / slowest * (len(levels) - 1)) if slowest else 0
+                chars.append(levels[level])
+        return "".join(chars)
@@ -0,0 +1,116 @@
+"""Pluggable storage for secrets kept next to the config (SMTP passwords).
+
+Config loading reads secrets through :func:`get_secret_store` instead of
+calling the DPAPI helpers directly.  The default store decrypts with DPAPI
+and keeps each decrypted value in process memory, keyed by the file's
+modification time and size, so reloading an unchanged config does not
+call ``CryptUnprotectData`` again.  Decrypted values are never written
+back to disk.  Tests (and non-Windows hosts) swap in another store with
+:func:`set_secret_store`.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Protocol
+
+from .dpapi_utils import load_secret, save_secret
+
+_StatSignature = tuple[int, int]
+
+
+class SecretStore(Protocol):
+    """Read and write one secret per file path."""
+
+    def load(self, path: Path) -> str | None:
+        """Return the secret stored at *path*, or ``None`` if there is none."""
+        ...
+
+    def save(self, path: Path, value: str) -> None:
+        """Store *value* at *path*, replacing any previous secret."""
+        ...
+
+
+class DpapiSecretStore:
+    """Secrets encrypted with the Windows DPAPI for the current user."""
+
+    def load(self, path: Path) -> str | None:
+        """Decrypt the secret at *path* (see :func:`~.dpapi_utils.load_secret`)."""
+        return load_secret(path)
+
+    def save(self, path: Path, value: str) -> None:
+        """Encrypt and write *value* (see :func:`~.dpapi_utils.save_secret`)."""
+        save_secret(path, value)
+
+
+class CachingSecretStore:
+    """Memoise :meth:`load` results of *inner* while the file is unchanged.
+
+    A cached value is reused as long as the file's ``(mtime_ns, size)``
+    matches the one seen when it was decrypted; a missing file is never
+    cached.  Thread-safe.
+    """
+
+    def __init__(self, inner: SecretStore) -> None:
+        self._inner = inner
+        self._lock = threading.Lock()
+        self._values: dict[Path, tuple[_StatSignature, str | None]] = {}
+
+    def load(self, path: Path) -> str | None:
+        """Return the secret at *path*, decrypting only if the file changed."""
+        signature = _stat_signature(path)
+        if signature is None:
+            with self._lock:
+                self._values.pop(path, None)
+            return None
+        with self._lock:
+            cached = self._values.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        value = self._inner.load(path)
+        with self._lock:
+            self._values[path] = (signature, value)
+        return value
+
+    def save(self, path: Path, value: str) -> None:
+        """Write through to *inner* and forget the cached value for *path*."""
+        with self._lock:
+            self._values.pop(path, None)
+        self._inner.save(path, value)
+
+    def clear(self) -> None:
+        """Drop every cached secret."""
+        with self._lock:
+            self._values.clear()
+
+
+def _stat_signature(path: Path) -> _StatSignature | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+_SECRET_STORE: SecretStore = CachingSecretStore(DpapiSecretStore())
+
+
+def get_secret_store() -> SecretStore:
+    """Return the process-wide secret store."""
+    return _SECRET_STORE
+
+
+def set_secret_store(store: SecretStore) -> SecretStore:
+    """Install *store* as the process-wide secret store and return the previous one.
+
+    Configs cached by :func:`~z7_sentineltray.config.load_config` hold
+    secrets read from the previous store, so that cache is cleared.
+    """
+    from .config import clear_config_cache
+
+    global _SECRET_STORE
+    previous = _SECRET_STORE
+    _SECRET_STORE = store
+    clear_config_cache()
+    return previous
@@ -0,0 +1,175 @@
+"""Per-endpoint SMTP circuit breaker shared by every monitor that uses the same server."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from threading import Lock
+
+LOGGER = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class SmtpCircuitOpenError(RuntimeError):
+    """Raised when a live SMTP send is skipped because the endpoint circuit is open."""
+
+
+class SmtpCircuitBreaker:
+    """Closed/open/half-open breaker guarding live sends to one SMTP endpoint.
+
+    The breaker opens after *failure_threshold* consecutive failed sends.
+    While open, :meth:`allow_request` returns ``False`` so callers can queue
+    the message without blocking on connection timeouts and retries.  Once
+    *open_seconds* have elapsed a single half-open probe is allowed; its
+    outcome either closes the circuit or re-opens it for another interval.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        *,
+        failure_threshold: int,
+        open_seconds: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._endpoint = endpoint
+        self._failure_threshold = max(1, failure_threshold)
+        self._open_seconds = max(0, open_seconds)
+        self._clock = clock
+        self._lock = Lock()
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+
+    @property
+    def endpoint(self) -> str:
+        """Return the ``host:port`` label this breaker guards."""
+        return self._endpoint
+
+    @property
+    def state(self) -> str:
+        """Return the current state (``closed``, ``open`` or ``half_open``)."""
+        with self._lock:
+            return self._state
+
+    def configure(self, *, failure_threshold: int, open_seconds: int) -> None:
+        """Update thresholds in place (used when the configuration is reloaded)."""
+        with self._lock:
+            self._failure_threshold = max(1, failure_threshold)
+            self._open_seconds = max(0, open_seconds)
+
+    def allow_request(self) -> bool:
+        """Return ``True`` if a live send may be attempted right now."""
+        now = self._clock()
+        with self._lock:
+            if self._state == CIRCUIT_CLOSED:
+                return True
+            if self._state == CIRCUIT_OPEN:
+                if now - self._opened_at < self._open_seconds:
+                    return False
+                self._state = CIRCUIT_HALF_OPEN
+                self._probe_started_at = now
+                LOGGER.info(
+                    "SMTP circuit half-open for %s; probing",
+                    self._endpoint,
+                    extra={"category": "send"},
+                )
+                return True
+            # Half-open: only one probe per interval.  A probe that never
+            # reported back (e.g. its thread died) must not wedge the breaker.
+            if now - self._probe_started_at >= self._open_seconds:
+                self._probe_started_at = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a send that reached the server; closes the circuit."""
+        with self._lock:
+            if self._state != CIRCUIT_CLOSED:
+                LOGGER.info(
+                    "SMTP circuit closed for %s",
+                    self._endpoint,
+                    extra={"category": "send"},
+                )
+            self._state = CIRCUIT_CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed send; opens the circuit once the threshold is reached."""
+        now = self._clock()
+        with self._lock:
+            self._failures += 1
+            if self._state == CIRCUIT_HALF_OPEN or self._failures >= self._failure_threshold:
+                if self._state != CIRCUIT_OPEN:
+                    LOGGER.warning(
+                        "SMTP circuit open for %s (%ss)",
+                        self._endpoint,
+                        self._open_seconds,
+                        extra={"category": "send"},
+                    )
+                self._state = CIRCUIT_OPEN
+                self._opened_at = now
+
+    def trip(self) -> None:
+        """Open the circuit immediately (e.g. after a failed reachability probe)."""
+        now = self._clock()
+        with self._lock:
+            if self._state != CIRCUIT_OPEN:
+                LOGGER.warning(
+                    "SMTP circuit open for %s (%ss)",
+                    self._endpoint,
+                    self._open_seconds,
+                    extra={"category": "send"},
+                )
+            self._state = CIRCUIT_OPEN
+            self._failures = max(self._failures, self._failure_threshold)
+            self._opened_at = now
+
+    def seconds_until_probe(self) -> float:
+        """Return how long until the next half-open probe is allowed (0 when closed)."""
+        with self._lock:
+            if self._state != CIRCUIT_OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._open_seconds - self._clock())
+
+
+_BREAKERS: dict[tuple[str, int], SmtpCircuitBreaker] = {}
+_BREAKERS_LOCK = Lock()
+
+
+def get_smtp_circuit_breaker(
+    host: str,
+    port: int,
+    *,
+    failure_threshold: int,
+    open_seconds: int,
+) -> SmtpCircuitBreaker:
+    """Return the process-wide breaker for ``host:port``, creating it on first use.
+
+    Host names are compared case-insensitively so monitors that spell the
+    same server differently still share one breaker.
+    """
+    key = (host.strip().lower(), int(port))
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(key)
+        if breaker is None:
+            breaker = SmtpCircuitBreaker(
+                f"{key[0]}:{key[1]}",
+                failure_threshold=failure_threshold,
+                open_seconds=open_seconds,
+            )
+            _BREAKERS[key] = breaker
+        else:
+            breaker.configure(failure_threshold=failure_threshold, open_seconds=open_seconds)
+        return breaker
+
+
+def reset_smtp_circuit_breakers() -> None:
+    """Forget every registered breaker (all endpoints start closed again)."""
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
@@ -0,0 +1,234 @@
+"""Shared SMTP endpoint registry: deduplication, cached name resolution, and health probes."""
+
+from __future__ import annotations
+
+import logging
+import socket
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+from .config import EmailConfig
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RESOLVE_TTL_SECONDS = 300
+_MAX_PROBE_WORKERS = 8
+
+_AddrInfo = tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class SmtpEndpoint:
+    """A normalised ``host:port`` pair identifying one SMTP server."""
+
+    host: str
+    port: int
+
+    @classmethod
+    def from_email_config(cls, config: EmailConfig) -> SmtpEndpoint:
+        """Build the endpoint targeted by *config*."""
+        return cls(host=config.smtp_host.strip().lower(), port=int(config.smtp_port))
+
+    @property
+    def label(self) -> str:
+        """Return the ``host:port`` label used in logs."""
+        return f"{self.host}:{self.port}"
+
+
+@dataclass(frozen=True)
+class EndpointProbeResult:
+    """Outcome of a single TCP reachability probe."""
+
+    endpoint: SmtpEndpoint
+    healthy: bool
+    error: str
+    elapsed_seconds: float
+
+
+def unique_endpoints(configs: Iterable[EmailConfig]) -> list[SmtpEndpoint]:
+    """Return the distinct endpoints referenced by *configs*, in first-seen order.
+
+    Configs without a host or port are skipped.
+    """
+    seen: dict[SmtpEndpoint, None] = {}
+    for config in configs:
+        if not config.smtp_host or not config.smtp_port:
+            continue
+        seen.setdefault(SmtpEndpoint.from_email_config(config), None)
+    return list(seen)
+
+
+class SmtpEndpointRegistry:
+    """Process-wide cache of SMTP endpoint addresses and last known health.
+
+    Resolved addresses are kept for *resolve_ttl_seconds* so repeated
+    connections to the same server skip name resolution.  A failed
+    connection to every cached address invalidates the entry so the next
+    attempt resolves again.
+    """
+
+    def __init__(
+        self,
+        *,
+        resolve_ttl_seconds: int = DEFAULT_RESOLVE_TTL_SECONDS,
+        resolver: Callable[..., list[_AddrInfo]] = socket.getaddrinfo,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._resolve_ttl_seconds = max(0, resolve_ttl_seconds)
+        self._resolver = resolver
+        self._clock = clock
+        self._lock = Lock()
+        self._addresses: dict[SmtpEndpoint, tuple[float, list[_AddrInfo]]] = {}
+        self._health: dict[SmtpEndpoint, EndpointProbeResult] = {}
+
+    def resolve(self, host: str, port: int) -> list[_AddrInfo]:
+        """Return ``getaddrinfo`` results for ``host:port``, served from cache when fresh."""
+        endpoint = SmtpEndpoint(host=host.strip().lower(), port=int(port))
+        now = self._clock()
+        with self._lock:
+            cached = self._addresses.get(endpoint)
+            if cached is not None and now - cached[0] < self._resolve_ttl_seconds:
+                return cached[1]
+        infos = self._resolver(host, port, 0, socket.SOCK_STREAM)
+        with self._lock:
+            self._addresses[endpoint] = (now, list(infos))
+        return list(infos)
+
+    def invalidate(self, host: str, port: int) -> None:
+        """Drop the cached addresses for ``host:port``."""
+        endpoint = SmtpEndpoint(host=host.strip().lower(), port=int(port))
+        with self._lock:
+            self._addresses.pop(endpoint, None)
+
+    def create_connection(
+        self,
+        host: str,
+        port: int,
+        timeout: float,
+        source_address: tuple[str, int] | None = None,
+    ) -> socket.socket:
+        """Open a TCP connection to ``host:port`` using cached addresses.
+
+        Mirrors :func:`socket.create_connection` but without resolving the
+        name on every call.
+
+        Raises:
+            OSError: If no cached or freshly resolved address accepts the connection.
+        """
+        last_exc: OSError | None = None
+        for family, socktype, proto, _canonname, sockaddr in self.resolve(host, port):
+            sock = socket.socket(family, socktype, proto)
+            try:
+                if timeout is not None:
+                    sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                sock.connect(sockaddr)
+            except OSError as exc:
+                last_exc = exc
+                sock.close()
+                continue
+            return sock
+        self.invalidate(host, port)
+        if last_exc is not None:
+            raise last_exc
+        raise OSError(f"getaddrinfo returned no addresses for {host}:{port}")
+
+    def probe(self, endpoint: SmtpEndpoint, *, timeout: float) -> EndpointProbeResult:
+        """Open and close one TCP connection to *endpoint* and record the outcome."""
+        started = time.perf_counter()
+        try:
+            with self.create_connection(endpoint.host, endpoint.port, timeout):
+                pass
+        except OSError as exc:
+            result = EndpointProbeResult(
+                endpoint=endpoint,
+                healthy=False,
+                error=str(exc),
+                elapsed_seconds=time.perf_counter() - started,
+            )
+        else:
+            result = EndpointProbeResult(
+                endpoint=endpoint,
+                healthy=True,
+                error="",
+                elapsed_seconds=time.perf_counter() - started,
+            )
+        self.record_health(result)
+        return result
+
+    def probe_all(
+        self,
+        endpoints: Iterable[SmtpEndpoint],
+        *,
+        timeout: float,
+        deadline_seconds: float,
+    ) -> list[EndpointProbeResult]:
+        """Probe *endpoints* concurrently; endpoints not done by the deadline count as unhealthy.
+
+        Args:
+            endpoints: Endpoints to probe (duplicates are probed once).
+            timeout: Per-connection timeout in seconds.
+            deadline_seconds: Upper bound for the whole batch.
+
+        Returns:
+            One result per distinct endpoint, in input order.
+        """
+        unique = list(dict.fromkeys(endpoints))
+        if not unique:
+            return []
+        executor = ThreadPoolExecutor(
+            max_workers=min(_MAX_PROBE_WORKERS, len(unique)),
+            thread_name_prefix="smtp-probe",
+        )
+        try:
+            futures = {
+                endpoint: executor.submit(self.probe, endpoint, timeout=timeout)
+                for endpoint in unique
+            }
+            wait(futures.values(), timeout=max(0.0, deadline_seconds))
+        finally:
+            # Never block on stragglers; they finish (and record health) in the background.
+            executor.shutdown(wait=False, cancel_futures=True)
+        results: list[EndpointProbeResult] = []
+        for endpoint, future in futures.items():
+            if future.done() and not future.cancelled():
+                results.append(future.result())
+                continue
+            result = EndpointProbeResult(
+                endpoint=endpoint,
+                healthy=False,
+                error="probe deadline exceeded",
+                elapsed_seconds=deadline_seconds,
+            )
+            self.record_health(result)
+            results.append(result)
+        return results
+
+    def record_health(self, result: EndpointProbeResult) -> None:
+        """Store *result* as the latest known health of its endpoint."""
+        with self._lock:
+            self._health[result.endpoint] = result
+
+    def last_health(self, endpoint: SmtpEndpoint) -> EndpointProbeResult | None:
+        """Return the latest probe result for *endpoint*, if any."""
+        with self._lock:
+            return self._health.get(endpoint)
+
+    def clear(self) -> None:
+        """Forget all cached addresses and health results."""
+        with self._lock:
+            self._addresses.clear()
+            self._health.clear()
+
+
+_REGISTRY = SmtpEndpointRegistry()
+
+
+def get_smtp_endpoint_registry() -> SmtpEndpointRegistry:
+    """Return the process-wide :class:`SmtpEndpointRegistry`."""
+    return _REGISTRY
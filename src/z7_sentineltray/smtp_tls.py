@@ -0,0 +1,135 @@
+"""Process-wide STARTTLS contexts per SMTP endpoint with TLS session resumption."""
+
+from __future__ import annotations
+
+import logging
+import socket
+import ssl
+from threading import Lock
+
+from .config import EmailConfig
+
+LOGGER = logging.getLogger(__name__)
+
+_TLS_VERSIONS: dict[str, ssl.TLSVersion] = {
+    "TLSv1.2": ssl.TLSVersion.TLSv1_2,
+    "TLSv1.3": ssl.TLSVersion.TLSv1_3,
+}
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """Client ``SSLContext`` that offers the last session it negotiated for resumption.
+
+    ``smtplib.SMTP.starttls`` calls :meth:`wrap_socket` without a session, so
+    the override injects the cached one.  Sessions are only usable with the
+    context that created them, which is why contexts are cached per endpoint.
+    """
+
+    _session: ssl.SSLSession | None
+    _session_lock: Lock
+
+    def __new__(
+        cls, protocol: int = ssl.PROTOCOL_TLS_CLIENT, *args: object, **kwargs: object
+    ) -> ResumingSSLContext:
+        """Create the context with an empty session slot."""
+        context = super().__new__(cls, protocol, *args, **kwargs)
+        context._session = None
+        context._session_lock = Lock()
+        return context
+
+    def wrap_socket(
+        self,
+        sock: socket.socket,
+        server_side: bool = False,
+        do_handshake_on_connect: bool = True,
+        suppress_ragged_eofs: bool = True,
+        server_hostname: str | bytes | None = None,
+        session: ssl.SSLSession | None = None,
+    ) -> ssl.SSLSocket:
+        """Wrap *sock*, offering the cached session when the caller gave none."""
+        if session is None and not server_side:
+            with self._session_lock:
+                session = self._session
+        return super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session,
+        )
+
+    def remember_session(self, sock: object) -> None:
+        """Keep the session of *sock* for the next connection.
+
+        Call this after at least one server reply has been read over TLS: with
+        TLS 1.3 the resumption ticket arrives after the handshake, so a session
+        taken right after ``starttls`` would not be resumable.
+        """
+        if not isinstance(sock, ssl.SSLSocket):
+            return
+        session = sock.session
+        if session is None:
+            return
+        if sock.version() == "TLSv1.3" and not session.has_ticket:
+            return
+        with self._session_lock:
+            self._session = session
+
+    def forget_session(self) -> None:
+        """Drop the cached session so the next connection does a full handshake."""
+        with self._session_lock:
+            self._session = None
+
+
+def build_smtp_tls_context(config: EmailConfig) -> ResumingSSLContext:
+    """Build a STARTTLS client context from the TLS settings in *config*.
+
+    Without ``tls_verify`` the context matches ``smtplib``'s default (no
+    certificate or hostname check); with it, the system CA store is loaded
+    once and both checks are enforced.
+    """
+    context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    if config.tls_verify:
+        context.load_default_certs()
+    else:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if config.tls_min_version:
+        context.minimum_version = _TLS_VERSIONS[config.tls_min_version]
+    if config.tls_ciphers:
+        context.set_ciphers(config.tls_ciphers)
+    return context
+
+
+_CONTEXTS: dict[tuple[str, int, bool, str, str], ResumingSSLContext] = {}
+_CONTEXTS_LOCK = Lock()
+
+
+def get_smtp_tls_context(config: EmailConfig) -> ResumingSSLContext:
+    """Return the process-wide STARTTLS context for the endpoint and TLS settings in *config*."""
+    key = (
+        config.smtp_host.strip().lower(),
+        int(config.smtp_port),
+        bool(config.tls_verify),
+        config.tls_min_version,
+        config.tls_ciphers,
+    )
+    with _CONTEXTS_LOCK:
+        context = _CONTEXTS.get(key)
+        if context is None:
+            context = build_smtp_tls_context(config)
+            _CONTEXTS[key] = context
+            LOGGER.debug(
+                "SMTP TLS context created for %s:%s",
+                key[0],
+                key[1],
+                extra={"category": "send"},
+            )
+        return context
+
+
+def reset_smtp_tls_contexts() -> None:
+    """Forget every cached context and session."""
+    with _CONTEXTS_LOCK:
+        _CONTEXTS.clear()
@@ -2,16 +2,36 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime, timedelta
-from threading import Lock
+from threading import Condition, Lock
+from typing import Any
+
+from .events import (
+    EVENT_ERROR,
+    EVENT_MATCH,
+    EVENT_QUEUE_CHANGED,
+    EVENT_SEND,
+    EVENT_STATUS_CHANGED,
+    AppEvent,
+    EventBus,
+)
+from .scan_timeline import DEFAULT_CAPACITY, RESULT_OK, ScanTimeline
+
+LOGGER = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
 class StatusSnapshot:
     """Immutable point-in-time snapshot of application status.
 
-    All fields are read-only; a new snapshot is created for each read.
+    Snapshots are shared between readers: treat the dict fields and the
+    :class:`~z7_sentineltray.scan_timeline.ScanTimeline` values of
+    ``scan_timelines`` (keyed like ``monitor_failures``) as read-only.
+    ``version`` increases by one with every change, so two snapshots with
+    the same version hold the same values.
     """
 
     running: bool
@@ -29,128 +49,340 @@ class StatusSnapshot:
     monitor_failures: dict[str, int]
     monitor_breakers_active: dict[str, bool]
     breaker_active_count: int
+    metrics: dict[str, Any] = field(default_factory=dict)
+    memory_rss_bytes: int = 0
+    memory_warning: str = ""
+    scan_timelines: dict[str, ScanTimeline] = field(default_factory=dict)
+    config_error: str = ""
+    version: int = 0
+
+
+# Maintained by the store itself; see set_monitor_state() and record_scan().
+_DERIVED_FIELDS = frozenset(
+    {
+        "version",
+        "breaker_active_count",
+        "monitor_failures",
+        "monitor_breakers_active",
+        "scan_timelines",
+    }
+)
+_UPDATABLE_FIELDS = frozenset(item.name for item in fields(StatusSnapshot)) - _DERIVED_FIELDS
+
+StatusSubscriber = Callable[[StatusSnapshot], None]
+
+# Event published when a field changes; unlisted fields publish
+# EVENT_STATUS_CHANGED and fields mapped to None publish nothing.
+_EVENT_BY_FIELD: dict[str, str | None] = {
+    "last_match": EVENT_MATCH,
+    "last_match_at": EVENT_MATCH,
+    "last_send": EVENT_SEND,
+    "last_error": EVENT_ERROR,
+    "error_count": EVENT_ERROR,
+    "config_error": EVENT_ERROR,
+    "email_queue": EVENT_QUEUE_CHANGED,
+    # Refreshed on every loop iteration and not displayed as such.
+    "uptime_seconds": None,
+    "metrics": None,
+}
+
+
+def _publish_events(bus: EventBus, changes: dict[str, Any], version: int) -> None:
+    by_kind: dict[str, set[str]] = {}
+    for name in changes:
+        kind = _EVENT_BY_FIELD.get(name, EVENT_STATUS_CHANGED)
+        if kind is not None:
+            by_kind.setdefault(kind, set()).add(name)
+    for kind, names in by_kind.items():
+        bus.publish(AppEvent(kind, fields=frozenset(names), version=version))
 
 
 class StatusStore:
     """Thread-safe container for live application state.
 
-    All setter methods acquire an internal :class:`~threading.Lock` so
-    they are safe to call from any thread.  Call :meth:`snapshot` to
-    obtain an immutable :class:`StatusSnapshot` copy.
+    Writers build a new :class:`StatusSnapshot` under an internal lock and
+    publish it by swapping a single reference, so :meth:`snapshot` never
+    takes the lock and never copies.  A write that changes nothing keeps
+    the current snapshot and its ``version``; use :meth:`update` to change
+    several fields in one step, :meth:`wait_for_change` to block until the
+    version moves past a known value, and :meth:`subscribe` to be called
+    with each new snapshot.  With an *event_bus*, every change is also
+    published as :class:`~z7_sentineltray.events.AppEvent` objects naming
+    the changed fields.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, event_bus: EventBus | None = None) -> None:
+        self._event_bus = event_bus
         self._lock = Lock()
-        self._running = False
-        self._last_scan = ""
-        self._last_scan_result = ""
-        self._last_match = ""
-        self._last_match_at = ""
-        self._last_send = ""
-        self._last_error = ""
-        self._last_healthcheck = ""
-        self._uptime_seconds = 0
-        self._started_at: datetime | None = None
-        self._error_count = 0
-        self._email_queue = {
-            "queued": 0,
-            "sent": 0,
-            "failed": 0,
-            "deferred": 0,
-            "oldest_age_seconds": 0,
-        }
-        self._monitor_failures: dict[str, int] = {}
-        self._monitor_breakers_active: dict[str, bool] = {}
+        self._changed = Condition(self._lock)
+        self._subscribers: list[StatusSubscriber] = []
+        # Live ring buffers, only touched under the lock; snapshots get copies.
+        self._timelines: dict[str, ScanTimeline] = {}
+        self._timeline_size = DEFAULT_CAPACITY
+        self._snapshot = StatusSnapshot(
+            running=False,
+            last_scan="",
+            last_scan_result="",
+            last_match="",
+            last_match_at="",
+            last_send="",
+            last_error="",
+            last_healthcheck="",
+            uptime_seconds=0,
+            started_at=None,
+            error_count=0,
+            email_queue={
+                "queued": 0,
+                "sent": 0,
+                "failed": 0,
+                "deferred": 0,
+                "oldest_age_seconds": 0,
+            },
+            monitor_failures={},
+            monitor_breakers_active={},
+            breaker_active_count=0,
+        )
+
+    def _apply(self, build: Callable[[StatusSnapshot], dict[str, Any]]) -> None:
+        with self._lock:
+            current = self._snapshot
+            changes = {
+                name: value
+                for name, value in build(current).items()
+                if getattr(current, name) != value
+            }
+            if not changes:
+                return
+            snapshot = replace(current, version=current.version + 1, **changes)
+            self._snapshot = snapshot
+            self._changed.notify_all()
+            subscribers = tuple(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception:
+                LOGGER.exception("Status subscriber failed", extra={"category": "status"})
+        if self._event_bus is not None:
+            _publish_events(self._event_bus, changes, snapshot.version)
+
+    def update(self, **values: object) -> None:
+        """Change several fields at once, publishing a single new version.
+
+        Raises:
+            TypeError: If a name is not an updatable :class:`StatusSnapshot` field.
+        """
+        unknown = sorted(set(values) - _UPDATABLE_FIELDS)
+        if unknown:
+            raise TypeError(f"unknown status field(s): {', '.join(unknown)}")
+        for name in ("email_queue", "metrics"):
+            value = values.get(name)
+            if isinstance(value, dict):
+                values[name] = dict(value)
+        self._apply(lambda _current: values)
 
     def set_running(self, value: bool) -> None:
         """Set the *running* flag."""
-        with self._lock:
-            self._running = value
+        self.update(running=value)
 
     def set_last_scan(self, value: str) -> None:
         """Record the ISO timestamp of the most recent scan."""
-        with self._lock:
-            self._last_scan = value
+        self.update(last_scan=value)
 
     def set_last_scan_result(self, value: str) -> None:
         """Record a brief description of the last scan outcome."""
-        with self._lock:
-            self._last_scan_result = value
+        self.update(last_scan_result=value)
 
     def set_last_match(self, value: str) -> None:
         """Record the most recently detected match text (sanitised)."""
-        with self._lock:
-            self._last_match = value
+        self.update(last_match=value)
 
     def set_last_match_at(self, value: str) -> None:
         """Record the ISO timestamp of the last match."""
-        with self._lock:
-            self._last_match_at = value
+        self.update(last_match_at=value)
 
     def set_last_send(self, value: str) -> None:
         """Record the ISO timestamp of the last successful e-mail send."""
-        with self._lock:
-            self._last_send = value
+        self.update(last_send=value)
 
     def set_last_error(self, value: str) -> None:
         """Record the most recent error message (sanitised)."""
-        with self._lock:
-            self._last_error = value
+        self.update(last_error=value)
+
+    def set_config_error(self, value: str) -> None:
+        """Record why the config file on disk was rejected (empty once a valid one applies)."""
+        self.update(config_error=value)
 
     def set_last_healthcheck(self, value: str) -> None:
         """Record the ISO timestamp of the last health-check message."""
-        with self._lock:
-            self._last_healthcheck = value
+        self.update(last_healthcheck=value)
 
     def set_uptime_seconds(self, value: int) -> None:
         """Update the cumulative uptime counter in seconds."""
-        with self._lock:
-            self._uptime_seconds = value
+        self.update(uptime_seconds=value)
 
     def set_started_at(self, value: datetime | None) -> None:
         """Record the process start timestamp."""
-        with self._lock:
-            self._started_at = value
+        self.update(started_at=value)
 
     def increment_error_count(self) -> None:
         """Atomically increment the total error counter by one."""
-        with self._lock:
-            self._error_count += 1
+        self._apply(lambda current: {"error_count": current.error_count + 1})
 
     def set_email_queue_stats(self, value: dict[str, int]) -> None:
         """Update the e-mail queue statistics dict."""
-        with self._lock:
-            self._email_queue = dict(value)
+        self.update(email_queue=value)
 
     def set_monitor_state(self, key: str, *, failure_count: int, breaker_active: bool) -> None:
         """Update failure count and circuit-breaker state for a named monitor."""
-        with self._lock:
-            self._monitor_failures[key] = max(0, int(failure_count))
-            self._monitor_breakers_active[key] = bool(breaker_active)
+        failures = max(0, int(failure_count))
+        active = bool(breaker_active)
+
+        def build(current: StatusSnapshot) -> dict[str, Any]:
+            if (
+                current.monitor_failures.get(key) == failures
+                and current.monitor_breakers_active.get(key) == active
+            ):
+                return {}
+            breakers = {**current.monitor_breakers_active, key: active}
+            return {
+                "monitor_failures": {**current.monitor_failures, key: failures},
+                "monitor_breakers_active": breakers,
+                "breaker_active_count": sum(1 for item in breakers.values() if item),
+            }
+
+        self._apply(build)
+
+    def remove_monitors(self, keys: Iterable[str]) -> None:
+        """Forget the failure, breaker and timeline state of monitors *keys*."""
+        dropped = set(keys)
+
+        def build(current: StatusSnapshot) -> dict[str, Any]:
+            for key in dropped:
+                self._timelines.pop(key, None)
+            known = (
+                set(current.monitor_failures)
+                | set(current.monitor_breakers_active)
+                | set(current.scan_timelines)
+            )
+            if not dropped & known:
+                return {}
+            breakers = {
+                key: active
+                for key, active in current.monitor_breakers_active.items()
+                if key not in dropped
+            }
+            return {
+                "monitor_failures": {
+                    key: failures
+                    for key, failures in current.monitor_failures.items()
+                    if key not in dropped
+                },
+                "monitor_breakers_active": breakers,
+                "breaker_active_count": sum(1 for item in breakers.values() if item),
+                "scan_timelines": {
+                    key: timeline
+                    for key, timeline in current.scan_timelines.items()
+                    if key not in dropped
+                },
+            }
+
+        self._apply(build)
+
+    def record_scan(
+        self,
+        key: str,
+        *,
+        timestamp: float,
+        duration_ms: float,
+        elements: int = 0,
+        result: int = RESULT_OK,
+        matched: int = 0,
+    ) -> None:
+        """Append one scan of monitor *key* to its timeline.
+
+        Args:
+            key: Monitor key, as used by :meth:`set_monitor_state`.
+            timestamp: Wall-clock start of the scan (seconds since the epoch).
+            duration_ms: Scan duration in milliseconds.
+            elements: UI elements walked in the target window.
+            result: One of the ``scan_timeline.RESULT_*`` codes.
+            matched: Texts that matched the phrase regex.
+        """
+
+        def build(current: StatusSnapshot) -> dict[str, Any]:
+            timeline = self._timelines.get(key)
+            if timeline is None:
+                timeline = self._timelines[key] = ScanTimeline(self._timeline_size)
+            timeline.record(
+                timestamp, duration_ms, elements=elements, result=result, matched=matched
+            )
+            return {"scan_timelines": {**current.scan_timelines, key: timeline.copy()}}
+
+        self._apply(build)
+
+    def set_scan_timeline_size(self, size: int) -> None:
+        """Keep the last *size* scans per monitor, trimming existing timelines."""
+        size = max(1, int(size))
+
+        def build(current: StatusSnapshot) -> dict[str, Any]:
+            if size == self._timeline_size:
+                return {}
+            self._timeline_size = size
+            self._timelines = {
+                key: timeline.resized(size) for key, timeline in self._timelines.items()
+            }
+            return {
+                "scan_timelines": {
+                    key: timeline.copy() for key, timeline in self._timelines.items()
+                }
+            }
+
+        self._apply(build)
+
+    def set_metrics(self, value: dict[str, Any]) -> None:
+        """Store the latest metrics registry snapshot."""
+        self.update(metrics=value)
+
+    def set_memory(self, rss_bytes: int, warning: str) -> None:
+        """Record the latest memory watchdog sample and growth warning (empty if healthy)."""
+        self.update(memory_rss_bytes=max(0, int(rss_bytes)), memory_warning=warning)
+
+    @property
+    def version(self) -> int:
+        """Return the version of the current snapshot."""
+        return self._snapshot.version
 
     def snapshot(self) -> StatusSnapshot:
-        """Return an immutable copy of the current application status."""
+        """Return the current immutable snapshot (lock-free)."""
+        return self._snapshot
+
+    def wait_for_change(self, version: int, timeout: float | None = None) -> StatusSnapshot:
+        """Block until the status version is greater than *version*.
+
+        Returns:
+            The current snapshot; its ``version`` is still ``<= version`` if
+            *timeout* seconds passed without a change.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._snapshot.version > version, timeout)
+            return self._snapshot
+
+    def subscribe(self, callback: StatusSubscriber) -> Callable[[], None]:
+        """Call *callback* with every new snapshot; return an unsubscribe function.
+
+        Callbacks run on the writer's thread after the lock is released, so
+        concurrent writers may deliver snapshots out of order: compare
+        ``version`` before acting on one.
+        """
         with self._lock:
-            breaker_active_count = sum(
-                1 for active in self._monitor_breakers_active.values() if active
-            )
-            return StatusSnapshot(
-                running=self._running,
-                last_scan=self._last_scan,
-                last_scan_result=self._last_scan_result,
-                last_match=self._last_match,
-                last_match_at=self._last_match_at,
-                last_send=self._last_send,
-                last_error=self._last_error,
-                last_healthcheck=self._last_healthcheck,
-                uptime_seconds=self._uptime_seconds,
-                started_at=self._started_at,
-                error_count=self._error_count,
-                email_queue=dict(self._email_queue),
-                monitor_failures=dict(self._monitor_failures),
-                monitor_breakers_active=dict(self._monitor_breakers_active),
-                breaker_active_count=breaker_active_count,
-            )
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
 
 
 def _format_timestamp(value: str) -> str:
@@ -193,12 +425,46 @@ def _format_failure_summary(failures: dict[str, int]) -> str:
     return ", ".join(summary_parts)
 
 
+def format_memory(snapshot: StatusSnapshot) -> str:
+    """Format the memory watchdog reading of *snapshot* for display."""
+    if not snapshot.memory_rss_bytes and not snapshot.memory_warning:
+        return "—"
+    rss = f"{snapshot.memory_rss_bytes / (1024 * 1024):.0f} MB"
+    if snapshot.memory_warning:
+        return f"{rss} - crescimento: {snapshot.memory_warning}"
+    return rss
+
+
+def format_scan_timeline(timeline: ScanTimeline, *, ascii_only: bool = False) -> str:
+    """Summarise *timeline* as a sparkline followed by duration and outcome stats.
+
+    Args:
+        timeline: Scan history of one monitor.
+        ascii_only: Draw the sparkline with ASCII characters (for e-mail).
+    """
+    stats = timeline.stats()
+    if not stats.count:
+        return "-" if ascii_only else "—"
+    parts = [
+        f"{stats.count} varreduras",
+        f"média {stats.avg_ms:.0f} ms",
+        f"p95 {stats.p95_ms:.0f} ms",
+        f"máx {stats.max_ms:.0f} ms",
+        f"falhas {stats.failures} ({stats.failure_rate:.0%})",
+        f"com detecção {stats.matches}",
+    ]
+    if stats.skipped:
+        parts.append(f"puladas {stats.skipped}")
+    return f"{timeline.sparkline(ascii_only=ascii_only)} ({'; '.join(parts)})"
+
+
 def format_status(
     snapshot: StatusSnapshot,
     *,
     window_title_regex: str = "",
     phrase_regex: str = "",
     poll_interval_seconds: int | None = None,
+    monitor_key: str = "",
 ) -> str:
     """Format a human-readable status summary from *snapshot*.
 
@@ -207,6 +473,7 @@ def format_status(
         window_title_regex: The configured window-title regex (for display).
         phrase_regex: The configured phrase regex (for display).
         poll_interval_seconds: Poll interval used to compute the next check time.
+        monitor_key: Key of the monitor whose scan timeline is appended, if any.
 
     Returns:
         Multi-line Portuguese status string suitable for the console/GUI display.
@@ -233,7 +500,13 @@ def format_status(
         f"E-mails pendentes na fila: {snapshot.email_queue.get('queued', 0)}",
         f"Disjuntores ativos: {snapshot.breaker_active_count}",
         f"Falhas nos monitores: {failure_summary}",
+        f"Memória: {format_memory(snapshot)}",
         f"Tempo ativo (segundos): {snapshot.uptime_seconds}",
         f"Total de erros: {snapshot.error_count}",
     ]
+    if snapshot.config_error:
+        lines.append(f"Configuração rejeitada: {snapshot.config_error}")
+    timeline = snapshot.scan_timelines.get(monitor_key) if monitor_key else None
+    if timeline is not None:
+        lines.append(f"Histórico de varreduras: {format_scan_timeline(timeline, ascii_only=True)}")
     return "\n".join(lines)
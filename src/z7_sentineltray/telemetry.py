@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import json
+import time
+from collections.abc import Callable, Hashable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -16,9 +18,11 @@ class JsonWriter:
 
     Attributes:
         path: Destination file that will be overwritten on each :meth:`write`.
+        fsync: Flush each write to stable storage before the rename.
     """
 
     path: Path
+    fsync: bool = True
 
     def write(self, payload: dict[str, Any]) -> None:
         """Serialise *payload* to JSON and atomically write it to :attr:`path`.
@@ -27,15 +31,84 @@ class JsonWriter:
             payload: Mapping to serialise.
         """
         payload_json = json.dumps(payload, ensure_ascii=True, indent=2)
-        atomic_write_text(self.path, payload_json, encoding="utf-8")
+        atomic_write_text(self.path, payload_json, encoding="utf-8", fsync=self.fsync)
 
 
-def atomic_write_text(path: Path, content: str, *, encoding: str = "utf-8") -> None:
+class TelemetryWriter:
+    """Change-aware telemetry file writer.
+
+    Callers pass a payload builder plus a *fingerprint* of the material
+    fields (everything except values that tick on their own, such as
+    ``updated_at`` or uptime).  The payload is only built and written when the
+    fingerprint differs from the last written one, or when
+    *max_staleness_seconds* have passed since the last write so readers can
+    still tell the process is alive.  ``max_staleness_seconds=0`` writes on
+    every call.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_staleness_seconds: int = 60,
+        fsync: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._writer = JsonWriter(path, fsync=fsync)
+        self._max_staleness_seconds = max(0, max_staleness_seconds)
+        self._clock = clock
+        self._last_fingerprint: Hashable | None = None
+        self._last_write_at: float | None = None
+        self.writes = 0
+        self.skipped = 0
+
+    @property
+    def path(self) -> Path:
+        """Return the telemetry file path."""
+        return self._writer.path
+
+    def is_due(self, fingerprint: Hashable) -> bool:
+        """Return ``True`` if a payload with *fingerprint* should be written now."""
+        if self._last_write_at is None or fingerprint != self._last_fingerprint:
+            return True
+        return self._clock() - self._last_write_at >= self._max_staleness_seconds
+
+    def update(self, build_payload: Callable[[], dict[str, Any]], *, fingerprint: Hashable) -> bool:
+        """Write the payload from *build_payload* if it changed materially or went stale.
+
+        The payload is only built when a write is due.
+
+        Returns:
+            ``True`` if the file was written.
+
+        Raises:
+            OSError: If the write fails; the fingerprint is not recorded so
+                the next call retries.
+        """
+        if not self.is_due(fingerprint):
+            self.skipped += 1
+            return False
+        self._writer.write(build_payload())
+        self._last_fingerprint = fingerprint
+        self._last_write_at = self._clock()
+        self.writes += 1
+        return True
+
+    def invalidate(self) -> None:
+        """Force the next :meth:`update` to write."""
+        self._last_fingerprint = None
+        self._last_write_at = None
+
+
+def atomic_write_text(
+    path: Path, content: str, *, encoding: str = "utf-8", fsync: bool = True
+) -> None:
     """Re-export :func:`io_utils.atomic_write_text` for backward compatibility.
 
     Args:
         path: Destination file path.
         content: Text content to write.
         encoding: Character encoding (default ``utf-8``).
+        fsync: Flush to stable storage before the rename (default ``True``).
     """
-    _atomic_write_text(path, content, encoding=encoding)
+    _atomic_write_text(path, content, encoding=encoding, fsync=fsync)
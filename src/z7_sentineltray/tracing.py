@@ -0,0 +1,315 @@
+"""Sampled per-scan trace spans buffered in memory and flushed to a rotating JSONL file.
+
+Run ``python -m z7_sentineltray.tracing <trace.jsonl>`` for a flame-style
+summary of a trace file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """One timed phase of a trace.
+
+    Attributes:
+        trace_id: Identifier shared by every span of the trace (the scan id).
+        span_id: Identifier unique within the process.
+        parent_id: ``span_id`` of the enclosing span, ``None`` for the root.
+        name: Phase name, e.g. ``"walk"``.
+        start: Monotonic start time in seconds.
+        end: Monotonic end time in seconds.
+        attrs: Extra JSON-serialisable attributes.
+    """
+
+    trace_id: str
+    span_id: int
+    parent_id: int | None
+    name: str
+    start: float
+    end: float = 0.0
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    def to_record(self) -> dict[str, Any]:
+        """Return the JSONL record for this span."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "end": round(self.end, 6),
+            "duration_ms": round((self.end - self.start) * 1000, 3),
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """Sampling tracer with batched, size-rotated JSONL output.
+
+    Each :meth:`trace` is sampled with probability *sample_rate*; spans of
+    unsampled traces are never created, so with a low rate the always-on
+    cost is a thread-local lookup per phase.  Finished spans are buffered and
+    appended to *path* once *batch_size* spans are pending or
+    *flush_interval_seconds* have passed since the last flush.  When the file
+    would grow past *max_bytes* it is rotated to ``.1`` … ``.backup_count``.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        sample_rate: float = 0.0,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 30.0,
+        max_bytes: int = 5_000_000,
+        backup_count: int = 3,
+        clock: Callable[[], float] = time.perf_counter,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self._buffer: list[Span] = []
+        self._clock = clock
+        self._rng = rng
+        self._batch_size = max(1, batch_size)
+        self._flush_interval_seconds = flush_interval_seconds
+        self._last_flush = clock()
+        self.path = path
+        self.configure(
+            path, sample_rate=sample_rate, max_bytes=max_bytes, backup_count=backup_count
+        )
+
+    def configure(
+        self,
+        path: Path | None,
+        *,
+        sample_rate: float,
+        max_bytes: int = 5_000_000,
+        backup_count: int = 3,
+    ) -> None:
+        """Flush pending spans, then switch output file and sampling settings."""
+        self.flush()
+        self.path = path
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.max_bytes = max(1024, max_bytes)
+        self.backup_count = max(0, backup_count)
+
+    @property
+    def enabled(self) -> bool:
+        """Return ``True`` if traces can be sampled."""
+        return self.path is not None and self.sample_rate > 0
+
+    def _stack(self) -> list[Span] | None:
+        return getattr(self._local, "stack", None)
+
+    @property
+    def active(self) -> bool:
+        """Return ``True`` inside a sampled trace on the current thread."""
+        return bool(self._stack())
+
+    @contextmanager
+    def trace(self, trace_id: str, name: str = "scan", **attrs: Any) -> Iterator[Span | None]:  # noqa: ANN401
+        """Open a root span for *trace_id* if this trace is sampled.
+
+        Yields:
+            The root span, or ``None`` when the trace is not sampled.
+        """
+        if not self.enabled or self._stack() is not None or self._rng() >= self.sample_rate:
+            yield None
+            return
+        root = Span(trace_id, next(self._ids), None, name, self._clock(), attrs=dict(attrs))
+        self._local.stack = [root]
+        try:
+            yield root
+        finally:
+            root.end = self._clock()
+            self._local.stack = None
+            self._finish(root)
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Span | None]:  # noqa: ANN401
+        """Time the ``with`` block as a child of the current span.
+
+        Yields:
+            The span, or ``None`` outside a sampled trace.
+        """
+        stack = self._stack()
+        if not stack:
+            yield None
+            return
+        parent = stack[-1]
+        span = Span(
+            parent.trace_id, next(self._ids), parent.span_id, name, self._clock(), attrs=dict(attrs)
+        )
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = self._clock()
+            stack.pop()
+            self._finish(span)
+
+    def record(self, name: str, start: float, **attrs: Any) -> None:  # noqa: ANN401
+        """Record a child span that started at *start* (tracer clock) and ends now."""
+        stack = self._stack()
+        if not stack:
+            return
+        parent = stack[-1]
+        span = Span(parent.trace_id, next(self._ids), parent.span_id, name, start, attrs=attrs)
+        span.end = self._clock()
+        self._finish(span)
+
+    def annotate(self, **attrs: Any) -> None:  # noqa: ANN401
+        """Add *attrs* to the innermost open span, if any."""
+        stack = self._stack()
+        if stack:
+            stack[-1].attrs.update(attrs)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._buffer.append(span)
+            due = len(self._buffer) >= self._batch_size or (
+                span.parent_id is None
+                and self._clock() - self._last_flush >= self._flush_interval_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append buffered spans to the trace file."""
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+            self._last_flush = self._clock()
+            path = self.path
+            if not spans or path is None:
+                return
+            data = "".join(
+                json.dumps(span.to_record(), ensure_ascii=True, separators=(",", ":")) + "\n"
+                for span in spans
+            )
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._rotate_if_needed(path, len(data))
+                with path.open("a", encoding="utf-8") as handle:
+                    handle.write(data)
+            except OSError:
+                LOGGER.warning("Trace flush failed", exc_info=True, extra={"category": "perf"})
+
+    def _rotate_if_needed(self, path: Path, incoming: int) -> None:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+        if self.backup_count == 0:
+            path.unlink()
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = path.with_name(f"{path.name}.{index}")
+            if source.exists():
+                source.replace(path.with_name(f"{path.name}.{index + 1}"))
+        path.replace(path.with_name(f"{path.name}.1"))
+
+
+_TRACER = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide :class:`Tracer` (disabled until configured)."""
+    return _TRACER
+
+
+def load_spans(path: Path) -> list[dict[str, Any]]:
+    """Read span records from a JSONL trace file, skipping malformed lines."""
+    spans: list[dict[str, Any]] = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and "span_id" in record:
+                spans.append(record)
+    return spans
+
+
+def summarize(spans: Iterable[dict[str, Any]], *, width: int = 30) -> str:
+    """Render a flame-style text tree of span durations aggregated by call path.
+
+    Each line shows the call path depth, span name, occurrence count, total
+    and mean duration, share of the root total and a proportional bar.
+    """
+    records = list(spans)
+    by_id = {(record["trace_id"], record["span_id"]): record for record in records}
+    totals: dict[tuple[str, ...], list[float]] = {}
+    for record in records:
+        path: list[str] = []
+        current: dict[str, Any] | None = record
+        while current is not None:
+            path.append(str(current["name"]))
+            parent_id = current.get("parent_id")
+            current = by_id.get((record["trace_id"], parent_id)) if parent_id else None
+        entry = totals.setdefault(tuple(reversed(path)), [0, 0.0])
+        entry[0] += 1
+        entry[1] += float(record.get("duration_ms", 0.0))
+    if not totals:
+        return "no spans\n"
+    root_total = sum(value[1] for key, value in totals.items() if len(key) == 1) or 1.0
+    traces = len({record["trace_id"] for record in records})
+    lines = [f"{traces} trace(s), {len(records)} span(s)"]
+
+    def _walk(prefix: tuple[str, ...]) -> None:
+        children = [key for key in totals if len(key) == len(prefix) + 1 and key[:-1] == prefix]
+        for key in sorted(children, key=lambda item: totals[item][1], reverse=True):
+            count, total_ms = totals[key]
+            share = total_ms / root_total
+            bar = "#" * max(1, round(share * width)) if total_ms else ""
+            label = "  " * (len(key) - 1) + key[-1]
+            lines.append(
+                f"{label:<28} {int(count):>6}x {total_ms:>11.1f}ms "
+                f"{total_ms / count:>9.2f}ms avg {share:>7.1%} {bar}"
+            )
+            _walk(key)
+
+    _walk(())
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Print a flame-style summary of one or more trace files."""
+    parser = argparse.ArgumentParser(
+        prog="python -m z7_sentineltray.tracing",
+        description="Summarise Z7_SentinelTray JSONL trace files.",
+    )
+    parser.add_argument("files", nargs="+", type=Path, help="trace file(s), e.g. logs/trace.jsonl")
+    parser.add_argument("--width", type=int, default=30, help="bar width for 100%% (default 30)")
+    args = parser.parse_args(argv)
+    spans: list[dict[str, Any]] = []
+    for path in args.files:
+        try:
+            spans.extend(load_spans(path))
+        except OSError as exc:
+            parser.error(f"cannot read {path}: {exc}")
+    print(summarize(spans, width=args.width), end="")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -150,7 +150,8 @@ class TrayIcon:
     When *on_open_status* is provided the icon runs in GUI mode:
     the console is kept hidden and the tray menu offers "Open Status"
     as the default (left-click / double-click) action instead of the
-    legacy console-toggle.
+    legacy console-toggle.  *on_capture_profile* adds a menu entry that
+    requests a profiler capture of the next scan cycles.
     """
 
     def __init__(
@@ -158,9 +159,11 @@ class TrayIcon:
         *,
         on_exit_requested: Callable[[], None],
         on_open_status: Callable[[], None] | None = None,
+        on_capture_profile: Callable[[], None] | None = None,
     ) -> None:
         self._on_exit_requested = on_exit_requested
         self._on_open_status = on_open_status
+        self._on_capture_profile = on_capture_profile
         self._icon: pystray.Icon | None = None
         self._thread: threading.Thread | None = None
         self._console_visible = on_open_status is None  # hidden in GUI mode
@@ -182,6 +185,13 @@ class TrayIcon:
         if self._on_open_status is not None:
             self._on_open_status()
 
+    def _capture_profile(self, icon: pystray.Icon, item: pystray.MenuItem) -> None:
+        if self._on_capture_profile is not None:
+            self._on_capture_profile()
+
+    def _profile_menu_visible(self, item: pystray.MenuItem) -> bool:
+        return self._on_capture_profile is not None
+
     def _on_exit(self, icon: pystray.Icon, item: pystray.MenuItem) -> None:
         # Null _icon immediately so _check_exit / watchdog won't attempt a second stop.
         # The actual icon.stop() is dispatched to a daemon thread to avoid blocking
@@ -210,6 +220,11 @@ class TrayIcon:
                     self._open_status,
                     default=True,
                 ),
+                pystray.MenuItem(
+                    "Capturar perfil de desempenho",
+                    self._capture_profile,
+                    visible=self._profile_menu_visible,
+                ),
                 pystray.Menu.SEPARATOR,
                 pystray.MenuItem("Sair", self._on_exit),
             )
@@ -218,6 +233,11 @@ class TrayIcon:
             self._console_visible = True
             menu = pystray.Menu(
                 pystray.MenuItem(self._console_menu_label, self._toggle_console),
+                pystray.MenuItem(
+                    "Capturar perfil de desempenho",
+                    self._capture_profile,
+                    visible=self._profile_menu_visible,
+                ),
                 pystray.MenuItem("Sair", self._on_exit),
             )
 
@@ -3,6 +3,21 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def compile_regex(value: str, flags: int = 0) -> re.Pattern[str]:
+    """Compile *value* once per process and return the shared pattern.
+
+    Config validation and the window detectors compile the same monitor
+    regexes on every load and reload; going through this cache hands them
+    the same :class:`re.Pattern` object.
+
+    Raises:
+        re.error: If *value* is not a valid regular expression.
+    """
+    return re.compile(value, flags)
 
 
 def validate_regex(label: str, value: str) -> None:
@@ -16,7 +31,7 @@ def validate_regex(label: str, value: str) -> None:
         ValueError: If *value* is not a valid regular expression.
     """
     try:
-        re.compile(value)
+        compile_regex(value)
     except re.error as exc:
         raise ValueError(f"{label} invalid regex: {exc}") from exc
 
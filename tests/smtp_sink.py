@@ -0,0 +1,228 @@
+"""Local asyncio SMTP sink for end-to-end delivery tests and benchmarks.
+
+The sink speaks just enough ESMTP for ``smtplib``: EHLO/HELO, optional
+STARTTLS, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA, RSET, NOOP and QUIT.  Faults
+are configured through :class:`SinkBehavior` and may be changed while the
+sink is running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SinkBehavior:
+    """Fault injection knobs for :class:`SmtpSink`.
+
+    Attributes:
+        latency_seconds: Delay applied before every reply.
+        mail_reply: ``(code, text)`` returned to ``MAIL FROM`` instead of 250,
+            e.g. ``(451, "Try again later")`` or ``(550, "Rejected")``.
+        mail_failures: How many transactions get *mail_reply* before the sink
+            accepts mail again; ``None`` means every transaction.
+        auth_fail: Reject every AUTH with 535.
+        drop_connections: Number of upcoming connections to close right after
+            the greeting, simulating a relay that resets connections.
+    """
+
+    latency_seconds: float = 0.0
+    mail_reply: tuple[int, str] | None = None
+    mail_failures: int | None = None
+    auth_fail: bool = False
+    drop_connections: int = 0
+
+
+@dataclass
+class SinkMessage:
+    """One message accepted by the sink."""
+
+    mail_from: str
+    rcpt_to: list[str]
+    data: bytes
+    received_at: float = field(default_factory=time.perf_counter)
+
+
+class SmtpSink:
+    """Background-thread asyncio SMTP server bound to ``127.0.0.1``.
+
+    Use as a context manager::
+
+        with SmtpSink() as sink:
+            send_to("127.0.0.1", sink.port)
+            assert sink.messages
+    """
+
+    def __init__(
+        self,
+        behavior: SinkBehavior | None = None,
+        *,
+        tls_context: ssl.SSLContext | None = None,
+    ) -> None:
+        self.behavior = behavior or SinkBehavior()
+        self.tls_context = tls_context
+        self.messages: list[SinkMessage] = []
+        self.connections = 0
+        self.port = 0
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.Server | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    def __enter__(self) -> SmtpSink:
+        self.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    @property
+    def message_count(self) -> int:
+        """Return the number of accepted messages."""
+        with self._lock:
+            return len(self.messages)
+
+    def update(self, **changes: object) -> None:
+        """Change :class:`SinkBehavior` fields while the sink is running."""
+        with self._lock:
+            for name, value in changes.items():
+                if not hasattr(self.behavior, name):
+                    raise AttributeError(f"unknown sink behavior: {name}")
+                setattr(self.behavior, name, value)
+
+    def start(self) -> None:
+        """Start the server thread and wait until it is listening."""
+        self._thread = threading.Thread(target=self._run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(10):
+            raise RuntimeError("SMTP sink did not start")
+
+    def stop(self) -> None:
+        """Stop the server and join its thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(10)
+        self._loop = None
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        self._server = loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+    def _take_mail_failure(self) -> tuple[int, str] | None:
+        with self._lock:
+            behavior = self.behavior
+            if behavior.mail_reply is None:
+                return None
+            if behavior.mail_failures is None:
+                return behavior.mail_reply
+            if behavior.mail_failures <= 0:
+                return None
+            behavior.mail_failures -= 1
+            return behavior.mail_reply
+
+    def _take_drop(self) -> bool:
+        with self._lock:
+            self.connections += 1
+            if self.behavior.drop_connections > 0:
+                self.behavior.drop_connections -= 1
+                return True
+            return False
+
+    async def _handle(  # noqa: C901
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        async def reply(*lines: str) -> None:
+            if self.behavior.latency_seconds:
+                await asyncio.sleep(self.behavior.latency_seconds)
+            writer.write("".join(f"{line}\r\n" for line in lines).encode("ascii"))
+            await writer.drain()
+
+        try:
+            await reply("220 localhost ESMTP sink")
+            if self._take_drop():
+                return
+            tls_active = False
+            mail_from = ""
+            rcpt_to: list[str] = []
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    return
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                verb, _, arg = line.partition(" ")
+                verb = verb.upper()
+                if verb == "EHLO":
+                    features = ["250-localhost", "250-8BITMIME", "250-AUTH PLAIN LOGIN"]
+                    if self.tls_context is not None and not tls_active:
+                        features.append("250-STARTTLS")
+                    features.append("250 SMTPUTF8")
+                    await reply(*features)
+                elif verb == "HELO":
+                    await reply("250 localhost")
+                elif verb == "STARTTLS" and self.tls_context is not None and not tls_active:
+                    await reply("220 Ready to start TLS")
+                    await writer.start_tls(self.tls_context)
+                    tls_active = True
+                elif verb == "AUTH":
+                    mechanism, _, initial = arg.partition(" ")
+                    if mechanism.upper() == "LOGIN":
+                        await reply("334 VXNlcm5hbWU6")
+                        await reader.readline()
+                        await reply("334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                    elif not initial:
+                        await reply("334 ")
+                        await reader.readline()
+                    if self.behavior.auth_fail:
+                        await reply("535 5.7.8 Authentication credentials invalid")
+                    else:
+                        await reply("235 2.7.0 Authentication successful")
+                elif verb == "MAIL":
+                    failure = self._take_mail_failure()
+                    if failure is not None:
+                        await reply(f"{failure[0]} {failure[1]}")
+                        continue
+                    mail_from = arg
+                    rcpt_to = []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    rcpt_to.append(arg)
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    chunks: list[bytes] = []
+                    while True:
+                        data_line = await reader.readline()
+                        if not data_line or data_line == b".\r\n":
+                            break
+                        chunks.append(data_line)
+                    with self._lock:
+                        self.messages.append(SinkMessage(mail_from, rcpt_to, b"".join(chunks)))
+                    await reply("250 OK queued")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    return
+                else:
+                    await reply("250 OK")
+        except (ConnectionError, asyncio.IncompleteReadError, ssl.SSLError):
+            return
+        finally:
+            writer.close()
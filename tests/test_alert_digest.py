@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import pytest
+
+from z7_sentineltray.alert_digest import AlertDigest, format_digest
+from z7_sentineltray.app import Notifier
+from z7_sentineltray.config import AppConfig, EmailConfig, MonitorConfig
+from z7_sentineltray.detector import WindowTextDetector
+from z7_sentineltray.email_sender import EmailSender
+from z7_sentineltray.status import StatusStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSender(EmailSender):
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    def send(self, message: str) -> None:
+        self.sent.append(message)
+
+
+def _config(tmp_path, *, window_seconds: int, max_items: int = 20) -> AppConfig:
+    email = EmailConfig(
+        smtp_host="",
+        smtp_port=587,
+        smtp_username="",
+        smtp_password="",
+        from_address="",
+        to_addresses=[],
+        use_tls=True,
+        timeout_seconds=10,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    return AppConfig(
+        poll_interval_seconds=1,
+        healthcheck_interval_seconds=3600,
+        error_backoff_base_seconds=5,
+        error_backoff_max_seconds=300,
+        debounce_seconds=0,
+        max_history=50,
+        state_file=str(tmp_path / "state.json"),
+        log_file="logs/z7_sentineltray.log",
+        log_level="INFO",
+        log_console_level="WARNING",
+        log_console_enabled=True,
+        log_max_bytes=5000000,
+        log_backup_count=5,
+        log_run_files_keep=5,
+        telemetry_file=str(tmp_path / "telemetry.json"),
+        allow_window_restore=True,
+        log_only_mode=False,
+        send_repeated_matches=True,
+        min_repeat_seconds=0,
+        error_notification_cooldown_seconds=300,
+        window_error_backoff_base_seconds=5,
+        window_error_backoff_max_seconds=120,
+        window_error_circuit_threshold=3,
+        window_error_circuit_seconds=300,
+        email_queue_file=str(tmp_path / "email_queue.json"),
+        email_queue_max_items=1,
+        email_queue_max_age_seconds=0,
+        email_queue_max_attempts=0,
+        email_queue_retry_base_seconds=0,
+        monitors=[
+            MonitorConfig(
+                window_title_regex="APP",
+                phrase_regex="ALERT",
+                email=email,
+                digest_window_seconds=window_seconds,
+                digest_max_items=max_items,
+            )
+        ],
+    )
+
+
+def _notifier(config: AppConfig, clock: FakeClock) -> tuple[Notifier, FakeSender]:
+    notifier = Notifier(config=config, status=StatusStore())
+    sender = FakeSender()
+    for monitor in notifier._monitors:
+        monitor.sender = sender
+        if monitor.digest is not None:
+            monitor.digest = AlertDigest(
+                window_seconds=monitor.digest.window_seconds,
+                max_items=monitor.digest.max_items,
+                clock=clock,
+            )
+    return notifier, sender
+
+
+def test_digest_merges_repeats_and_reports_due() -> None:
+    clock = FakeClock()
+    digest = AlertDigest(window_seconds=60, max_items=3, clock=clock)
+
+    digest.add("1 ALERT", "1 ALERT")
+    digest.add("2 ALERT", "2 ALERT")
+    digest.add("2 ALERT", "2 ALERT\nVariação desde o último scan: +1")
+    assert not digest.is_due()
+    assert not digest.is_full()
+
+    clock.now += 60
+    assert digest.is_due()
+    entries = digest.drain()
+    assert [(entry.text, entry.count) for entry in entries] == [("1 ALERT", 1), ("2 ALERT", 2)]
+    assert len(digest) == 0
+
+    message = format_digest(entries, 60)
+    assert message.splitlines() == [
+        "Resumo: 3 ocorrência(s) de 2 linha(s) em 60s",
+        "- 1 ALERT",
+        "- 2 ALERT (2x)",
+        "  Variação desde o último scan: +1",
+    ]
+
+
+def test_single_match_is_sent_unchanged() -> None:
+    digest = AlertDigest(window_seconds=60, max_items=3)
+    digest.add("1 ALERT", "1 ALERT")
+
+    assert format_digest(digest.drain(), 60) == "1 ALERT"
+
+
+def test_burst_is_coalesced_until_window_elapses(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = FakeClock()
+    notifier, sender = _notifier(_config(tmp_path, window_seconds=60), clock)
+    batches = iter([["A1", "B1", "C1"], ["D1", "E1"], ["F1"]])
+
+    def _matches(_self: WindowTextDetector, _pattern: str) -> list[str]:
+        return next(batches)
+
+    monkeypatch.setattr(WindowTextDetector, "find_matches", _matches)
+
+    notifier.scan_once()
+    clock.now += 30
+    notifier.scan_once()
+    assert sender.sent == []
+
+    clock.now += 30
+    notifier.scan_once()
+    assert len(sender.sent) == 1
+    assert sender.sent[0].startswith("Resumo: 6 ocorrência(s) de 6 linha(s)")
+    assert len(notifier._history) == 6
+
+
+def test_full_digest_flushes_immediately(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = FakeClock()
+    notifier, sender = _notifier(_config(tmp_path, window_seconds=600, max_items=2), clock)
+
+    def _matches(_self: WindowTextDetector, _pattern: str) -> list[str]:
+        return ["A1", "B1", "C1"]
+
+    monkeypatch.setattr(WindowTextDetector, "find_matches", _matches)
+    notifier.scan_once()
+
+    assert len(sender.sent) == 1
+    assert "3 linha(s)" in sender.sent[0]
+
+
+def test_pending_digest_is_flushed_on_force(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = FakeClock()
+    notifier, sender = _notifier(_config(tmp_path, window_seconds=600), clock)
+
+    def _matches(_self: WindowTextDetector, _pattern: str) -> list[str]:
+        return ["A1"]
+
+    monkeypatch.setattr(WindowTextDetector, "find_matches", _matches)
+    notifier.scan_once()
+    assert sender.sent == []
+
+    assert notifier._flush_alert_digests(force=True)
+    assert sender.sent == ["A1"]
+
+
+def test_line_seen_on_several_scans_is_counted(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = FakeClock()
+    notifier, sender = _notifier(_config(tmp_path, window_seconds=60), clock)
+    # The top line of the previous scan is skipped, so A1 is listed second.
+    batches = iter([["B1", "A1"], ["C1", "A1"], ["D1", "A1"]])
+
+    def _matches(_self: WindowTextDetector, _pattern: str) -> list[str]:
+        return next(batches)
+
+    monkeypatch.setattr(WindowTextDetector, "find_matches", _matches)
+
+    notifier.scan_once()
+    clock.now += 30
+    notifier.scan_once()
+    clock.now += 30
+    notifier.scan_once()
+
+    assert len(sender.sent) == 1
+    assert sender.sent[0].splitlines() == [
+        "Resumo: 6 ocorrência(s) de 4 linha(s) em 60s",
+        "- B1",
+        "- A1 (3x)",
+        "- C1",
+        "- D1",
+    ]
+
+
+class FlakySender(EmailSender):
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.fail = True
+
+    def send(self, message: str) -> None:
+        if self.fail:
+            raise ConnectionError("smtp down")
+        self.sent.append(message)
+
+
+def test_failed_digest_is_kept_for_the_next_attempt(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clock = FakeClock()
+    notifier, _ = _notifier(_config(tmp_path, window_seconds=60), clock)
+    sender = FlakySender()
+    notifier._monitors[0].sender = sender
+    batches = iter([["A1", "B1"], ["A1", "B1"], ["A1", "B1", "C1"], []])
+
+    def _matches(_self: WindowTextDetector, _pattern: str) -> list[str]:
+        return next(batches)
+
+    monkeypatch.setattr(WindowTextDetector, "find_matches", _matches)
+
+    notifier.scan_once()
+    clock.now += 60
+    notifier.scan_once()
+    assert len(notifier._monitors[0].digest) == 2
+    assert notifier._history == []
+
+    clock.now += 1
+    sender.fail = False
+    notifier.scan_once()
+    assert len(sender.sent) == 1
+    assert sender.sent[0].startswith("Resumo: 5 ocorrência(s) de 3 linha(s)")
+    assert "- B1 (3x)" in sender.sent[0].splitlines()
+    assert [item["text"] for item in notifier._history] == ["A1", "B1", "C1"]
+
+
+def test_requeue_merges_and_bounds_pending_lines() -> None:
+    clock = FakeClock()
+    digest = AlertDigest(window_seconds=60, max_items=1, clock=clock)
+    digest.add("A", "A")
+    clock.now += 60
+    entries = digest.drain()
+    for index in range(9):
+        digest.add(f"L{index}", f"L{index}")
+    digest.add("A", "A again")
+
+    assert digest.requeue(entries, 60) == 0
+    assert digest.is_due()
+    requeued = digest.drain()
+    assert [entry.text for entry in requeued][:2] == ["A", "L0"]
+    assert (requeued[0].count, requeued[0].message) == (2, "A again")
+
+    digest.add("B", "B")
+    assert digest.requeue(requeued, 60) == 1
+    assert len(digest) == 10
+    assert "A" not in digest
+    assert "B" in digest
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.config import get_user_data_dir, load_config
+from z7_sentineltray.detector import WindowTextDetector
+from z7_sentineltray.secret_store import CachingSecretStore, set_secret_store
+from z7_sentineltray.validation_utils import compile_regex
+
+
+class PlaintextSecretStore:
+    def __init__(self) -> None:
+        self.loads: list[str] = []
+
+    def load(self, path: Path) -> str | None:
+        self.loads.append(path.name)
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8") or None
+
+    def save(self, path: Path, value: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(value, encoding="utf-8")
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> Iterator[PlaintextSecretStore]:
+    monkeypatch.delenv("Z7_SENTINELTRAY_SMTP_PASSWORD", raising=False)
+    monkeypatch.delenv("Z7_SENTINELTRAY_SMTP_PASSWORD_1", raising=False)
+    inner = PlaintextSecretStore()
+    previous = set_secret_store(CachingSecretStore(inner))
+    try:
+        yield inner
+    finally:
+        set_secret_store(previous)
+
+
+def _write_config(path: Path, *, poll_interval: int = 60) -> None:
+    path.write_text(
+        "\n".join(
+            [
+                "monitors:",
+                "  - window_title_regex: 'APP'",
+                "    phrase_regex: 'ALERT'",
+                "    email:",
+                "      smtp_host: 'smtp.local'",
+                "      smtp_port: 587",
+                "      smtp_username: 'smtp-user'",
+                "      smtp_password: ''",
+                "      from_address: 'alerts@example.com'",
+                "      to_addresses: ['ops@example.com']",
+                "      use_tls: true",
+                "      timeout_seconds: 10",
+                "      subject: 'Z7_SentinelTray Notification'",
+                "      retry_attempts: 0",
+                "      retry_backoff_seconds: 0",
+                f"poll_interval_seconds: {poll_interval}",
+                "healthcheck_interval_seconds: 60",
+                "error_backoff_base_seconds: 5",
+                "error_backoff_max_seconds: 10",
+                "debounce_seconds: 0",
+                "max_history: 10",
+                "state_file: 'state.json'",
+                "log_file: 'logs/z7_sentineltray.log'",
+                "log_level: 'INFO'",
+                "log_console_level: 'WARNING'",
+                "log_console_enabled: true",
+                "log_max_bytes: 5000000",
+                "log_backup_count: 3",
+                "log_run_files_keep: 3",
+                "telemetry_file: 'logs/telemetry.json'",
+                "allow_window_restore: true",
+                "log_only_mode: false",
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+
+def test_unchanged_inputs_return_the_cached_config(
+    store: PlaintextSecretStore, tmp_path: Path
+) -> None:
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path)
+    secret_path = get_user_data_dir() / "smtp_password_1.dpapi"
+    store.save(secret_path, "secret")
+
+    first = load_config(str(config_path))
+    copy_path = tmp_path / "copy.yaml"
+    copy_path.write_bytes(config_path.read_bytes())
+
+    second = load_config(str(config_path))
+    assert second == first
+    assert load_config(str(copy_path)) == first
+    assert first.monitors[0].email.smtp_password == "secret"
+    assert store.loads == ["smtp_password_1.dpapi"]
+
+    second.monitors.clear()
+    first.monitors[0].email.to_addresses.append("intruder@example.com")
+    third = load_config(str(config_path))
+    assert len(third.monitors) == 1
+    assert third.monitors[0].email.to_addresses == ["ops@example.com"]
+    assert store.loads == ["smtp_password_1.dpapi"]
+
+
+def test_replacing_the_secret_store_clears_the_cache(
+    store: PlaintextSecretStore, tmp_path: Path
+) -> None:
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path)
+    store.save(get_user_data_dir() / "smtp_password_1.dpapi", "secret")
+    load_config(str(config_path))
+
+    other = PlaintextSecretStore()
+    set_secret_store(other)
+    load_config(str(config_path))
+
+    assert other.loads == ["smtp_password_1.dpapi"]
+
+
+def test_edited_config_is_rebuilt_without_decrypting_again(
+    store: PlaintextSecretStore, tmp_path: Path
+) -> None:
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path)
+    secret_path = get_user_data_dir() / "smtp_password_1.dpapi"
+    store.save(secret_path, "secret")
+    first = load_config(str(config_path))
+
+    _write_config(config_path, poll_interval=120)
+    second = load_config(str(config_path))
+
+    assert second is not first
+    assert second.poll_interval_seconds == 120
+    assert second.monitors[0].email.smtp_password == "secret"
+    assert store.loads == ["smtp_password_1.dpapi"]
+
+
+def test_secret_and_env_changes_miss_the_cache(
+    store: PlaintextSecretStore, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path)
+    secret_path = get_user_data_dir() / "smtp_password_1.dpapi"
+    store.save(secret_path, "secret")
+    assert load_config(str(config_path)).monitors[0].email.smtp_password == "secret"
+
+    store.save(secret_path, "rotated-secret")
+    os.utime(secret_path, ns=(10**18, 10**18))
+    assert load_config(str(config_path)).monitors[0].email.smtp_password == "rotated-secret"
+
+    monkeypatch.setenv("Z7_SENTINELTRAY_SMTP_PASSWORD_1", "from-env")
+    assert load_config(str(config_path)).monitors[0].email.smtp_password == "from-env"
+
+
+def test_invalid_config_is_not_cached(store: PlaintextSecretStore, tmp_path: Path) -> None:
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, poll_interval=0)
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="poll_interval_seconds"):
+            load_config(str(config_path))
+
+
+def test_detector_shares_compiled_regexes() -> None:
+    detector = WindowTextDetector("Shared\\.Title")
+
+    assert detector._window_title_regex is compile_regex("Shared\\.Title")
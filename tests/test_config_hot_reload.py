@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from datetime import UTC, datetime
+from pathlib import Path
+from threading import Event
+
+import pytest
+
+from z7_sentineltray import app
+from z7_sentineltray.app import Notifier
+from z7_sentineltray.config import AppConfig, EmailConfig, MonitorConfig
+from z7_sentineltray.metrics_http import render_openmetrics
+from z7_sentineltray.status import StatusSnapshot, StatusStore
+
+
+def _email(to_address: str) -> EmailConfig:
+    return EmailConfig(
+        smtp_host="",
+        smtp_port=587,
+        smtp_username="",
+        smtp_password="",
+        from_address="",
+        to_addresses=[to_address],
+        use_tls=True,
+        timeout_seconds=10,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+
+
+def _config(tmp_path: Path, monitors: list[MonitorConfig]) -> AppConfig:
+    return AppConfig(
+        poll_interval_seconds=60,
+        healthcheck_interval_seconds=3600,
+        error_backoff_base_seconds=5,
+        error_backoff_max_seconds=300,
+        debounce_seconds=0,
+        max_history=10,
+        state_file=str(tmp_path / "state.json"),
+        log_file=str(tmp_path / "logs" / "z7_sentineltray.log"),
+        log_level="INFO",
+        log_console_level="WARNING",
+        log_console_enabled=False,
+        log_max_bytes=5000000,
+        log_backup_count=5,
+        log_run_files_keep=5,
+        telemetry_file=str(tmp_path / "telemetry.json"),
+        allow_window_restore=True,
+        log_only_mode=False,
+        send_repeated_matches=True,
+        min_repeat_seconds=0,
+        error_notification_cooldown_seconds=300,
+        window_error_backoff_base_seconds=5,
+        window_error_backoff_max_seconds=120,
+        window_error_circuit_threshold=3,
+        window_error_circuit_seconds=300,
+        email_queue_file=str(tmp_path / "email_queue.json"),
+        email_queue_max_items=1,
+        email_queue_max_age_seconds=0,
+        email_queue_max_attempts=0,
+        email_queue_retry_base_seconds=0,
+        monitors=monitors,
+    )
+
+
+_APP = MonitorConfig(window_title_regex="APP", phrase_regex="ALERT", email=_email("a@x.test"))
+_OTHER = MonitorConfig(window_title_regex="OTHER", phrase_regex="ERR", email=_email("b@x.test"))
+_NEW = MonitorConfig(window_title_regex="NEW", phrase_regex="WARN", email=_email("c@x.test"))
+
+
+def test_unchanged_monitors_keep_their_runtime_state(tmp_path: Path) -> None:
+    notifier = Notifier(config=_config(tmp_path, [_APP, _OTHER]), status=StatusStore())
+    app_runtime, other_runtime = notifier._monitors
+    app_detector, app_sender = app_runtime.detector, app_runtime.sender
+    other_detector, other_sender = other_runtime.detector, other_runtime.sender
+    app_runtime.last_sent["100 ALERT"] = datetime.now(UTC)
+    other_runtime.failure_count = 2
+
+    other_edited = replace(_OTHER, email=_email("changed@x.test"))
+    notifier.apply_config(_config(tmp_path, [other_edited, _APP, _NEW]))
+
+    kept_other, kept_app, added = notifier._monitors
+    assert kept_app is app_runtime
+    assert (kept_app.detector, kept_app.sender) == (app_detector, app_sender)
+    assert "100 ALERT" in kept_app.last_sent
+    assert kept_other is other_runtime
+    assert kept_other.detector is other_detector
+    assert kept_other.sender is not other_sender
+    assert kept_other.failure_count == 2
+    assert kept_other.config == other_edited
+    assert added.key == "NEW|WARN"
+
+    notifier.apply_config(_config(tmp_path, [_APP]))
+    assert [monitor.key for monitor in notifier._monitors] == ["APP|ALERT"]
+    assert notifier._monitors[0].detector is app_detector
+
+
+def test_queue_settings_rebuild_senders_only(tmp_path: Path) -> None:
+    config = _config(tmp_path, [_APP])
+    notifier = Notifier(config=config, status=StatusStore())
+    runtime = notifier._monitors[0]
+    detector, sender = runtime.detector, runtime.sender
+
+    notifier.apply_config(replace(config, email_queue_max_items=50))
+
+    assert runtime.detector is detector
+    assert runtime.sender is not sender
+    with pytest.raises(ValueError, match="monitors must be configured"):
+        notifier.apply_config(replace(config, monitors=[]))
+
+
+def test_running_loop_applies_config_without_restarting(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app, "get_idle_seconds", lambda: 1000.0)
+    config = _config(tmp_path, [_APP])
+    notifier = Notifier(config=config, status=StatusStore())
+    runtime = notifier._monitors[0]
+    new_config = _config(tmp_path, [_APP, _NEW])
+    stop_event = Event()
+    seen: list[list[str]] = []
+
+    def fake_scan_once() -> None:
+        seen.append([monitor.key for monitor in notifier._monitors])
+        if len(seen) == 1:
+            notifier.apply_config(new_config)
+            # Queued for the loop thread, not applied underneath the scan.
+            assert notifier.config is config
+        else:
+            stop_event.set()
+
+    notifier.scan_once = fake_scan_once  # type: ignore[assignment]
+    notifier.run_loop(stop_event)
+
+    # The loop did not wait poll_interval_seconds before the second cycle.
+    assert seen == [["APP|ALERT"], ["APP|ALERT", "NEW|WARN"]]
+    assert notifier.config is new_config
+    assert notifier._monitors[0] is runtime
+
+
+class FakeMetricsServer:
+    def __init__(self) -> None:
+        self.text = ""
+
+    def publish(self, snapshot: StatusSnapshot, labels: dict[str, str]) -> None:
+        self.text = render_openmetrics(snapshot, labels)
+
+
+def test_removed_monitor_keys_never_reach_metrics(tmp_path: Path) -> None:
+    status = StatusStore()
+    notifier = Notifier(config=_config(tmp_path, [_APP, _OTHER]), status=status)
+    for key in ("APP|ALERT", "OTHER|ERR"):
+        status.set_monitor_state(key, failure_count=1, breaker_active=True)
+        status.record_scan(key, timestamp=1.0, duration_ms=5.0)
+    server = FakeMetricsServer()
+    notifier._metrics_server = server  # type: ignore[assignment]
+
+    notifier.apply_config(_config(tmp_path, [_APP]))
+    notifier._publish_metrics()
+
+    snapshot = status.snapshot()
+    assert set(snapshot.monitor_failures) == {"APP|ALERT"}
+    assert set(snapshot.scan_timelines) == {"APP|ALERT"}
+    assert snapshot.breaker_active_count == 1
+    assert "monitor_failures{" in server.text
+    assert "OTHER" not in server.text
+    assert "APP|ALERT" not in server.text
+    assert "OTHER" not in render_openmetrics(snapshot, {})
+
+
+def test_state_file_change_loads_the_new_history(tmp_path: Path) -> None:
+    config = _config(tmp_path, [_APP])
+    notifier = Notifier(config=config, status=StatusStore())
+    notifier._history.append(
+        {"text": "100 ALERT", "sent_at": "2026-01-01T00:00:00+00:00", "monitor": "APP|ALERT"}
+    )
+    new_path = tmp_path / "other-state.json"
+    new_path.write_text(
+        json.dumps([{"text": "7 ALERT", "sent_at": "2026-01-02T00:00:00+00:00"}]),
+        encoding="utf-8",
+    )
+
+    notifier.apply_config(replace(config, state_file=str(new_path)))
+
+    assert [item["text"] for item in notifier._history] == ["7 ALERT"]
+    assert list(notifier._monitors[0].last_sent) == ["7 ALERT"]
+    old_state = json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))
+    assert [item["text"] for item in old_state] == ["100 ALERT"]
+    notifier._persist_state()
+    new_state = json.loads(new_path.read_text(encoding="utf-8"))
+    assert [item["text"] for item in new_state] == ["7 ALERT"]
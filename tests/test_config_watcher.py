@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+from z7_sentineltray.config import AppConfig
+from z7_sentineltray.config_watcher import ConfigWatcher
+from z7_sentineltray.status import StatusStore, format_status
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.loaded: list[str] = []
+        self.applied: list[str] = []
+        self.errors: list[str] = []
+
+    def load(self, path: str) -> AppConfig:
+        text = Path(path).read_text(encoding="utf-8")
+        self.loaded.append(text)
+        if "invalid" in text:
+            raise ValueError(f"poll_interval_seconds must be >= 1 in {path}")
+        return text  # type: ignore[return-value]
+
+    def apply(self, config: AppConfig) -> None:
+        self.applied.append(str(config))
+
+
+def _write(path: Path, text: str, mtime: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime * 10**9, mtime * 10**9))
+
+
+def _watcher(path: Path, recorder: Recorder, clock: FakeClock) -> ConfigWatcher:
+    return ConfigWatcher(
+        path,
+        on_change=recorder.apply,
+        on_error=recorder.errors.append,
+        debounce_seconds=2,
+        loader=recorder.load,
+        clock=clock,
+    )
+
+
+def test_successive_writes_are_debounced(tmp_path: Path) -> None:
+    path = tmp_path / "config.local.yaml"
+    _write(path, "v1", 100)
+    clock = FakeClock()
+    recorder = Recorder()
+    watcher = _watcher(path, recorder, clock)
+
+    assert watcher.poll() is False
+    _write(path, "v2 partial", 101)
+    assert watcher.poll() is False
+    clock.now = 1.5
+    _write(path, "v2 complete", 102)
+    assert watcher.poll() is False
+    clock.now = 3.0
+    assert watcher.poll() is False
+    clock.now = 3.5
+    assert watcher.poll() is True
+    assert watcher.poll() is False
+
+    assert recorder.loaded == ["v2 complete"]
+    assert recorder.applied == ["v2 complete"]
+
+
+def test_identical_and_invalid_content_keep_current_config(tmp_path: Path) -> None:
+    path = tmp_path / "config.local.yaml"
+    _write(path, "v1", 100)
+    clock = FakeClock()
+    recorder = Recorder()
+    watcher = _watcher(path, recorder, clock)
+
+    _write(path, "v1", 101)
+    watcher.poll()
+    clock.now = 5.0
+    assert watcher.poll() is False
+    assert recorder.loaded == []
+
+    _write(path, "invalid", 102)
+    watcher.poll()
+    clock.now = 10.0
+    assert watcher.poll() is False
+    assert watcher.poll() is False
+    assert len(recorder.errors) == 1
+    assert "poll_interval_seconds must be >= 1" in recorder.errors[0]
+    assert recorder.applied == []
+
+    _write(path, "v3", 103)
+    watcher.poll()
+    clock.now = 15.0
+    assert watcher.poll() is True
+    assert recorder.applied == ["v3"]
+
+
+def test_acknowledged_editor_saves_are_not_reloaded(tmp_path: Path) -> None:
+    path = tmp_path / "config.local.yaml"
+    _write(path, "v1", 100)
+    clock = FakeClock()
+    recorder = Recorder()
+    watcher = _watcher(path, recorder, clock)
+
+    _write(path, "saved by editor", 101)
+    watcher.acknowledge()
+    clock.now = 10.0
+
+    assert watcher.poll() is False
+    assert recorder.loaded == []
+
+
+def test_background_thread_applies_changes(tmp_path: Path) -> None:
+    path = tmp_path / "config.local.yaml"
+    _write(path, "v1", 100)
+    recorder = Recorder()
+    applied = threading.Event()
+
+    def on_change(config: AppConfig) -> None:
+        recorder.apply(config)
+        applied.set()
+
+    watcher = ConfigWatcher(
+        path,
+        on_change=on_change,
+        on_error=recorder.errors.append,
+        interval_seconds=0.05,
+        debounce_seconds=0,
+        loader=recorder.load,
+    )
+    watcher.start()
+    try:
+        _write(path, "v2", 101)
+        assert applied.wait(timeout=5)
+    finally:
+        watcher.stop()
+
+    assert recorder.applied == ["v2"]
+
+
+def test_status_reports_rejected_config() -> None:
+    status = StatusStore()
+    status.set_config_error("monitors must be configured")
+
+    assert "Configuração rejeitada: monitors must be configured" in format_status(status.snapshot())
+    status.set_config_error("")
+    assert "rejeitada" not in format_status(status.snapshot())
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import shutil
+import ssl
+import subprocess
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from smtp_sink import SinkBehavior, SmtpSink
+
+from z7_sentineltray.config import EmailConfig
+from z7_sentineltray.email_queue_utils import build_new_item
+from z7_sentineltray.email_sender import (
+    DiskEmailQueue,
+    EmailAuthError,
+    EmailQueued,
+    QueueingEmailSender,
+    SmtpEmailSender,
+)
+from z7_sentineltray.smtp_endpoints import get_smtp_endpoint_registry
+from z7_sentineltray.smtp_tls import get_smtp_tls_context
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry() -> None:
+    get_smtp_endpoint_registry().clear()
+
+
+def _email(port: int, **overrides) -> EmailConfig:
+    config = EmailConfig(
+        smtp_host="127.0.0.1",
+        smtp_port=port,
+        smtp_username="user",
+        smtp_password="secret",
+        from_address="alerts@example.com",
+        to_addresses=["ops@example.com"],
+        use_tls=False,
+        timeout_seconds=5,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    return replace(config, **overrides)
+
+
+def _queue(path: Path) -> DiskEmailQueue:
+    return DiskEmailQueue(
+        path,
+        max_items=20000,
+        max_age_seconds=86400,
+        max_attempts=5,
+        retry_base_seconds=0,
+    )
+
+
+def test_sender_delivers_to_sink() -> None:
+    with SmtpSink() as sink:
+        SmtpEmailSender(_email(sink.port)).send("10 ALERTAS")
+
+    assert sink.message_count == 1
+    message = sink.messages[0]
+    assert "alerts@example.com" in message.mail_from
+    assert b"10 ALERTAS" in message.data
+
+
+def test_transient_4xx_is_retried() -> None:
+    behavior = SinkBehavior(mail_reply=(451, "Try again later"), mail_failures=1)
+    with SmtpSink(behavior) as sink:
+        SmtpEmailSender(_email(sink.port, retry_attempts=1)).send("ALERT")
+
+    assert sink.message_count == 1
+    assert sink.connections == 2
+
+
+def test_auth_failure_raises_email_auth_error() -> None:
+    with SmtpSink(SinkBehavior(auth_fail=True)) as sink:
+        with pytest.raises(EmailAuthError):
+            SmtpEmailSender(_email(sink.port)).send("ALERT")
+
+    assert sink.message_count == 0
+
+
+def test_dropped_connection_is_queued_then_drained(tmp_path: Path) -> None:
+    with SmtpSink(SinkBehavior(drop_connections=1)) as sink:
+        sender = QueueingEmailSender(
+            sender=SmtpEmailSender(_email(sink.port)),
+            queue=_queue(tmp_path / "queue.json"),
+        )
+        with pytest.raises(EmailQueued):
+            sender.send("ALERT")
+        assert sink.message_count == 0
+
+        stats = sender.drain()
+
+    assert stats.sent == 1
+    assert stats.queued == 0
+    assert sink.message_count == 1
+
+
+def test_permanent_5xx_keeps_items_queued(tmp_path: Path) -> None:
+    queue = _queue(tmp_path / "queue.json")
+    queue.enqueue("first")
+    queue.enqueue("second")
+    with SmtpSink(SinkBehavior(mail_reply=(550, "Rejected"))) as sink:
+        stats = queue.drain(SmtpEmailSender(_email(sink.port)).send)
+
+    assert stats.failed == 2
+    assert stats.queued == 2
+    assert sink.message_count == 0
+
+
+def test_queue_drain_delivers_every_item(tmp_path: Path) -> None:
+    path = tmp_path / "queue.json"
+    items = [build_new_item(f"ALERT {index}", _queue(path)._now()) for index in range(50)]
+    path.write_text(json.dumps(items), encoding="utf-8")
+
+    with SmtpSink() as sink:
+        stats = _queue(path).drain(SmtpEmailSender(_email(sink.port)).send)
+
+    assert stats.sent == 50
+    assert stats.queued == 0
+    assert sink.message_count == 50
+
+
+def test_starttls_delivery_caches_tls_session(tmp_path: Path) -> None:
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        pytest.skip("openssl CLI not available")
+    cert = tmp_path / "cert.pem"
+    key = tmp_path / "key.pem"
+    subprocess.run(
+        [
+            openssl,
+            *("req", "-x509", "-newkey", "rsa:2048", "-nodes"),
+            *("-keyout", str(key), "-out", str(cert), "-days", "1", "-subj", "/CN=localhost"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(cert, key)
+
+    with SmtpSink(tls_context=server_context) as sink:
+        config = _email(sink.port, use_tls=True)
+        sender = SmtpEmailSender(config)
+        sender.send("first")
+        sender.send("second")
+
+    assert sink.message_count == 2
+    assert get_smtp_tls_context(config)._session is not None
@@ -1,6 +1,7 @@
 import smtplib
 from contextlib import suppress
 
+from z7_sentineltray import email_sender
 from z7_sentineltray.config import EmailConfig
 from z7_sentineltray.email_sender import (
     EmailAuthError,
@@ -56,7 +57,7 @@ def test_email_sender_retries(monkeypatch) -> None:
         def __exit__(self, *_args) -> None:
             return None
 
-        def starttls(self) -> None:
+        def starttls(self, context=None) -> None:
             return None
 
         def login(self, *_args) -> None:
@@ -67,7 +68,7 @@ def test_email_sender_retries(monkeypatch) -> None:
             if attempts["count"] < 3:
                 raise smtplib.SMTPException("fail")
 
-    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_sender, "_RegistrySMTP", FakeSMTP)
 
     sender = SmtpEmailSender(config=config)
     sender.send("msg")
@@ -101,7 +102,7 @@ def test_email_sender_auth_failure_no_retry(monkeypatch) -> None:
         def __exit__(self, *_args) -> None:
             return None
 
-        def starttls(self) -> None:
+        def starttls(self, context=None) -> None:
             return None
 
         def login(self, *_args) -> None:
@@ -111,7 +112,7 @@ def test_email_sender_auth_failure_no_retry(monkeypatch) -> None:
         def send_message(self, _msg) -> None:
             return None
 
-    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_sender, "_RegistrySMTP", FakeSMTP)
 
     sender = SmtpEmailSender(config=config)
     with suppress(EmailAuthError):
@@ -147,7 +148,7 @@ def test_email_sender_subject_and_body(monkeypatch) -> None:
         def __exit__(self, *_args) -> None:
             return None
 
-        def starttls(self) -> None:
+        def starttls(self, context=None) -> None:
             return None
 
         def login(self, *_args) -> None:
@@ -156,7 +157,7 @@ def test_email_sender_subject_and_body(monkeypatch) -> None:
         def send_message(self, msg) -> None:
             captured["message"] = msg
 
-    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_sender, "_RegistrySMTP", FakeSMTP)
 
     sender = SmtpEmailSender(config=config)
     sender.send("info: test send")
@@ -192,7 +193,7 @@ def test_email_sender_match_subject(monkeypatch) -> None:
         def __exit__(self, *_args) -> None:
             return None
 
-        def starttls(self) -> None:
+        def starttls(self, context=None) -> None:
             return None
 
         def login(self, *_args) -> None:
@@ -201,7 +202,7 @@ def test_email_sender_match_subject(monkeypatch) -> None:
         def send_message(self, msg) -> None:
             captured["message"] = msg
 
-    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_sender, "_RegistrySMTP", FakeSMTP)
 
     sender = SmtpEmailSender(config=config)
     sender.send("match payload")
@@ -238,7 +239,7 @@ def test_email_sender_error_subject(monkeypatch) -> None:
         def __exit__(self, *_args) -> None:
             return None
 
-        def starttls(self) -> None:
+        def starttls(self, context=None) -> None:
             return None
 
         def login(self, *_args) -> None:
@@ -247,7 +248,7 @@ def test_email_sender_error_subject(monkeypatch) -> None:
         def send_message(self, msg) -> None:
             captured["message"] = msg
 
-    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_sender, "_RegistrySMTP", FakeSMTP)
 
     sender = SmtpEmailSender(config=config)
     sender.send("error: failure")
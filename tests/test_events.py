@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.app import Notifier
+from z7_sentineltray.config import AppConfig, EmailConfig, MonitorConfig
+from z7_sentineltray.detector import WindowTextDetector
+from z7_sentineltray.email_sender import EmailSender
+from z7_sentineltray.events import (
+    EVENT_ERROR,
+    EVENT_MATCH,
+    EVENT_QUEUE_CHANGED,
+    EVENT_SCAN_FINISHED,
+    EVENT_SCAN_STARTED,
+    EVENT_SEND,
+    EVENT_STATUS_CHANGED,
+    AppEvent,
+    EventBus,
+    EventQueue,
+    get_event_bus,
+)
+from z7_sentineltray.status import StatusStore
+
+
+def _config(tmp_path: Path) -> AppConfig:
+    email = EmailConfig(
+        smtp_host="",
+        smtp_port=587,
+        smtp_username="",
+        smtp_password="",
+        from_address="",
+        to_addresses=[],
+        use_tls=True,
+        timeout_seconds=10,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    return AppConfig(
+        poll_interval_seconds=1,
+        healthcheck_interval_seconds=3600,
+        error_backoff_base_seconds=5,
+        error_backoff_max_seconds=300,
+        debounce_seconds=0,
+        max_history=10,
+        state_file=str(tmp_path / "state.json"),
+        log_file="logs/z7_sentineltray.log",
+        log_level="INFO",
+        log_console_level="WARNING",
+        log_console_enabled=True,
+        log_max_bytes=5000000,
+        log_backup_count=5,
+        log_run_files_keep=5,
+        telemetry_file=str(tmp_path / "telemetry.json"),
+        allow_window_restore=True,
+        log_only_mode=False,
+        send_repeated_matches=True,
+        min_repeat_seconds=0,
+        error_notification_cooldown_seconds=300,
+        window_error_backoff_base_seconds=5,
+        window_error_backoff_max_seconds=120,
+        window_error_circuit_threshold=3,
+        window_error_circuit_seconds=300,
+        email_queue_file=str(tmp_path / "email_queue.json"),
+        email_queue_max_items=1,
+        email_queue_max_age_seconds=0,
+        email_queue_max_attempts=0,
+        email_queue_retry_base_seconds=0,
+        monitors=[MonitorConfig(window_title_regex="APP", phrase_regex="ALERT", email=email)],
+    )
+
+
+class FakeSender(EmailSender):
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    def send(self, message: str) -> None:
+        self.sent.append(message)
+
+
+def test_bus_delivers_and_isolates_subscribers(caplog: pytest.LogCaptureFixture) -> None:
+    bus = EventBus()
+    received: list[AppEvent] = []
+
+    def broken(_event: AppEvent) -> None:
+        raise RuntimeError("boom")
+
+    bus.subscribe(broken)
+    unsubscribe = bus.subscribe(received.append)
+    with caplog.at_level(logging.ERROR, logger="z7_sentineltray.events"):
+        bus.emit(EVENT_SCAN_FINISHED, match=True)
+    unsubscribe()
+    bus.emit(EVENT_SCAN_STARTED)
+
+    assert [(event.kind, dict(event.data)) for event in received] == [
+        (EVENT_SCAN_FINISHED, {"match": True})
+    ]
+    assert "Event subscriber failed" in caplog.text
+
+
+def test_queue_hands_events_across_threads_and_flags_overflow() -> None:
+    queue = EventQueue(max_items=3)
+    writers = [
+        threading.Thread(target=queue.put, args=(AppEvent(EVENT_SEND, version=index),))
+        for index in range(5)
+    ]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    events = queue.drain()
+
+    assert events[0] == AppEvent(EVENT_STATUS_CHANGED)
+    assert len(events) == 4
+    assert queue.drain() == []
+
+
+def test_queue_wakes_its_consumer_once_per_batch() -> None:
+    queue = EventQueue()
+    queue.put(AppEvent(EVENT_SEND))
+    wakes: list[int] = []
+
+    queue.set_waker(lambda: wakes.append(len(queue)))
+    queue.put(AppEvent(EVENT_MATCH))
+    assert wakes == [1]
+
+    queue.drain()
+    queue.put(AppEvent(EVENT_ERROR))
+    queue.put(AppEvent(EVENT_SEND))
+    assert wakes == [1, 1]
+
+    queue.drain()
+    queue.set_waker(None)
+    queue.put(AppEvent(EVENT_SEND))
+    assert wakes == [1, 1]
+
+
+def test_status_store_publishes_changed_fields() -> None:
+    bus = EventBus()
+    queue = EventQueue()
+    bus.subscribe(queue.put)
+    status = StatusStore(event_bus=bus)
+
+    status.update(last_match="100 ALERT", last_match_at="2026-01-01T00:00:00", last_send="x")
+    status.set_uptime_seconds(10)
+    status.set_metrics({"scans_total": 1.0})
+    status.set_email_queue_stats({"queued": 1})
+    status.increment_error_count()
+    status.set_monitor_state("mon-a", failure_count=1, breaker_active=True)
+    status.set_last_error("")
+
+    events = queue.drain()
+    assert [(event.kind, event.version) for event in events] == [
+        (EVENT_MATCH, 1),
+        (EVENT_SEND, 1),
+        (EVENT_QUEUE_CHANGED, 4),
+        (EVENT_ERROR, 5),
+        (EVENT_STATUS_CHANGED, 6),
+    ]
+    assert events[0].fields == {"last_match", "last_match_at"}
+    assert events[-1].fields == {
+        "monitor_failures",
+        "monitor_breakers_active",
+        "breaker_active_count",
+    }
+
+
+def test_scan_publishes_started_and_finished(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    notifier = Notifier(config=_config(tmp_path), status=StatusStore())
+    for monitor in notifier._monitors:
+        monitor.sender = FakeSender()
+
+    def _matches(_self: WindowTextDetector, _pattern: str) -> list[str]:
+        return ["100 ALERT"]
+
+    monkeypatch.setattr(WindowTextDetector, "find_matches", _matches)
+    received: list[AppEvent] = []
+    unsubscribe = get_event_bus().subscribe(received.append)
+    try:
+        notifier.scan_once()
+    finally:
+        unsubscribe()
+
+    assert [event.kind for event in received] == [EVENT_SCAN_STARTED, EVENT_SCAN_FINISHED]
+    assert dict(received[-1].data) == {"error": False, "match": True}
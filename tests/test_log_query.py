@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray import log_query
+from z7_sentineltray.log_query import LogIndex, LogQuery, query_logs
+from z7_sentineltray.logging_setup import scan_context, setup_logging, shutdown_logging
+
+
+def _record(minute: int, message: str, *, scan_id: str = "", category: str = "scan") -> str:
+    return json.dumps(
+        {
+            "timestamp": f"2026-01-01T12:{minute:02d}:30+00:00",
+            "level": "WARNING" if "fail" in message else "INFO",
+            "category": category,
+            "message": message,
+            "session_id": "s1",
+            "scan_id": scan_id,
+        }
+    )
+
+
+def _append(path: Path, *lines: str) -> None:
+    with path.open("a", encoding="utf-8") as handle:
+        handle.writelines(f"{line}\n" for line in lines)
+
+
+def _messages(paths: list[Path], query: LogQuery) -> list[str]:
+    return [record["message"] for record in query_logs(paths, query)]
+
+
+def test_filtered_queries_use_the_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log = tmp_path / "app.jsonl"
+    _append(
+        log,
+        _record(0, "start", category="startup"),
+        _record(1, "scan a", scan_id="a"),
+        "not json",
+        _record(2, "scan b failed", scan_id="b"),
+        _record(3, "scan a done", scan_id="a"),
+    )
+
+    assert _messages([log], LogQuery(scan_id="a")) == ["scan a", "scan a done"]
+    assert (tmp_path / "app.jsonl.idx").exists()
+
+    decoded: list[bytes] = []
+    original = json.loads
+
+    def counting_loads(data: str | bytes) -> object:
+        decoded.append(bytes(data) if not isinstance(data, str) else data.encode())
+        return original(data)
+
+    monkeypatch.setattr(log_query.json, "loads", counting_loads)
+    assert _messages([log], LogQuery(scan_id="b", level="warning")) == ["scan b failed"]
+    assert _messages([log], LogQuery(category="startup", scan_id="a")) == []
+    # One read of the sidecar per query plus only the matching line.
+    assert sum(1 for data in decoded if b'"scan_id"' in data and b"offsets" not in data) == 1
+
+
+def test_time_range_scan(tmp_path: Path) -> None:
+    log = tmp_path / "app.jsonl"
+    _append(log, *(_record(minute, f"m{minute}") for minute in range(10)))
+
+    query = LogQuery(
+        since=datetime(2026, 1, 1, 12, 3, 30, tzinfo=UTC),
+        until=datetime(2026, 1, 1, 12, 5, 59),
+    )
+
+    assert _messages([log], query) == ["m3", "m4", "m5"]
+
+
+def test_index_picks_up_appended_lines(tmp_path: Path) -> None:
+    log = tmp_path / "app.jsonl"
+    _append(log, _record(0, "first", scan_id="a"))
+    assert _messages([log], LogQuery(scan_id="a")) == ["first"]
+
+    with log.open("a", encoding="utf-8") as handle:
+        handle.write(_record(1, "second", scan_id="a") + "\n" + _record(2, "partial")[:20])
+    assert _messages([log], LogQuery(scan_id="a")) == ["first", "second"]
+    assert LogIndex.load(log).size == log.stat().st_size - 20
+    assert len(LogIndex.load(log).offsets) == 2
+
+    log.write_text(_record(5, "rotated", scan_id="a") + "\n", encoding="utf-8")
+    assert _messages([log], LogQuery(scan_id="a")) == ["rotated"]
+
+
+def test_directory_query_includes_compressed_archives(tmp_path: Path) -> None:
+    archive = tmp_path / "app.jsonl.20260101_000000.gz"
+    with gzip.open(archive, "wt", encoding="utf-8") as handle:
+        handle.write(_record(0, "archived", scan_id="a") + "\n")
+    _append(tmp_path / "app.jsonl", _record(1, "current", scan_id="a"))
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    assert sorted(_messages([tmp_path], LogQuery(scan_id="a"))) == ["archived", "current"]
+
+
+def test_retention_in_flight_files_are_not_read(tmp_path: Path) -> None:
+    _append(tmp_path / "app.jsonl", _record(1, "current", scan_id="a"))
+    _append(tmp_path / "app.jsonl.20260101_000000.gz.src", _record(0, "moving", scan_id="a"))
+    (tmp_path / "app.jsonl.20260101_000000.gz.part").write_bytes(b"\x1f\x8b partial")
+
+    assert log_query.find_log_files(tmp_path) == [tmp_path / "app.jsonl"]
+    assert _messages([tmp_path], LogQuery(scan_id="a")) == ["current"]
+
+
+def test_query_real_log_by_scan_id(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    log_dir = tmp_path / "logs"
+    setup_logging(str(log_dir / "z7_sentineltray.log"), log_console_enabled=False)
+    logger = logging.getLogger("z7_sentineltray.test")
+    with scan_context("scan-42"):
+        logger.warning("inside scan", extra={"category": "scan"})
+    logger.warning("outside scan", extra={"category": "scan"})
+    shutdown_logging()
+
+    assert log_query.main([str(log_dir / "z7_sentineltray.jsonl"), "--scan-id", "scan-42"]) == 0
+
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 1
+    assert "[scan-42] inside scan" in output[0]
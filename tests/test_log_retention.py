@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.log_retention import LogRetentionManager
+from z7_sentineltray.metrics import LOG_RETENTION_RECLAIMED_BYTES_TOTAL, get_metrics_registry
+
+_DAY = 86400.0
+_NOW = 1_800_000_000.0
+
+
+def _names(directory: Path) -> list[str]:
+    return sorted(path.name for path in directory.iterdir() if path.is_file())
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = _NOW
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _write(path: Path, size: int, *, age_days: float = 0.0) -> Path:
+    path.write_bytes(b"x" * size)
+    mtime = _NOW - age_days * _DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_rotated_backups_and_old_run_logs_are_compressed(tmp_path: Path) -> None:
+    active = _write(tmp_path / "app.log", 10)
+    active_run = _write(tmp_path / "app_20260103_000000_3.log", 10)
+    _write(tmp_path / "app.log.1", 50_000, age_days=1)
+    _write(tmp_path / "app.jsonl.2", 50_000, age_days=2)
+    _write(tmp_path / "app_20260102_000000_2.log", 50_000, age_days=1)
+    telemetry = _write(tmp_path / "telemetry.json", 10)
+    manager = LogRetentionManager(tmp_path, active_paths=(active, active_run), clock=FakeClock())
+
+    report = manager.run_once()
+
+    names = _names(tmp_path)
+    assert report.compressed == 3
+    assert report.deleted == 0
+    assert report.reclaimed_bytes > 100_000
+    assert "app.log.1" not in names
+    assert "app_20260102_000000_2.log.gz" in names
+    assert any(name.startswith("app.log.") and name.endswith(".gz") for name in names)
+    assert any(name.startswith("app.jsonl.") and name.endswith(".gz") for name in names)
+    assert active.exists()
+    assert active_run.exists()
+    assert telemetry.exists()
+    with gzip.open(tmp_path / "app_20260102_000000_2.log.gz", "rb") as handle:
+        assert handle.read() == b"x" * 50_000
+
+
+def test_run_log_count_includes_compressed_runs(tmp_path: Path) -> None:
+    active_run = _write(tmp_path / "app_20260105_000000_5.log", 10)
+    for day in range(1, 5):
+        _write(tmp_path / f"app_2026010{day}_000000_{day}.log.gz", 10, age_days=5 - day)
+    manager = LogRetentionManager(
+        tmp_path, active_paths=(active_run,), run_files_keep=3, clock=FakeClock()
+    )
+
+    report = manager.run_once()
+
+    assert report.deleted == 2
+    assert _names(tmp_path) == [
+        "app_20260103_000000_3.log.gz",
+        "app_20260104_000000_4.log.gz",
+        "app_20260105_000000_5.log",
+    ]
+
+
+def test_age_and_size_budgets_only_remove_known_files(tmp_path: Path) -> None:
+    _write(tmp_path / "config_error.20250101-000000.txt", 10, age_days=90)
+    _write(tmp_path / "app.log.20260101_000000.gz", 400_000, age_days=3)
+    newest = _write(tmp_path / "profile-20260102-000000.pstats", 400_000, age_days=2)
+    queue = _write(tmp_path / "email_queue.json", 400_000, age_days=400)
+    manager = LogRetentionManager(
+        tmp_path, max_total_mb=1, max_age_days=30, compress=False, clock=FakeClock()
+    )
+
+    report = manager.run_once()
+
+    assert report.deleted == 2
+    assert _names(tmp_path) == [queue.name, newest.name]
+    assert report.bytes_after == 800_000
+
+
+def test_background_thread_reports_reclaimed_space(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    _write(tmp_path / "app.log.1", 100_000)
+    counter = get_metrics_registry().counter(LOG_RETENTION_RECLAIMED_BYTES_TOTAL)
+    before = counter.value
+    manager = LogRetentionManager(tmp_path, interval_seconds=3600)
+
+    with caplog.at_level(logging.INFO, logger="z7_sentineltray.log_retention"):
+        manager.start()
+        manager.stop()
+
+    assert manager.last_report is not None
+    assert manager.last_report.compressed == 1
+    assert counter.value - before == manager.last_report.reclaimed_bytes > 0
+    assert any("Log retention: 1 compressed" in record.getMessage() for record in caplog.records)
+
+
+def test_orphaned_query_indexes_are_removed(tmp_path: Path) -> None:
+    _write(tmp_path / "app.jsonl", 10)
+    _write(tmp_path / "app.jsonl.idx", 10)
+    _write(tmp_path / "app.jsonl.1.idx", 10)
+    manager = LogRetentionManager(tmp_path, compress=False, clock=FakeClock())
+
+    report = manager.run_once()
+
+    assert report.deleted == 1
+    assert _names(tmp_path) == ["app.jsonl", "app.jsonl.idx"]
+
+
+def test_backup_is_retried_after_compression_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _write(tmp_path / "app.log.1", 50_000, age_days=1)
+    stranded = _write(tmp_path / "app.log.20260101_000000.gz.src", 50_000, age_days=2)
+    manager = LogRetentionManager(tmp_path, clock=FakeClock())
+
+    def _fail(source: Path, target: Path) -> None:
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr("z7_sentineltray.log_retention._gzip_file", _fail)
+    report = manager.run_once()
+
+    assert report.compressed == 0
+    assert _names(tmp_path) == ["app.log.1", stranded.name]
+
+    monkeypatch.undo()
+    report = manager.run_once()
+
+    names = _names(tmp_path)
+    assert report.compressed == 2
+    assert "app.log.20260101_000000.gz" in names
+    assert not any(name.endswith(".src") for name in names)
+    assert len(names) == 2
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.app import Notifier
+from z7_sentineltray.config import AppConfig, EmailConfig, MonitorConfig
+from z7_sentineltray.logging_setup import DedupFilter
+from z7_sentineltray.memory_watchdog import MemoryWatchdog, read_rss_bytes
+from z7_sentineltray.status import StatusStore, format_status
+
+_MB = 1024 * 1024
+
+
+class FakeRss:
+    def __init__(self) -> None:
+        self.value = 200 * _MB
+
+    def __call__(self) -> int:
+        return self.value
+
+
+def test_first_sample_is_baseline() -> None:
+    items: list[int] = [1, 2, 3]
+    watchdog = MemoryWatchdog({"items": lambda: len(items)}, rss_reader=FakeRss())
+
+    report = watchdog.sample()
+
+    assert report.structures == {"items": 3}
+    assert report.structure_growth == {"items": 0}
+    assert report.rss_growth_bytes == 0
+    assert not report.alert
+
+
+def test_structure_growth_warns_once(caplog: pytest.LogCaptureFixture) -> None:
+    items: dict[int, float] = {}
+    watchdog = MemoryWatchdog(
+        {"items": lambda: len(items), "broken": lambda: 1 // 0},
+        structure_growth_threshold=100,
+        rss_reader=FakeRss(),
+    )
+    watchdog.sample()
+    items.update((index, 0.0) for index in range(150))
+
+    with caplog.at_level(logging.WARNING, logger="z7_sentineltray.memory_watchdog"):
+        report = watchdog.sample()
+        watchdog.sample()
+
+    assert report.alert
+    assert report.reasons == ["items +150"]
+    assert "broken" not in report.structures
+    warnings = [record for record in caplog.records if record.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "items: 150 (+150)" in warnings[0].getMessage()
+
+
+def test_rss_growth_threshold() -> None:
+    rss = FakeRss()
+    reports = []
+    watchdog = MemoryWatchdog(
+        {}, rss_growth_threshold_mb=50, rss_reader=rss, on_report=reports.append
+    )
+    watchdog.sample()
+
+    rss.value += 20 * _MB
+    assert not watchdog.sample().alert
+    rss.value += 40 * _MB
+    report = watchdog.sample()
+
+    assert report.reasons == ["RSS +60 MB"]
+    assert reports[-1] is report
+
+
+def _leaky_cache(cache: list[bytes]) -> None:
+    cache.extend(bytes(4096) for _ in range(200))
+
+
+def test_report_names_top_growing_allocation_sites() -> None:
+    cache: list[bytes] = []
+    watchdog = MemoryWatchdog(
+        {"cache": lambda: len(cache)},
+        structure_growth_threshold=100,
+        trace_allocations=True,
+        rss_reader=FakeRss(),
+    )
+    was_tracing = tracemalloc.is_tracing()
+    watchdog.start()
+    try:
+        _leaky_cache(cache)
+        report = watchdog.sample()
+    finally:
+        watchdog.stop()
+
+    assert report.top_sites
+    assert report.top_sites[0].startswith("test_memory_watchdog.py:")
+    assert str(Path(__file__).parent) not in "\n".join(report.top_sites)
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+@pytest.mark.skipif(sys.platform not in ("win32", "linux"), reason="RSS reader unsupported")
+def test_read_rss_bytes() -> None:
+    assert read_rss_bytes() > 0
+
+
+def test_dedup_filter_len() -> None:
+    dedup = DedupFilter()
+    for index in range(3):
+        dedup.filter(logging.makeLogRecord({"msg": f"message {index}", "levelno": logging.INFO}))
+
+    assert len(dedup) == 3
+
+
+def test_notifier_reports_memory_to_status(tmp_path: Path) -> None:
+    email = EmailConfig(
+        smtp_host="",
+        smtp_port=587,
+        smtp_username="",
+        smtp_password="",
+        from_address="",
+        to_addresses=[],
+        use_tls=True,
+        timeout_seconds=10,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    config = AppConfig(
+        poll_interval_seconds=1,
+        healthcheck_interval_seconds=3600,
+        error_backoff_base_seconds=5,
+        error_backoff_max_seconds=300,
+        debounce_seconds=0,
+        max_history=10,
+        state_file=str(tmp_path / "state.json"),
+        log_file="logs/z7_sentineltray.log",
+        log_level="INFO",
+        log_console_level="WARNING",
+        log_console_enabled=True,
+        log_max_bytes=5000000,
+        log_backup_count=5,
+        log_run_files_keep=5,
+        telemetry_file=str(tmp_path / "telemetry.json"),
+        allow_window_restore=True,
+        log_only_mode=False,
+        send_repeated_matches=True,
+        min_repeat_seconds=0,
+        error_notification_cooldown_seconds=300,
+        window_error_backoff_base_seconds=5,
+        window_error_backoff_max_seconds=120,
+        window_error_circuit_threshold=3,
+        window_error_circuit_seconds=300,
+        email_queue_file=str(tmp_path / "email_queue.json"),
+        email_queue_max_items=1,
+        email_queue_max_age_seconds=0,
+        email_queue_max_attempts=0,
+        email_queue_retry_base_seconds=0,
+        memory_structure_growth_threshold=2,
+        monitors=[MonitorConfig(window_title_regex="APP", phrase_regex="ALERT", email=email)],
+    )
+    status = StatusStore()
+    notifier = Notifier(config=config, status=status)
+
+    notifier._start_memory_watchdog()
+    try:
+        assert notifier._memory_watchdog is not None
+        for index in range(3):
+            status.set_monitor_state(f"monitor-{index}", failure_count=0, breaker_active=False)
+        notifier._memory_watchdog.sample()
+    finally:
+        notifier._stop_memory_watchdog()
+
+    snapshot = status.snapshot()
+    assert snapshot.memory_warning == "status_monitor_keys +3"
+    assert "crescimento: status_monitor_keys +3" in format_status(snapshot)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from smtp_sink import SmtpSink
+
+from z7_sentineltray.app import Notifier
+from z7_sentineltray.config import AppConfig, EmailConfig, MonitorConfig
+from z7_sentineltray.detector import WindowTextDetector
+from z7_sentineltray.email_sender import EmailSender, SmtpEmailSender
+from z7_sentineltray.metrics import (
+    MATCHES_TOTAL,
+    SCAN_FILTER_MS,
+    SCAN_FOREGROUND_MS,
+    SCAN_MONITOR_MS,
+    SCAN_RESTORE_MS,
+    SCANS_TOTAL,
+    SMTP_CONNECT_MS,
+    SMTP_SEND_MS,
+    SMTP_SENT_TOTAL,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+from z7_sentineltray.smtp_endpoints import get_smtp_endpoint_registry
+from z7_sentineltray.status import StatusStore
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics() -> None:
+    get_metrics_registry().reset()
+    get_smtp_endpoint_registry().clear()
+
+
+class FakeSender(EmailSender):
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    def send(self, message: str) -> None:
+        self.sent.append(message)
+
+
+def _email(host: str = "", port: int = 587) -> EmailConfig:
+    return EmailConfig(
+        smtp_host=host,
+        smtp_port=port,
+        smtp_username="user",
+        smtp_password="secret",
+        from_address="alerts@example.com",
+        to_addresses=["ops@example.com"],
+        use_tls=False,
+        timeout_seconds=5,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+
+
+def _config(tmp_path: Path) -> AppConfig:
+    return AppConfig(
+        poll_interval_seconds=1,
+        healthcheck_interval_seconds=3600,
+        error_backoff_base_seconds=5,
+        error_backoff_max_seconds=300,
+        debounce_seconds=0,
+        max_history=50,
+        state_file=str(tmp_path / "state.json"),
+        log_file="logs/z7_sentineltray.log",
+        log_level="INFO",
+        log_console_level="WARNING",
+        log_console_enabled=True,
+        log_max_bytes=5000000,
+        log_backup_count=5,
+        log_run_files_keep=5,
+        telemetry_file=str(tmp_path / "telemetry.json"),
+        allow_window_restore=True,
+        log_only_mode=False,
+        send_repeated_matches=True,
+        min_repeat_seconds=0,
+        error_notification_cooldown_seconds=300,
+        window_error_backoff_base_seconds=5,
+        window_error_backoff_max_seconds=120,
+        window_error_circuit_threshold=3,
+        window_error_circuit_seconds=300,
+        email_queue_file=str(tmp_path / "email_queue.json"),
+        email_queue_max_items=1,
+        email_queue_max_age_seconds=0,
+        email_queue_max_attempts=0,
+        email_queue_retry_base_seconds=0,
+        monitors=[MonitorConfig(window_title_regex="APP", phrase_regex="ALERT", email=_email())],
+    )
+
+
+def test_histogram_percentiles_follow_distribution() -> None:
+    histogram = Histogram((10, 20, 50, 100))
+    for value in range(1, 101):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 100
+    assert snapshot["min"] == 1
+    assert snapshot["max"] == 100
+    assert snapshot["p50"] == pytest.approx(50, abs=1)
+    assert snapshot["p95"] == pytest.approx(95, abs=1)
+    assert snapshot["p99"] == pytest.approx(99, abs=1)
+    assert snapshot["buckets"] == [[10.0, 10], [20.0, 20], [50.0, 50], [100.0, 100]]
+
+
+def test_histogram_overflow_bucket_is_clamped_to_max() -> None:
+    histogram = Histogram((1, 2))
+    histogram.observe(500)
+
+    assert histogram.quantile(0.99) == 500
+
+
+def test_histogram_rejects_unsorted_buckets() -> None:
+    with pytest.raises(ValueError, match="strictly increasing"):
+        Histogram((5, 1))
+
+
+def test_counter_rejects_negative_increment() -> None:
+    with pytest.raises(ValueError, match=">= 0"):
+        Counter().inc(-1)
+
+
+def test_registry_snapshot_is_json_serialisable() -> None:
+    registry = MetricsRegistry()
+    registry.counter("events").inc(3)
+    registry.gauge("depth").set(7)
+    with registry.timer("work_ms"):
+        pass
+
+    snapshot = json.loads(json.dumps(registry.snapshot()))
+
+    assert snapshot["counters"] == {"events": 3}
+    assert snapshot["gauges"] == {"depth": 7}
+    assert snapshot["histograms"]["work_ms"]["count"] == 1
+    assert registry.counter("events") is registry.counter("events")
+
+
+def test_status_store_exposes_metrics_snapshot() -> None:
+    status = StatusStore()
+    assert status.snapshot().metrics == {}
+
+    status.set_metrics({"counters": {"scans_total": 2}})
+
+    assert status.snapshot().metrics == {"counters": {"scans_total": 2}}
+
+
+def test_scan_records_phase_metrics(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    notifier = Notifier(config=_config(tmp_path), status=StatusStore())
+    for monitor in notifier._monitors:
+        monitor.sender = FakeSender()
+    monkeypatch.setattr(WindowTextDetector, "find_matches", lambda _self, _pattern: ["1 ALERT"])
+
+    notifier.scan_once()
+
+    snapshot = get_metrics_registry().snapshot()
+    assert snapshot["counters"][SCANS_TOTAL] == 1
+    assert snapshot["counters"][MATCHES_TOTAL] == 1
+    assert snapshot["histograms"][SCAN_MONITOR_MS]["count"] == 1
+    assert snapshot["histograms"][SCAN_FILTER_MS]["count"] == 1
+
+
+def test_foreground_and_restore_are_timed_separately(monkeypatch: pytest.MonkeyPatch) -> None:
+    class FakeWindow:
+        def window_text(self) -> str:
+            return "APP"
+
+        def descendants(self) -> list[object]:
+            return []
+
+    detector = WindowTextDetector("APP")
+    monkeypatch.setattr(detector, "_get_window", FakeWindow)
+    monkeypatch.setattr(detector, "_window_exists", lambda _window, timeout=0.0: True)
+    monkeypatch.setattr(detector, "_window_is_minimized", lambda _window: False)
+    monkeypatch.setattr(detector, "_get_foreground_handle", lambda: None)
+    monkeypatch.setattr(detector, "_ensure_foreground_and_maximized", lambda _window: None)
+    monkeypatch.setattr(detector, "_restore_prior_foreground", lambda _handle: None)
+
+    assert detector._iter_texts() == ["APP"]
+
+    histograms = get_metrics_registry().snapshot()["histograms"]
+    assert histograms[SCAN_FOREGROUND_MS]["count"] == 1
+    assert histograms[SCAN_RESTORE_MS]["count"] == 1
+
+
+def test_smtp_send_records_connect_and_send_metrics() -> None:
+    with SmtpSink() as sink:
+        SmtpEmailSender(_email("127.0.0.1", sink.port)).send("ALERT")
+
+    snapshot = get_metrics_registry().snapshot()
+    assert snapshot["counters"][SMTP_SENT_TOTAL] == 1
+    assert snapshot["histograms"][SMTP_CONNECT_MS]["count"] == 1
+    assert snapshot["histograms"][SMTP_SEND_MS]["count"] == 1
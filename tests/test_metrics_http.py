@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.app import Notifier
+from z7_sentineltray.config import AppConfig, EmailConfig, MonitorConfig
+from z7_sentineltray.metrics import MetricsRegistry, get_metrics_registry
+from z7_sentineltray.metrics_http import CONTENT_TYPE, MetricsHttpServer, render_openmetrics
+from z7_sentineltray.status import StatusStore
+
+
+@pytest.fixture
+def server() -> Iterator[MetricsHttpServer]:
+    metrics_server = MetricsHttpServer("127.0.0.1", 0)
+    metrics_server.start()
+    try:
+        yield metrics_server
+    finally:
+        metrics_server.stop()
+
+
+def _fetch(port: int, path: str = "/metrics") -> tuple[int, str, str]:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as response:
+        return response.status, response.headers["Content-Type"], response.read().decode("utf-8")
+
+
+def _status() -> StatusStore:
+    registry = MetricsRegistry()
+    registry.counter("scans_total").inc(4)
+    registry.histogram("scan_loop_ms", (10, 100)).observe(42)
+    status = StatusStore()
+    status.set_running(True)
+    status.set_email_queue_stats(
+        {"queued": 3, "sent": 1, "failed": 0, "deferred": 2, "oldest_age_seconds": 90}
+    )
+    status.set_monitor_state("APP|ALERT", failure_count=2, breaker_active=True)
+    status.set_metrics(registry.snapshot())
+    return status
+
+
+def test_render_openmetrics_includes_status_and_registry() -> None:
+    text = render_openmetrics(_status().snapshot(), {"APP|ALERT": "abc123"})
+
+    assert "z7_sentineltray_running 1" in text
+    assert 'z7_sentineltray_email_queue_items{state="queued"} 3' in text
+    assert "z7_sentineltray_email_queue_oldest_age_seconds 90" in text
+    assert 'z7_sentineltray_monitor_failures{monitor="abc123"} 2' in text
+    assert 'z7_sentineltray_monitor_breaker_active{monitor="abc123"} 1' in text
+    assert "# TYPE z7_sentineltray_scans counter" in text
+    assert "z7_sentineltray_scans_total 4" in text
+    assert 'z7_sentineltray_scan_loop_ms_bucket{le="10"} 0' in text
+    assert 'z7_sentineltray_scan_loop_ms_bucket{le="100"} 1' in text
+    assert 'z7_sentineltray_scan_loop_ms_bucket{le="+Inf"} 1' in text
+    assert "z7_sentineltray_scan_loop_ms_sum 42" in text
+    assert "APP|ALERT" not in text
+    assert text.endswith("# EOF\n")
+
+
+def test_server_serves_published_snapshot(server: MetricsHttpServer) -> None:
+    status, content_type, body = _fetch(server.port)
+    assert status == 200
+    assert content_type == CONTENT_TYPE
+    assert body == "# EOF\n"
+
+    server.publish(_status().snapshot())
+
+    _, _, body = _fetch(server.port)
+    assert "z7_sentineltray_scans_total 4" in body
+
+
+def test_server_returns_404_for_other_paths(server: MetricsHttpServer) -> None:
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _fetch(server.port, "/")
+
+    excinfo.value.close()
+    assert excinfo.value.code == 404
+
+
+def test_notifier_publishes_hashed_monitor_labels(tmp_path: Path) -> None:
+    get_metrics_registry().reset()
+    email = EmailConfig(
+        smtp_host="",
+        smtp_port=587,
+        smtp_username="",
+        smtp_password="",
+        from_address="",
+        to_addresses=[],
+        use_tls=True,
+        timeout_seconds=10,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    config = AppConfig(
+        poll_interval_seconds=1,
+        healthcheck_interval_seconds=3600,
+        error_backoff_base_seconds=5,
+        error_backoff_max_seconds=300,
+        debounce_seconds=0,
+        max_history=10,
+        state_file=str(tmp_path / "state.json"),
+        log_file="logs/z7_sentineltray.log",
+        log_level="INFO",
+        log_console_level="WARNING",
+        log_console_enabled=True,
+        log_max_bytes=5000000,
+        log_backup_count=5,
+        log_run_files_keep=5,
+        telemetry_file=str(tmp_path / "telemetry.json"),
+        allow_window_restore=True,
+        log_only_mode=False,
+        send_repeated_matches=True,
+        min_repeat_seconds=0,
+        error_notification_cooldown_seconds=300,
+        window_error_backoff_base_seconds=5,
+        window_error_backoff_max_seconds=120,
+        window_error_circuit_threshold=3,
+        window_error_circuit_seconds=300,
+        email_queue_file=str(tmp_path / "email_queue.json"),
+        email_queue_max_items=1,
+        email_queue_max_age_seconds=0,
+        email_queue_max_attempts=0,
+        email_queue_retry_base_seconds=0,
+        metrics_http_enabled=True,
+        metrics_http_bind="127.0.0.1",
+        metrics_http_port=0,
+        monitors=[
+            MonitorConfig(window_title_regex="SECRET APP", phrase_regex="ALERT", email=email)
+        ],
+    )
+    status = StatusStore()
+    notifier = Notifier(config=config, status=status)
+    key = notifier._monitors[0].key
+    status.set_monitor_state(key, failure_count=1, breaker_active=False)
+
+    notifier._start_metrics_server()
+    try:
+        assert notifier._metrics_server is not None
+        notifier._publish_metrics()
+        _, _, body = _fetch(notifier._metrics_server.port)
+    finally:
+        notifier._stop_metrics_server()
+
+    label = notifier._monitors[0].telemetry_static["monitor_key_hash"][:12]
+    assert f'z7_sentineltray_monitor_failures{{monitor="{label}"}} 1' in body
+    assert "SECRET" not in body
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.app import Notifier
+from z7_sentineltray.config import AppConfig, EmailConfig, MonitorConfig
+from z7_sentineltray.detector import WindowTextDetector
+from z7_sentineltray.logging_setup import JsonFormatter
+from z7_sentineltray.perf_summary import PHASE_MONITOR_SCAN, PHASE_SCAN_LOOP, PerfAggregator
+from z7_sentineltray.status import StatusStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _records(caplog: pytest.LogCaptureFixture, event: str) -> list[logging.LogRecord]:
+    return [record for record in caplog.records if getattr(record, "event", "") == event]
+
+
+def test_summary_is_logged_once_per_interval(caplog: pytest.LogCaptureFixture) -> None:
+    clock = FakeClock()
+    perf = PerfAggregator(interval_seconds=60, clock=clock)
+
+    with caplog.at_level(logging.INFO, logger="z7_sentineltray.perf_summary"):
+        for value in range(1, 101):
+            perf.observe("scan_loop", float(value))
+            perf.observe("monitor_scan", float(value) / 2, monitor="abc123")
+            clock.now += 0.5
+            perf.maybe_flush()
+        clock.now += 10
+        assert perf.maybe_flush()
+        assert not perf.flush()
+
+    summaries = _records(caplog, "perf_summary")
+    assert len(summaries) == 1
+    phases = {(item["phase"], item["monitor"]): item for item in summaries[0].data["phases"]}
+    assert phases[("scan_loop", "")] == {
+        "phase": "scan_loop",
+        "monitor": "",
+        "count": 100,
+        "min_ms": 1.0,
+        "avg_ms": 50.5,
+        "p95_ms": 95.0,
+        "max_ms": 100.0,
+    }
+    assert phases[("monitor_scan", "abc123")]["max_ms"] == 50.0
+    assert summaries[0].data["interval_seconds"] == 60.0
+    assert "monitor_scan[abc123] n=100" in summaries[0].getMessage()
+
+
+def test_outlier_is_logged_immediately(caplog: pytest.LogCaptureFixture) -> None:
+    perf = PerfAggregator(
+        outlier_ms=1000, outlier_overrides_ms={"queue_drain": 0}, clock=FakeClock()
+    )
+
+    with caplog.at_level(logging.INFO, logger="z7_sentineltray.perf_summary"):
+        perf.observe("scan_loop", 999)
+        perf.observe("scan_loop", 1500)
+        perf.observe("queue_drain", 60_000)
+
+    outliers = _records(caplog, "perf_outlier")
+    assert len(outliers) == 1
+    assert outliers[0].levelno == logging.WARNING
+    assert outliers[0].data == {"phase": "scan_loop", "monitor": "", "duration_ms": 1500}
+    assert not _records(caplog, "perf_summary")
+
+
+def test_summary_data_is_written_to_json_log() -> None:
+    record = logging.makeLogRecord(
+        {
+            "msg": "Perf summary",
+            "levelno": logging.INFO,
+            "levelname": "INFO",
+            "data": {"phases": [{"phase": "scan_loop", "count": 3}]},
+        }
+    )
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["data"] == {"phases": [{"phase": "scan_loop", "count": 3}]}
+
+
+def _config(tmp_path: Path) -> AppConfig:
+    email = EmailConfig(
+        smtp_host="",
+        smtp_port=587,
+        smtp_username="",
+        smtp_password="",
+        from_address="",
+        to_addresses=[],
+        use_tls=True,
+        timeout_seconds=10,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    return AppConfig(
+        poll_interval_seconds=1,
+        healthcheck_interval_seconds=3600,
+        error_backoff_base_seconds=5,
+        error_backoff_max_seconds=300,
+        debounce_seconds=0,
+        max_history=10,
+        state_file=str(tmp_path / "state.json"),
+        log_file="logs/z7_sentineltray.log",
+        log_level="INFO",
+        log_console_level="WARNING",
+        log_console_enabled=True,
+        log_max_bytes=5000000,
+        log_backup_count=5,
+        log_run_files_keep=5,
+        telemetry_file=str(tmp_path / "telemetry.json"),
+        allow_window_restore=True,
+        log_only_mode=False,
+        send_repeated_matches=True,
+        min_repeat_seconds=0,
+        error_notification_cooldown_seconds=300,
+        window_error_backoff_base_seconds=5,
+        window_error_backoff_max_seconds=120,
+        window_error_circuit_threshold=3,
+        window_error_circuit_seconds=300,
+        email_queue_file=str(tmp_path / "email_queue.json"),
+        email_queue_max_items=1,
+        email_queue_max_age_seconds=0,
+        email_queue_max_attempts=0,
+        email_queue_retry_base_seconds=0,
+        perf_outlier_ms=1,
+        monitors=[MonitorConfig(window_title_regex="APP", phrase_regex="ALERT", email=email)],
+    )
+
+
+def test_slow_scan_warns_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    notifier = Notifier(config=_config(tmp_path), status=StatusStore())
+
+    def _slow_matches(_self: WindowTextDetector, _pattern: str) -> list[str]:
+        time.sleep(0.01)
+        return []
+
+    monkeypatch.setattr(WindowTextDetector, "find_matches", _slow_matches)
+    with caplog.at_level(logging.WARNING, logger="z7_sentineltray.perf_summary"):
+        notifier.scan_once()
+
+    outliers = _records(caplog, "perf_outlier")
+    assert [record.data["phase"] for record in outliers] == [PHASE_MONITOR_SCAN]
+    with caplog.at_level(logging.INFO, logger="z7_sentineltray.perf_summary"):
+        notifier._perf.flush()
+    summary = _records(caplog, "perf_summary")[0]
+    assert PHASE_SCAN_LOOP in {item["phase"] for item in summary.data["phases"]}
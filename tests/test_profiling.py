@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import pstats
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.profiling import (
+    PROFILE_ENV_VAR,
+    ProfileRequest,
+    ScanProfiler,
+    parse_profile_env,
+    sanitize_code_path,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("0", None),
+        ("3", ProfileRequest(cycles=3)),
+        ("true", ProfileRequest()),
+        ("memory", ProfileRequest(memory=True)),
+        ("2, memory", ProfileRequest(cycles=2, memory=True)),
+        ("bogus", None),
+    ],
+)
+def test_parse_profile_env(value: str | None, expected: ProfileRequest | None) -> None:
+    assert parse_profile_env(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        (
+            r"C:\Users\maria\app\src\z7_sentineltray\detector.py",
+            "z7_sentineltray/detector.py",
+        ),
+        (
+            "/home/maria/.venv/lib/python3.11/site-packages/pywinauto/base.py",
+            "site-packages/pywinauto/base.py",
+        ),
+        (r"C:\Users\maria\AppData\Python311\Lib\re\__init__.py", "stdlib/re/__init__.py"),
+        ("/home/maria/scratch/helper.py", "helper.py"),
+        ("~", "~"),
+        ("<frozen importlib._bootstrap>", "<frozen importlib._bootstrap>"),
+    ],
+)
+def test_sanitize_code_path(filename: str, expected: str) -> None:
+    assert sanitize_code_path(filename) == expected
+
+
+def _busy_work() -> int:
+    return sum(len(str(value)) for value in range(2000))
+
+
+def test_idle_profiler_does_nothing(tmp_path: Path) -> None:
+    profiler = ScanProfiler()
+    output_dir = tmp_path / "logs"
+
+    profiler.before_cycle()
+    _busy_work()
+
+    assert profiler.after_cycle(output_dir) == []
+    assert not profiler.busy
+    assert not output_dir.exists()
+
+
+def test_capture_writes_sanitized_reports_after_n_cycles(tmp_path: Path) -> None:
+    profiler = ScanProfiler()
+    profiler.request(2, memory=True)
+    assert profiler.busy
+
+    profiler.before_cycle()
+    _busy_work()
+    assert profiler.after_cycle(tmp_path) == []
+    profiler.before_cycle()
+    _busy_work()
+    written = profiler.after_cycle(tmp_path)
+
+    assert not profiler.busy
+    assert [path.suffix for path in written] == [".pstats", ".txt", ".txt"]
+    assert written[2].name.endswith("-alloc.txt")
+    stats = pstats.Stats(str(written[0]))
+    filenames = {key[0] for key in stats.stats}  # type: ignore[attr-defined]
+    assert "test_profiling.py" in filenames
+    assert not any(str(Path(__file__).parent) in name for name in filenames)
+    report = written[1].read_text(encoding="utf-8")
+    assert "2 scan cycle(s)" in report
+    assert "_busy_work" in report
+    assert str(Path(__file__).parent) not in report
+    assert "Top allocation growth" in written[2].read_text(encoding="utf-8")
+
+
+def test_finish_stops_capture_early(tmp_path: Path) -> None:
+    profiler = ScanProfiler()
+    profiler.request(10)
+    profiler.before_cycle()
+    _busy_work()
+
+    written = profiler.finish(tmp_path)
+
+    assert len(written) == 2
+    assert profiler.last_reports == written
+    assert not profiler.busy
+
+
+def test_request_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    profiler = ScanProfiler()
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    assert profiler.request_from_env() is False
+
+    monkeypatch.setenv(PROFILE_ENV_VAR, "4")
+    assert profiler.request_from_env() is True
+    assert profiler.busy
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.app import Notifier
+from z7_sentineltray.config import AppConfig, EmailConfig, MonitorConfig
+from z7_sentineltray.detector import WindowTextDetector, WindowUnavailableError
+from z7_sentineltray.email_sender import EmailSender
+from z7_sentineltray.scan_timeline import (
+    RESULT_ERROR,
+    RESULT_MATCH,
+    RESULT_OK,
+    RESULT_SKIPPED,
+    RESULT_UNAVAILABLE,
+    ScanTimeline,
+)
+from z7_sentineltray.status import StatusStore, format_scan_timeline, format_status
+
+
+def _config(tmp_path: Path) -> AppConfig:
+    email = EmailConfig(
+        smtp_host="",
+        smtp_port=587,
+        smtp_username="",
+        smtp_password="",
+        from_address="",
+        to_addresses=[],
+        use_tls=True,
+        timeout_seconds=10,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    return AppConfig(
+        poll_interval_seconds=1,
+        healthcheck_interval_seconds=3600,
+        error_backoff_base_seconds=5,
+        error_backoff_max_seconds=300,
+        debounce_seconds=0,
+        max_history=10,
+        state_file=str(tmp_path / "state.json"),
+        log_file="logs/z7_sentineltray.log",
+        log_level="INFO",
+        log_console_level="WARNING",
+        log_console_enabled=True,
+        log_max_bytes=5000000,
+        log_backup_count=5,
+        log_run_files_keep=5,
+        telemetry_file=str(tmp_path / "telemetry.json"),
+        allow_window_restore=True,
+        log_only_mode=False,
+        send_repeated_matches=True,
+        min_repeat_seconds=0,
+        error_notification_cooldown_seconds=300,
+        window_error_backoff_base_seconds=5,
+        window_error_backoff_max_seconds=120,
+        window_error_circuit_threshold=3,
+        window_error_circuit_seconds=300,
+        email_queue_file=str(tmp_path / "email_queue.json"),
+        email_queue_max_items=1,
+        email_queue_max_age_seconds=0,
+        email_queue_max_attempts=0,
+        email_queue_retry_base_seconds=0,
+        scan_timeline_size=4,
+        monitors=[MonitorConfig(window_title_regex="APP", phrase_regex="ALERT", email=email)],
+    )
+
+
+class FakeSender(EmailSender):
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    def send(self, message: str) -> None:
+        self.sent.append(message)
+
+
+def test_ring_buffer_keeps_newest_scans_in_order() -> None:
+    timeline = ScanTimeline(capacity=3)
+    for index in range(5):
+        timeline.record(1000.0 + index, 10.0 * (index + 1), elements=index, matched=index % 2)
+
+    records = timeline.records()
+
+    assert len(timeline) == 3
+    assert [item.timestamp for item in records] == [1002.0, 1003.0, 1004.0]
+    assert [item.duration_ms for item in records] == [30.0, 40.0, 50.0]
+    assert [item.matched for item in records] == [0, 1, 0]
+    assert timeline.resized(2).records() == records[-2:]
+
+
+def test_stats_and_sparkline() -> None:
+    timeline = ScanTimeline(capacity=10)
+    timeline.record(1.0, 100.0, result=RESULT_OK)
+    timeline.record(2.0, 800.0, result=RESULT_MATCH, matched=2)
+    timeline.record(3.0, 1500.0, result=RESULT_UNAVAILABLE)
+    timeline.record(4.0, 0.0, result=RESULT_SKIPPED)
+    timeline.record(5.0, 400.0, result=RESULT_ERROR)
+
+    stats = timeline.stats()
+
+    assert stats.count == 5
+    assert stats.max_ms == 1500.0
+    assert stats.p95_ms == 1500.0
+    assert stats.avg_ms == pytest.approx(700.0)
+    assert (stats.failures, stats.matches, stats.skipped) == (2, 1, 1)
+    assert stats.failure_rate == pytest.approx(0.4)
+    assert stats.last_result == RESULT_ERROR
+    assert timeline.sparkline() == "▂█x x"
+    assert timeline.sparkline(3, ascii_only=True) == "x x"
+    assert ScanTimeline().stats().last_result is None
+
+
+def test_store_publishes_independent_copies() -> None:
+    status = StatusStore()
+    status.set_scan_timeline_size(2)
+    status.record_scan("mon-a", timestamp=1.0, duration_ms=5.0)
+    first = status.snapshot()
+    status.record_scan("mon-a", timestamp=2.0, duration_ms=6.0, result=RESULT_MATCH, matched=1)
+    status.record_scan("mon-a", timestamp=3.0, duration_ms=7.0)
+    second = status.snapshot()
+
+    assert len(first.scan_timelines["mon-a"]) == 1
+    assert [item.timestamp for item in second.scan_timelines["mon-a"].records()] == [2.0, 3.0]
+    assert second.version == first.version + 2
+
+    status.set_scan_timeline_size(1)
+    assert [item.timestamp for item in status.snapshot().scan_timelines["mon-a"].records()] == [3.0]
+    with pytest.raises(TypeError):
+        status.update(scan_timelines={})
+
+
+def test_scans_are_recorded_per_monitor_and_reported(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    status = StatusStore()
+    notifier = Notifier(config=_config(tmp_path), status=status)
+    for monitor in notifier._monitors:
+        monitor.sender = FakeSender()
+    outcomes: list[list[str] | Exception] = [["100 ALERT"], [], WindowUnavailableError("gone")]
+
+    def _matches(_self: WindowTextDetector, _pattern: str) -> list[str]:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(WindowTextDetector, "find_matches", _matches)
+    for _ in range(3):
+        notifier.scan_once()
+
+    key = notifier._monitors[0].key
+    timeline = status.snapshot().scan_timelines[key]
+    assert [(item.result, item.matched) for item in timeline.records()] == [
+        (RESULT_MATCH, 1),
+        (RESULT_OK, 0),
+        (RESULT_UNAVAILABLE, 0),
+    ]
+    assert "falhas 1 (33%)" in format_scan_timeline(timeline)
+
+    text = format_status(status.snapshot(), monitor_key=key)
+    assert text.splitlines()[-1].startswith("Histórico de varreduras: ")
+    assert "Histórico" not in format_status(status.snapshot())
@@ -0,0 +1,176 @@
+from types import SimpleNamespace
+
+import pytest
+
+from z7_sentineltray import app
+from z7_sentineltray.config import EmailConfig
+from z7_sentineltray.email_sender import DiskEmailQueue, EmailQueued, QueueingEmailSender
+from z7_sentineltray.smtp_circuit import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    SmtpCircuitBreaker,
+    get_smtp_circuit_breaker,
+    reset_smtp_circuit_breakers,
+)
+from z7_sentineltray.smtp_endpoints import EndpointProbeResult
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _queue(tmp_path):
+    return DiskEmailQueue(
+        tmp_path / "queue.json",
+        max_items=10,
+        max_age_seconds=3600,
+        max_attempts=3,
+        retry_base_seconds=0,
+    )
+
+
+def test_breaker_opens_after_threshold_and_probes_once() -> None:
+    clock = FakeClock()
+    breaker = SmtpCircuitBreaker(
+        "smtp.local:587", failure_threshold=2, open_seconds=60, clock=clock
+    )
+
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_CLOSED
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    assert not breaker.allow_request()
+
+    clock.now += 60
+    assert breaker.allow_request()
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    assert breaker.seconds_until_probe() == pytest.approx(60)
+
+    clock.now += 60
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+    assert breaker.allow_request()
+
+
+def test_breakers_are_shared_per_endpoint() -> None:
+    reset_smtp_circuit_breakers()
+    first = get_smtp_circuit_breaker("SMTP.local", 587, failure_threshold=2, open_seconds=60)
+    second = get_smtp_circuit_breaker("smtp.local", 587, failure_threshold=3, open_seconds=30)
+    other = get_smtp_circuit_breaker("smtp.local", 465, failure_threshold=2, open_seconds=60)
+
+    assert first is second
+    assert first is not other
+    reset_smtp_circuit_breakers()
+
+
+def test_open_circuit_queues_without_live_send(tmp_path) -> None:
+    calls = {"count": 0}
+
+    class FailingSender:
+        def send(self, _message: str) -> None:
+            calls["count"] += 1
+            raise RuntimeError("network down")
+
+    clock = FakeClock()
+    breaker = SmtpCircuitBreaker(
+        "smtp.local:587", failure_threshold=1, open_seconds=60, clock=clock
+    )
+    queue = _queue(tmp_path)
+    sender = QueueingEmailSender(sender=FailingSender(), queue=queue, circuit_breaker=breaker)
+
+    with pytest.raises(EmailQueued):
+        sender.send("first")
+    assert calls["count"] == 1
+    assert breaker.state == CIRCUIT_OPEN
+
+    with pytest.raises(EmailQueued):
+        sender.send("second")
+    assert calls["count"] == 1
+    assert queue.get_stats().queued == 2
+
+
+def test_drain_defers_items_while_circuit_open(tmp_path) -> None:
+    sent: list[str] = []
+
+    class RecordingSender:
+        def send(self, message: str) -> None:
+            sent.append(message)
+
+    clock = FakeClock()
+    breaker = SmtpCircuitBreaker(
+        "smtp.local:587", failure_threshold=1, open_seconds=60, clock=clock
+    )
+    breaker.record_failure()
+    queue = _queue(tmp_path)
+    queue.enqueue("pending")
+    sender = QueueingEmailSender(sender=RecordingSender(), queue=queue, circuit_breaker=breaker)
+
+    stats = sender.drain()
+    assert stats.deferred == 1
+    assert stats.failed == 0
+    assert sent == []
+
+    clock.now += 60
+    stats = sender.drain()
+    assert stats.sent == 1
+    assert sent == ["pending"]
+    assert breaker.state == CIRCUIT_CLOSED
+
+
+class _InlineThread:
+    def __init__(self, target, **_kwargs) -> None:
+        self._target = target
+
+    def start(self) -> None:
+        self._target()
+
+
+def test_healthy_probe_does_not_close_an_open_circuit(monkeypatch) -> None:
+    reset_smtp_circuit_breakers()
+    breaker = get_smtp_circuit_breaker("smtp.local", 587, failure_threshold=1, open_seconds=60)
+    breaker.record_failure()
+    email = EmailConfig(
+        smtp_host="smtp.local",
+        smtp_port=587,
+        smtp_username="user",
+        smtp_password="secret",
+        from_address="alerts@example.com",
+        to_addresses=["ops@example.com"],
+        use_tls=True,
+        timeout_seconds=5,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    config = SimpleNamespace(
+        monitors=[SimpleNamespace(email=email)],
+        smtp_circuit_failure_threshold=1,
+        smtp_circuit_open_seconds=60,
+    )
+
+    class HealthyRegistry:
+        def probe_all(self, endpoints, **_kwargs):
+            return [
+                EndpointProbeResult(endpoint, healthy=True, error="", elapsed_seconds=0.0)
+                for endpoint in endpoints
+            ]
+
+    monkeypatch.setattr(app, "Thread", _InlineThread)
+    monkeypatch.setattr(app, "get_smtp_endpoint_registry", HealthyRegistry)
+    try:
+        app._check_smtp_health(config)
+
+        assert breaker.state == CIRCUIT_OPEN
+        assert not breaker.allow_request()
+    finally:
+        reset_smtp_circuit_breakers()
@@ -0,0 +1,101 @@
+import socket
+
+from z7_sentineltray import email_sender
+from z7_sentineltray.config import EmailConfig
+from z7_sentineltray.email_sender import EmailAuthError, validate_smtp_credentials_many
+from z7_sentineltray.smtp_endpoints import SmtpEndpoint, SmtpEndpointRegistry, unique_endpoints
+
+
+def _email(host: str = "smtp.local", port: int = 587, password: str = "secret") -> EmailConfig:
+    return EmailConfig(
+        smtp_host=host,
+        smtp_port=port,
+        smtp_username="user",
+        smtp_password=password,
+        from_address="alerts@example.com",
+        to_addresses=["ops@example.com"],
+        use_tls=True,
+        timeout_seconds=5,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+
+
+def test_unique_endpoints_dedupes_hosts() -> None:
+    endpoints = unique_endpoints(
+        [_email("SMTP.local"), _email("smtp.local"), _email("smtp.local", 465), _email("")]
+    )
+
+    assert endpoints == [SmtpEndpoint("smtp.local", 587), SmtpEndpoint("smtp.local", 465)]
+
+
+def test_resolve_is_cached_until_ttl_expires() -> None:
+    calls: list[tuple[str, int]] = []
+    now = {"value": 0.0}
+
+    def resolver(host, port, *_args):
+        calls.append((host, port))
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+
+    registry = SmtpEndpointRegistry(
+        resolve_ttl_seconds=60, resolver=resolver, clock=lambda: now["value"]
+    )
+
+    registry.resolve("smtp.local", 587)
+    registry.resolve("SMTP.local", 587)
+    assert len(calls) == 1
+
+    now["value"] = 61.0
+    registry.resolve("smtp.local", 587)
+    assert len(calls) == 2
+
+
+def test_probe_all_reports_reachable_and_unreachable_endpoints() -> None:
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(4)
+    open_port = listener.getsockname()[1]
+    closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+    try:
+        registry = SmtpEndpointRegistry()
+        results = registry.probe_all(
+            [
+                SmtpEndpoint("127.0.0.1", open_port),
+                SmtpEndpoint("127.0.0.1", closed_port),
+                SmtpEndpoint("127.0.0.1", open_port),
+            ],
+            timeout=2,
+            deadline_seconds=5,
+        )
+    finally:
+        listener.close()
+
+    assert [result.healthy for result in results] == [True, False]
+    last = registry.last_health(SmtpEndpoint("127.0.0.1", closed_port))
+    assert last is not None
+    assert not last.healthy
+
+
+def test_validate_many_logs_in_once_per_account(monkeypatch) -> None:
+    calls: list[str] = []
+
+    def fake_validate(config: EmailConfig) -> None:
+        calls.append(config.smtp_password)
+        if config.smtp_password == "wrong":
+            raise EmailAuthError("SMTP authentication failed")
+
+    monkeypatch.setattr(email_sender, "validate_smtp_credentials", fake_validate)
+
+    outcomes = validate_smtp_credentials_many(
+        [_email(), _email("SMTP.LOCAL"), _email(password="wrong"), _email()]
+    )
+
+    assert sorted(calls) == ["secret", "wrong"]
+    assert outcomes[0] is None
+    assert outcomes[1] is None
+    assert isinstance(outcomes[2], EmailAuthError)
+    assert outcomes[3] is None
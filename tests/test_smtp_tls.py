@@ -0,0 +1,113 @@
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.config import EmailConfig
+from z7_sentineltray.smtp_tls import (
+    build_smtp_tls_context,
+    get_smtp_tls_context,
+    reset_smtp_tls_contexts,
+)
+
+
+def _email(**overrides) -> EmailConfig:
+    config = EmailConfig(
+        smtp_host="smtp.local",
+        smtp_port=587,
+        smtp_username="user",
+        smtp_password="secret",
+        from_address="alerts@example.com",
+        to_addresses=["ops@example.com"],
+        use_tls=True,
+        timeout_seconds=5,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    return replace(config, **overrides)
+
+
+def test_contexts_are_cached_per_endpoint_and_settings() -> None:
+    reset_smtp_tls_contexts()
+    first = get_smtp_tls_context(_email())
+    same = get_smtp_tls_context(_email(smtp_host="SMTP.local"))
+    other_port = get_smtp_tls_context(_email(smtp_port=465))
+    other_settings = get_smtp_tls_context(_email(tls_min_version="TLSv1.3"))
+
+    assert first is same
+    assert first is not other_port
+    assert first is not other_settings
+    reset_smtp_tls_contexts()
+
+
+def test_context_applies_tls_settings() -> None:
+    default = build_smtp_tls_context(_email())
+    assert default.verify_mode == ssl.CERT_NONE
+    assert not default.check_hostname
+
+    strict = build_smtp_tls_context(
+        _email(tls_verify=True, tls_min_version="TLSv1.2", tls_ciphers="ECDHE+AESGCM")
+    )
+    assert strict.verify_mode == ssl.CERT_REQUIRED
+    assert strict.check_hostname
+    assert strict.minimum_version == ssl.TLSVersion.TLSv1_2
+
+
+@pytest.fixture
+def tls_server_context(tmp_path: Path) -> ssl.SSLContext:
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        pytest.skip("openssl CLI not available")
+    cert = tmp_path / "cert.pem"
+    key = tmp_path / "key.pem"
+    subprocess.run(
+        [
+            openssl,
+            *("req", "-x509", "-newkey", "rsa:2048", "-nodes"),
+            *("-keyout", str(key), "-out", str(cert), "-days", "1", "-subj", "/CN=localhost"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+def test_second_connection_resumes_session(tls_server_context: ssl.SSLContext) -> None:
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(2)
+    port = listener.getsockname()[1]
+
+    def serve() -> None:
+        for _ in range(2):
+            conn, _addr = listener.accept()
+            with tls_server_context.wrap_socket(conn, server_side=True) as tls_conn:
+                tls_conn.recv(16)
+                tls_conn.sendall(b"250 OK\r\n")
+                tls_conn.recv(16)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    context = build_smtp_tls_context(_email(smtp_host="127.0.0.1", smtp_port=port))
+    reused: list[bool] = []
+    try:
+        for _ in range(2):
+            raw = socket.create_connection(("127.0.0.1", port), timeout=5)
+            with context.wrap_socket(raw, server_hostname="localhost") as tls_sock:
+                tls_sock.sendall(b"NOOP\r\n")
+                tls_sock.recv(16)
+                reused.append(tls_sock.session_reused)
+                context.remember_session(tls_sock)
+    finally:
+        thread.join(timeout=5)
+        listener.close()
+
+    assert reused == [False, True]
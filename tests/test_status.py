@@ -1,4 +1,8 @@
-from z7_sentineltray.status import StatusStore, format_status
+import threading
+
+import pytest
+
+from z7_sentineltray.status import StatusSnapshot, StatusStore, format_status
 
 
 def test_status_store_snapshot() -> None:
@@ -35,3 +39,47 @@ def test_status_store_snapshot() -> None:
     assert "Texto monitorado: ALERT" in text
     assert "Próxima verificação: 19-01-2026 - 23:01" in text
     assert "Última detecção: 19-01-2026 - 23:00" in text
+
+
+def test_version_only_moves_on_change() -> None:
+    store = StatusStore()
+    initial = store.snapshot()
+
+    store.set_last_error("")
+    store.set_monitor_state("mon-a", failure_count=0, breaker_active=False)
+    store.set_monitor_state("mon-a", failure_count=0, breaker_active=False)
+
+    assert store.snapshot().version == 1
+    assert store.snapshot() is store.snapshot()
+    assert initial.version == 0
+    assert initial.monitor_failures == {}
+
+
+def test_update_publishes_one_version() -> None:
+    store = StatusStore()
+
+    store.update(running=True, last_scan="2026-01-19T23:00:00-03:00", uptime_seconds=5)
+
+    snapshot = store.snapshot()
+    assert snapshot.version == 1
+    assert (snapshot.running, snapshot.uptime_seconds) == (True, 5)
+    with pytest.raises(TypeError, match="breaker_active_count"):
+        store.update(breaker_active_count=3)
+
+
+def test_wait_for_change_and_subscribers() -> None:
+    store = StatusStore()
+    received: list[StatusSnapshot] = []
+    unsubscribe = store.subscribe(received.append)
+
+    assert store.wait_for_change(0, timeout=0.01).version == 0
+    writer = threading.Timer(0.05, store.set_last_scan_result, args=("NENHUM",))
+    writer.start()
+    snapshot = store.wait_for_change(0, timeout=5)
+    writer.join()
+    unsubscribe()
+    store.set_running(True)
+
+    assert snapshot.version == 1
+    assert snapshot.last_scan_result == "NENHUM"
+    assert [item.version for item in received] == [1]
@@ -1,7 +1,8 @@
 import json
 from pathlib import Path
 
-from z7_sentineltray.telemetry import JsonWriter
+from z7_sentineltray import io_utils
+from z7_sentineltray.telemetry import JsonWriter, TelemetryWriter
 
 
 def test_telemetry_writer_creates_file(tmp_path: Path) -> None:
@@ -26,3 +27,38 @@ def test_telemetry_writer_creates_file(tmp_path: Path) -> None:
     assert data["updated_at"] == "t1"
     assert data["running"] is True
     assert data["error_count"] == 0
+
+
+def test_change_aware_writer_skips_unchanged_payloads(tmp_path: Path) -> None:
+    now = {"value": 0.0}
+    path = tmp_path / "telemetry.json"
+    writer = TelemetryWriter(path, max_staleness_seconds=60, clock=lambda: now["value"])
+    builds: list[int] = []
+
+    def build() -> dict[str, object]:
+        builds.append(1)
+        return {"updated_at": f"t{len(builds)}", "error_count": 0}
+
+    assert writer.update(build, fingerprint=("idle", 0))
+    now["value"] = 30.0
+    assert not writer.update(build, fingerprint=("idle", 0))
+    assert len(builds) == 1
+
+    assert writer.update(build, fingerprint=("idle", 1))
+    now["value"] = 95.0
+    assert writer.update(build, fingerprint=("idle", 1))
+
+    assert writer.writes == 3
+    assert writer.skipped == 1
+    assert json.loads(path.read_text(encoding="utf-8"))["updated_at"] == "t3"
+
+
+def test_writer_without_fsync_skips_os_fsync(tmp_path: Path, monkeypatch) -> None:
+    calls: list[int] = []
+    monkeypatch.setattr(io_utils.os, "fsync", lambda fd: calls.append(fd))
+    path = tmp_path / "telemetry.json"
+
+    JsonWriter(path, fsync=False).write({"running": True})
+    assert calls == []
+    JsonWriter(path).write({"running": True})
+    assert len(calls) == 1
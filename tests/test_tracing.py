@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from z7_sentineltray.app import Notifier
+from z7_sentineltray.config import AppConfig, EmailConfig, MonitorConfig
+from z7_sentineltray.detector import WindowTextDetector
+from z7_sentineltray.email_sender import EmailSender
+from z7_sentineltray.status import StatusStore
+from z7_sentineltray.tracing import Tracer, get_tracer, load_spans, main, summarize
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        self.now += 0.001
+        return self.now
+
+
+class FakeSender(EmailSender):
+    def send(self, message: str) -> None:
+        return None
+
+
+def _tracer(path: Path, **kwargs) -> Tracer:
+    kwargs.setdefault("sample_rate", 1.0)
+    kwargs.setdefault("clock", FakeClock())
+    return Tracer(path, **kwargs)
+
+
+def test_nested_spans_are_written_with_parents(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    tracer = _tracer(path)
+
+    with tracer.trace("scan-1", monitors=1):
+        with tracer.span("monitor", monitor="abc"):
+            with tracer.span("walk"):
+                tracer.annotate(elements=12)
+        tracer.record("filter", tracer._clock())
+    tracer.flush()
+
+    spans = {span["name"]: span for span in load_spans(path)}
+    assert set(spans) == {"scan", "monitor", "walk", "filter"}
+    assert spans["scan"]["parent_id"] is None
+    assert spans["scan"]["attrs"] == {"monitors": 1}
+    assert spans["monitor"]["parent_id"] == spans["scan"]["span_id"]
+    assert spans["walk"]["parent_id"] == spans["monitor"]["span_id"]
+    assert spans["walk"]["attrs"] == {"elements": 12}
+    assert spans["filter"]["parent_id"] == spans["scan"]["span_id"]
+    assert all(span["trace_id"] == "scan-1" for span in spans.values())
+    assert spans["walk"]["end"] > spans["walk"]["start"]
+
+
+def test_unsampled_trace_creates_no_spans(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    tracer = _tracer(path, sample_rate=0.5, rng=lambda: 0.9)
+
+    with tracer.trace("scan-1") as root:
+        assert root is None
+        with tracer.span("walk") as span:
+            assert span is None
+    tracer.flush()
+
+    assert not path.exists()
+
+
+def test_spans_are_flushed_in_batches(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    tracer = _tracer(path, batch_size=4, flush_interval_seconds=3600)
+
+    with tracer.trace("scan-1"):
+        with tracer.span("walk"):
+            pass
+    assert not path.exists()
+
+    with tracer.trace("scan-2"):
+        with tracer.span("walk"):
+            pass
+    assert len(load_spans(path)) == 4
+
+
+def test_trace_file_is_rotated(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    tracer = _tracer(path, batch_size=1, max_bytes=1024, backup_count=2)
+
+    for index in range(40):
+        with tracer.trace(f"scan-{index}", padding="x" * 100):
+            pass
+
+    assert path.exists()
+    assert path.with_name("trace.jsonl.1").exists()
+    assert path.with_name("trace.jsonl.2").exists()
+    assert not path.with_name("trace.jsonl.3").exists()
+    assert path.stat().st_size <= 1024
+
+
+def test_summarize_aggregates_by_call_path(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    tracer = _tracer(path)
+    for index in range(3):
+        with tracer.trace(f"scan-{index}"):
+            with tracer.span("monitor"):
+                with tracer.span("walk"):
+                    pass
+    tracer.flush()
+
+    lines = summarize(load_spans(path)).splitlines()
+
+    assert lines[0] == "3 trace(s), 9 span(s)"
+    assert lines[1].startswith("scan ")
+    assert lines[2].startswith("  monitor ")
+    assert lines[3].startswith("    walk ")
+    assert " 3x " in lines[3]
+    assert "100.0%" in lines[1]
+
+
+def test_cli_prints_summary(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "trace.jsonl"
+    tracer = _tracer(path)
+    with tracer.trace("scan-1"):
+        pass
+    tracer.flush()
+
+    assert main([str(path)]) == 0
+    assert "1 trace(s), 1 span(s)" in capsys.readouterr().out
+
+
+@pytest.fixture
+def global_tracer(tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path / "trace.jsonl"
+    get_tracer().configure(path, sample_rate=1.0)
+    try:
+        yield path
+    finally:
+        get_tracer().configure(None, sample_rate=0.0)
+
+
+def test_scan_once_records_phase_spans(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, global_tracer: Path
+) -> None:
+    email = EmailConfig(
+        smtp_host="",
+        smtp_port=587,
+        smtp_username="",
+        smtp_password="",
+        from_address="",
+        to_addresses=[],
+        use_tls=True,
+        timeout_seconds=10,
+        subject="Z7_SentinelTray",
+        retry_attempts=0,
+        retry_backoff_seconds=0,
+    )
+    config = AppConfig(
+        poll_interval_seconds=1,
+        healthcheck_interval_seconds=3600,
+        error_backoff_base_seconds=5,
+        error_backoff_max_seconds=300,
+        debounce_seconds=0,
+        max_history=10,
+        state_file=str(tmp_path / "state.json"),
+        log_file="logs/z7_sentineltray.log",
+        log_level="INFO",
+        log_console_level="WARNING",
+        log_console_enabled=True,
+        log_max_bytes=5000000,
+        log_backup_count=5,
+        log_run_files_keep=5,
+        telemetry_file=str(tmp_path / "telemetry.json"),
+        allow_window_restore=True,
+        log_only_mode=False,
+        send_repeated_matches=True,
+        min_repeat_seconds=0,
+        error_notification_cooldown_seconds=300,
+        window_error_backoff_base_seconds=5,
+        window_error_backoff_max_seconds=120,
+        window_error_circuit_threshold=3,
+        window_error_circuit_seconds=300,
+        email_queue_file=str(tmp_path / "email_queue.json"),
+        email_queue_max_items=1,
+        email_queue_max_age_seconds=0,
+        email_queue_max_attempts=0,
+        email_queue_retry_base_seconds=0,
+        monitors=[MonitorConfig(window_title_regex="APP", phrase_regex="ALERT", email=email)],
+    )
+    notifier = Notifier(config=config, status=StatusStore())
+    for monitor in notifier._monitors:
+        monitor.sender = FakeSender()
+    monkeypatch.setattr(WindowTextDetector, "find_matches", lambda _self, _pattern: ["1 ALERT"])
+
+    notifier.scan_once()
+    get_tracer().flush()
+
+    spans = load_spans(global_tracer)
+    names = {span["name"] for span in spans}
+    assert {"scan", "monitor", "filter", "send", "persist"} <= names
+    assert len({span["trace_id"] for span in spans}) == 1
+    filter_span = next(span for span in spans if span["name"] == "filter")
+    assert filter_span["attrs"]["matches"] == 1
+    assert "APP" not in json.dumps(spans)